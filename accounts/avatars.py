@@ -0,0 +1,133 @@
+# accounts/avatars.py - AVATAR KICHIK NUSXALARI (32/64/128, WebP + JPEG)
+
+import hashlib
+import logging
+import posixpath
+from io import BytesIO
+
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+
+logger = logging.getLogger(__name__)
+
+
+AVATAR_SIZES = (32, 64, 128)
+AVATAR_FORMATS = {
+    'webp': {'format': 'WEBP', 'quality': 80, 'method': 4},
+    'jpg': {'format': 'JPEG', 'quality': 82, 'optimize': True, 'progressive': True},
+}
+THUMBS_DIR = 'avatars/thumbs'
+# O'qib bo'lmagan avatar shu muddat (soniya) qayta urinilmaydi - original ko'rsatiladi
+FAILURE_TIMEOUT = 3600
+FAILURE_KEY = 'avatars:failed:{}'
+
+
+def _nearest_size(size):
+    """So'ralgan o'lchamga mos (undan kichik bo'lmagan) tayyor o'lcham"""
+    for candidate in AVATAR_SIZES:
+        if candidate >= size:
+            return candidate
+    return AVATAR_SIZES[-1]
+
+
+def _name_digest(avatar_name):
+    return hashlib.md5(avatar_name.encode(), usedforsecurity=False).hexdigest()[:12]
+
+
+def rendition_name(avatar_name, size, extension):
+    """
+    avatars/foo.jpg -> avatars/thumbs/foo_<hash>_64.webp
+
+    Hash to'liq nomdan - avatars/a/me.jpg va avatars/b/me.jpg to'qnashmaydi.
+    """
+    stem = posixpath.splitext(posixpath.basename(avatar_name))[0]
+    return f"{THUMBS_DIR}/{stem}_{_name_digest(avatar_name)}_{size}.{extension}"
+
+
+def _failure_key(avatar_name):
+    return FAILURE_KEY.format(_name_digest(avatar_name))
+
+
+def _open_square(file, size):
+    """Rasmni ochish, EXIF bo'yicha burish va markazdan kvadrat qirqish"""
+    from PIL import Image, ImageOps
+
+    image = Image.open(file)
+    # JPEG uchun dekoderning o'zi kichraytiradi - katta telefon rasmlari tez ochiladi
+    image.draft('RGB', (size * 2, size * 2))
+    image = ImageOps.exif_transpose(image)
+
+    if image.mode not in ('RGB', 'RGBA'):
+        image = image.convert('RGBA' if 'A' in image.getbands() or 'transparency' in image.info else 'RGB')
+
+    return ImageOps.fit(image, (size, size), Image.LANCZOS)
+
+
+def _encode(image, extension):
+    from PIL import Image
+
+    options = dict(AVATAR_FORMATS[extension])
+    image_format = options.pop('format')
+    if image_format == 'JPEG' and image.mode == 'RGBA':
+        # JPEG da shaffoflik yo'q - oq fonga qo'yiladi
+        background = Image.new('RGB', image.size, (255, 255, 255))
+        background.paste(image, mask=image.getchannel('A'))
+        image = background
+
+    buffer = BytesIO()
+    image.save(buffer, image_format, **options)
+    return buffer.getvalue()
+
+
+def generate_avatar_renditions(user, storage=default_storage):
+    """
+    Barcha o'lcham va formatlarni yaratish (mavjudlari qayta yoziladi)
+
+    Eng katta o'lcham bir marta originaldan olinadi, kichiklari undan
+    kichraytiriladi - original faqat bir marta dekodlanadi.
+
+    Returns:
+        list: yaratilgan fayllar nomlari ([] - avatar yo'q yoki o'qib bo'lmadi)
+    """
+    from PIL import Image, UnidentifiedImageError
+
+    if not user.avatar:
+        return []
+
+    try:
+        with user.avatar.open('rb') as file:
+            largest = _open_square(file, AVATAR_SIZES[-1])
+    except (OSError, UnidentifiedImageError, Image.DecompressionBombError):
+        logger.warning("Avatar o'qilmadi: %s", user.avatar.name, exc_info=True)
+        cache.set(_failure_key(user.avatar.name), True, FAILURE_TIMEOUT)
+        return []
+
+    created = []
+    for size in sorted(AVATAR_SIZES, reverse=True):
+        image = largest if size == largest.width else largest.resize((size, size), Image.LANCZOS)
+        for extension in AVATAR_FORMATS:
+            name = rendition_name(user.avatar.name, size, extension)
+            if storage.exists(name):
+                storage.delete(name)
+            created.append(storage.save(name, ContentFile(_encode(image, extension))))
+    return created
+
+
+def avatar_rendition_url(user, size=64, extension='webp', storage=default_storage):
+    """
+    Tayyor nusxa URL manzili
+
+    Nusxa hali yo'q bo'lsa (eski avatarlar) - birinchi so'rovda yaratiladi.
+    Yaratib bo'lmasa original avatar URL qaytariladi (FAILURE_TIMEOUT davomida
+    qayta urinilmaydi), avatar yo'q bo'lsa ''.
+    """
+    if not user or not getattr(user, 'avatar', None):
+        return ''
+
+    name = rendition_name(user.avatar.name, _nearest_size(size), extension)
+    if storage.exists(name):
+        return storage.url(name)
+    if cache.get(_failure_key(user.avatar.name)) or not generate_avatar_renditions(user, storage):
+        return user.avatar.url
+    return storage.url(name)
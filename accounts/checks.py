@@ -0,0 +1,44 @@
+# accounts/checks.py - SESSIYA SOZLAMALARINI TEKSHIRISH (manage.py check)
+
+from django.conf import settings
+from django.core import checks
+
+
+# Jarayon ichidagi keshlar - har bir gunicorn worker o'z nusxasini ko'radi
+PROCESS_LOCAL_CACHES = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+
+@checks.register(checks.Tags.caches)
+def check_session_cache(app_configs, **kwargs):
+    """
+    SESSION_BACKEND=cache / cached_db umumiy keshsiz ishlamaydi
+
+    - cache: sessiya faqat login qilingan workerda bor - boshqa workerga
+      tushgan so'rov login sahifasiga qaytadi (xatolik, ishga tushmaydi)
+    - cached_db: logout boshqa workerlar keshidagi nusxani o'chirmaydi -
+      sessiya kesh muddati tugaguncha ishlayveradi (ogohlantirish)
+    """
+    engine = settings.SESSION_ENGINE.rsplit('.', 1)[-1]
+    if engine not in ('cache', 'cached_db'):
+        return []
+
+    alias = getattr(settings, 'SESSION_CACHE_ALIAS', 'default')
+    backend = settings.CACHES.get(alias, {}).get('BACKEND', '')
+    if backend not in PROCESS_LOCAL_CACHES:
+        return []
+
+    hint = 'CACHE_BACKEND ni Redis yoki FileBasedCache ga o\'zgartiring yoki SESSION_BACKEND=db ishlating.'
+    if engine == 'cache':
+        return [checks.Error(
+            f'SESSION_BACKEND=cache va {backend} - sessiyalar workerlar o\'rtasida umumiy emas.',
+            hint=hint,
+            id='accounts.E001',
+        )]
+    return [checks.Warning(
+        f'SESSION_BACKEND=cached_db va {backend} - logout boshqa workerlar keshidan sessiyani o\'chirmaydi.',
+        hint=hint,
+        id='accounts.W001',
+    )]
@@ -0,0 +1,46 @@
+# accounts/decorators.py - ASYNC VIEWLAR UCHUN AUTENTIFIKATSIYA DECORATORLARI
+
+from functools import wraps
+
+from django.contrib import messages
+from django.contrib.auth.views import redirect_to_login
+from django.shortcuts import redirect
+
+
+def alogin_required(view_func):
+    """
+    login_required ning async varianti (Django 5.0 dagisi async viewni qo'llamaydi)
+
+    Foydalanuvchi request.auser() bilan olinadi va request.user ga yoziladi -
+    view ichida request.user ga murojaat sinxron DB so'rovi qilmaydi
+    (async kontekstda SynchronousOnlyOperation bo'lardi).
+    """
+    @wraps(view_func)
+    async def wrapper(request, *args, **kwargs):
+        user = await request.auser()
+        if not user.is_authenticated:
+            return redirect_to_login(request.get_full_path())
+        request.user = user
+        return await view_func(request, *args, **kwargs)
+    return wrapper
+
+
+def arole_required(check, message):
+    """
+    require_admin / require_superadmin ning async varianti
+
+    alogin_required dan keyin (ichkarida) turishi kerak:
+
+        @alogin_required
+        @arole_required(lambda user: user.is_superadmin(), _('...'))
+        async def api_view(request): ...
+    """
+    def decorator(view_func):
+        @wraps(view_func)
+        async def wrapper(request, *args, **kwargs):
+            if not check(request.user):
+                messages.error(request, message)
+                return redirect('tickets:dashboard')
+            return await view_func(request, *args, **kwargs)
+        return wrapper
+    return decorator
@@ -116,6 +116,7 @@ class UserProfileForm(forms.ModelForm):
             'phone',
             'language',
             'avatar',
+            'new_ticket_digest',
         ]
         widgets = {
             'last_name': forms.TextInput(attrs={
@@ -146,12 +147,19 @@ class UserProfileForm(forms.ModelForm):
                 'class': 'form-file',
                 'accept': 'image/*',
             }),
+            'new_ticket_digest': forms.CheckboxInput(attrs={
+                'class': 'form-checkbox',
+            }),
         }
     
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.fields['middle_name'].required = False
         self.fields['department'].required = False
+        
+        # Xulosa faqat adminlar uchun (yangi murojaatlar bildirishnomasi ularga boradi)
+        if not self.instance.is_admin():
+            del self.fields['new_ticket_digest']
 
 
 class PasswordChangeForm(forms.Form):
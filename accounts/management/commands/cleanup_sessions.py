@@ -0,0 +1,43 @@
+from importlib import import_module
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+
+class Command(BaseCommand):
+    help = 'Muddati o\'tgan sessiyalarni bo\'laklab o\'chirish (jadvalni uzoq bloklamaydi)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=5000,
+            help='Bir tranzaksiyada o\'chiriladigan sessiyalar soni',
+        )
+
+    def handle(self, *args, **options):
+        engine = import_module(settings.SESSION_ENGINE)
+        store_class = engine.SessionStore
+
+        if not hasattr(store_class, 'get_model_class'):
+            # cache backend - yozuvlar keshda o'zi eskiradi
+            self.stdout.write(self.style.WARNING(
+                f'○ {settings.SESSION_ENGINE}: bazada sessiya yo\'q, tozalash shart emas'
+            ))
+            return
+
+        Session = store_class.get_model_class()
+        expired = Session.objects.filter(expire_date__lt=timezone.now())
+        batch_size = options['batch_size']
+
+        deleted_total = 0
+        while True:
+            keys = list(expired.values_list('session_key', flat=True)[:batch_size])
+            if not keys:
+                break
+            deleted, _ = Session.objects.filter(session_key__in=keys).delete()
+            deleted_total += deleted
+            self.stdout.write(f'  ... {deleted_total}')
+
+        self.stdout.write(self.style.SUCCESS(f'✓ O\'chirilgan sessiyalar: {deleted_total}'))
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from accounts.avatars import generate_avatar_renditions
+from accounts.models import User
+
+
+class Command(BaseCommand):
+    help = 'Mavjud avatarlar uchun 32/64/128 o\'lchamli WebP va JPEG nusxalarni yaratish'
+
+    def handle(self, *args, **options):
+        users = User.objects.exclude(avatar='').exclude(avatar__isnull=True).only('id', 'username', 'avatar')
+
+        created_count = 0
+        for user in users.iterator(chunk_size=500):
+            if generate_avatar_renditions(user):
+                created_count += 1
+                self.stdout.write(self.style.SUCCESS(f'✓ {user.username}'))
+            else:
+                self.stdout.write(self.style.WARNING(f'○ {user.username}: avatar o\'qilmadi'))
+
+        self.stdout.write(self.style.SUCCESS(f'\nJami: {created_count} ta avatar'))
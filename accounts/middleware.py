@@ -0,0 +1,42 @@
+# accounts/middleware.py - KAM YOZUVLI SESSIYA REJIMI
+
+import time
+
+from django.conf import settings
+from django.utils.deprecation import MiddlewareMixin
+
+
+SESSION_REFRESHED_KEY = '_refreshed_at'
+
+
+class SessionRefreshMiddleware(MiddlewareMixin):
+    """
+    Sessiya muddatini kamdan-kam yangilash (SESSION_SAVE_EVERY_REQUEST o'rniga)
+
+    SESSION_SAVE_EVERY_REQUEST = True har bir so'rovda (har 15 soniyadagi
+    bildirishnoma so'rovlari ham) sessiya jadvaliga UPDATE yozadi.
+    Bu middleware faqat oxirgi yangilanishdan beri
+    SESSION_COOKIE_AGE * SESSION_REFRESH_FRACTION soniya o'tgan bo'lsa
+    sessiyani "o'zgargan" deb belgilaydi - SessionMiddleware uni saqlaydi
+    va cookie muddatini uzaytiradi.
+
+    db, cached_db va cache backendlari bilan ishlaydi.
+    SessionMiddleware dan keyin turishi kerak. MiddlewareMixin - ASGI da
+    process_response ni Django o'zi threadda chaqiradi (sessiya sinxron o'qiladi).
+    """
+
+    def process_response(self, request, response):
+        session = getattr(request, 'session', None)
+        if session is None or settings.SESSION_SAVE_EVERY_REQUEST:
+            return response
+
+        # Anonim (bo'sh) sessiyalar yaratilmaydi, o'zgarganlari baribir saqlanadi
+        if session.modified or session.is_empty():
+            return response
+
+        now = int(time.time())
+        refresh_after = settings.SESSION_COOKIE_AGE * getattr(settings, 'SESSION_REFRESH_FRACTION', 0.5)
+        if now - session.get(SESSION_REFRESHED_KEY, 0) >= refresh_after:
+            session[SESSION_REFRESHED_KEY] = now
+
+        return response
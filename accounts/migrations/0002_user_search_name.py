@@ -0,0 +1,55 @@
+# Generated by Django 5.0 on 2026-10-19 10:28
+
+from django.db import migrations, models
+
+from accounts.search import build_search_name
+
+
+def backfill_search_name(apps, schema_editor):
+    """Mavjud foydalanuvchilar uchun search_name ni to'ldirish"""
+    User = apps.get_model('accounts', 'User')
+    batch = []
+    for user in User.objects.only(
+        'id', 'username', 'last_name', 'first_name', 'middle_name'
+    ).iterator(chunk_size=2000):
+        user.search_name = build_search_name(user)
+        batch.append(user)
+        if len(batch) >= 2000:
+            User.objects.bulk_update(batch, ['search_name'])
+            batch = []
+    if batch:
+        User.objects.bulk_update(batch, ['search_name'])
+
+
+def create_trigram_index(apps, schema_editor):
+    """PostgreSQL: pg_trgm GIN indeksi (boshqa bazalarda o'tkazib yuboriladi)"""
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    schema_editor.execute(
+        'CREATE INDEX IF NOT EXISTS accounts_user_search_name_trgm '
+        'ON accounts_user USING gin (search_name gin_trgm_ops)'
+    )
+
+
+def drop_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('DROP INDEX IF EXISTS accounts_user_search_name_trgm')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='search_name',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=700, verbose_name='Qidiruv matni'),
+        ),
+        migrations.RunPython(backfill_search_name, migrations.RunPython.noop),
+        migrations.RunPython(create_trigram_index, drop_trigram_index),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.0 on 2026-10-19 11:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_user_search_name'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='digest_sent_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True, verbose_name='Oxirgi xulosa vaqti'),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='new_ticket_digest',
+            field=models.BooleanField(default=False, help_text="Har bir yangi murojaat uchun bildirishnoma o'rniga davriy xulosa (adminlar uchun)", verbose_name='Yangi murojaatlar xulosasi'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.0 on 2026-10-19 11:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0003_notification_digest'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='notifications_read_until',
+            field=models.DateTimeField(blank=True, editable=False, null=True, verbose_name="Bildirishnomalar o'qilgan vaqt"),
+        ),
+    ]
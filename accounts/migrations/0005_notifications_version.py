@@ -0,0 +1,18 @@
+# Generated by Django 5.0 on 2026-10-19 12:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0004_notifications_read_until'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='notifications_version',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Bildirishnomalar versiyasi'),
+        ),
+    ]
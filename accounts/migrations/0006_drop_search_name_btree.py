@@ -0,0 +1,18 @@
+# Generated by Django 5.0 on 2026-10-19 12:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0005_notifications_version'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='user',
+            name='search_name',
+            field=models.CharField(blank=True, editable=False, max_length=700, verbose_name='Qidiruv matni'),
+        ),
+    ]
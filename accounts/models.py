@@ -1,6 +1,11 @@
 from django.db import models
 from django.contrib.auth.models import AbstractUser
 from django.utils.translation import gettext_lazy as _
+from .search import build_search_name
+
+
+# search_name shu maydonlardan yig'iladi
+SEARCH_SOURCE_FIELDS = {'username', 'last_name', 'first_name', 'middle_name'}
 
 
 class Region(models.Model):
@@ -101,11 +106,38 @@ class User(AbstractUser):
         verbose_name=_("Avatar")
     )
     
+    # Bildirishnomalar: yangi murojaatlar har biri alohida emas, davriy xulosa
+    # (python manage.py send_notification_digests)
+    new_ticket_digest = models.BooleanField(
+        default=False,
+        verbose_name=_("Yangi murojaatlar xulosasi"),
+        help_text=_("Har bir yangi murojaat uchun bildirishnoma o'rniga davriy xulosa (adminlar uchun)")
+    )
+    digest_sent_at = models.DateTimeField(null=True, blank=True, editable=False, verbose_name=_("Oxirgi xulosa vaqti"))
+    # Shu vaqtgacha yaratilgan bildirishnomalar o'qilgan ("barchasini o'qildi" - bitta yozuv)
+    notifications_read_until = models.DateTimeField(
+        null=True, blank=True, editable=False, verbose_name=_("Bildirishnomalar o'qilgan vaqt")
+    )
+    # Har bir bildirishnoma o'zgarishida oshadi (notifications.cache - fragment kesh va ETag kalitlari)
+    notifications_version = models.PositiveIntegerField(
+        default=0, editable=False, verbose_name=_("Bildirishnomalar versiyasi")
+    )
+    
     # Holat
     is_active = models.BooleanField(default=True, verbose_name=_("Aktiv"))
     created_at = models.DateTimeField(auto_now_add=True, verbose_name=_("Yaratilgan"))
     updated_at = models.DateTimeField(auto_now=True, verbose_name=_("O'zgartirilgan"))
     
+    # Qidiruv (normallashtirilgan F.I.Sh + login, save() da yangilanadi).
+    # PostgreSQL: pg_trgm GIN indeksi (0002 migratsiya); B-tree yo'q - qidiruv
+    # so'zning istalgan joyidan (LIKE '%...%'), prefiks oralig'i emas
+    search_name = models.CharField(
+        max_length=700,
+        blank=True,
+        editable=False,
+        verbose_name=_("Qidiruv matni")
+    )
+    
     class Meta:
         verbose_name = _("Foydalanuvchi")
         verbose_name_plural = _("Foydalanuvchilar")
@@ -114,6 +146,21 @@ class User(AbstractUser):
     def __str__(self):
         return f"{self.last_name} {self.first_name}"
     
+    def save(self, *args, **kwargs):
+        # Qidiruv ustunini yangilash
+        self.search_name = build_search_name(self)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and SEARCH_SOURCE_FIELDS.intersection(update_fields):
+            kwargs['update_fields'] = {*update_fields, 'search_name'}
+        
+        # Yangi yuklangan avatar (hali diskka yozilmagan)
+        avatar_uploaded = bool(self.avatar) and not self.avatar._committed
+        super().save(*args, **kwargs)
+        
+        if avatar_uploaded:
+            from .avatars import generate_avatar_renditions
+            generate_avatar_renditions(self)
+    
     def get_full_name(self):
         """To'liq ism"""
         parts = [self.last_name, self.first_name]
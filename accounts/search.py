@@ -0,0 +1,72 @@
+# accounts/search.py - FOYDALANUVCHILARNI INDEKSLANGAN QIDIRISH
+
+from django.db.models import Q
+
+
+# Kirill -> Lotin (o'zbek rasmiy alifbosi bo'yicha)
+CYRILLIC_TO_LATIN = {
+    'а': 'a', 'б': 'b', 'в': 'v', 'г': 'g', 'д': 'd', 'е': 'e',
+    'ё': 'yo', 'ж': 'j', 'з': 'z', 'и': 'i', 'й': 'y', 'к': 'k',
+    'л': 'l', 'м': 'm', 'н': 'n', 'о': 'o', 'п': 'p', 'р': 'r',
+    'с': 's', 'т': 't', 'у': 'u', 'ф': 'f', 'х': 'x', 'ц': 'ts',
+    'ч': 'ch', 'ш': 'sh', 'щ': 'sh', 'ъ': '', 'ы': 'i', 'ь': '',
+    'э': 'e', 'ю': 'yu', 'я': 'ya', 'ў': 'o', 'қ': 'q', 'ғ': 'g',
+    'ҳ': 'h',
+}
+
+# O', G' va boshqa tutuq belgilari olib tashlanadi (ў -> o bilan mos bo'lishi uchun)
+APOSTROPHES = "'`ʻʼ‘’"
+
+_TRANSLATION_TABLE = str.maketrans(
+    {**CYRILLIC_TO_LATIN, **{ch: '' for ch in APOSTROPHES}}
+)
+
+# Trigram indeks 3 belgidan qisqa so'rovlarda samarasiz
+TRIGRAM_MIN_LENGTH = 3
+
+
+def normalize_search_text(value):
+    """
+    Matnni qidiruv uchun normallashtirish
+
+    Kichik harf, Kirill -> Lotin, tutuq belgilarisiz, bitta probel.
+    "Каримов" va "Karimov" bir xil natija beradi: "karimov"
+    """
+    if not value:
+        return ''
+    value = value.lower().translate(_TRANSLATION_TABLE)
+    return ' '.join(value.split())
+
+
+def build_search_name(user):
+    """User.search_name ustuni qiymati: familiya ism sharif login"""
+    return normalize_search_text(' '.join([
+        user.last_name or '',
+        user.first_name or '',
+        user.middle_name or '',
+        user.username or '',
+    ]))
+
+
+def search_users(queryset, query):
+    """
+    Foydalanuvchilarni search_name bo'yicha qidirish
+
+    Har bir so'z search_name ichida (familiya, ism, sharif yoki login) bo'lishi
+    kerak - "Javohir" ham, "nazarov jav" ham topiladi.
+
+    - PostgreSQL: pg_trgm GIN indeksi (TRIGRAM_MIN_LENGTH dan uzun so'zlar)
+    - Boshqa bazalar (SQLite) va qisqa so'zlar: LIKE '%...%' - jadval to'liq
+      ko'riladi (foydalanuvchilar soni minglab, murojaatlar emas); prefiks
+      oralig'i indeksdan foydalanardi, lekin ism/sharifni topmas edi
+
+    Bo'sh so'rovda queryset o'zgarmasdan qaytadi.
+    """
+    normalized = normalize_search_text(query)
+    if not normalized:
+        return queryset
+
+    condition = Q()
+    for token in normalized.split():
+        condition &= Q(search_name__contains=token)
+    return queryset.filter(condition)
@@ -0,0 +1,42 @@
+# accounts/templatetags/avatars.py - {% load avatars %}
+
+from django import template
+from django.utils.html import format_html
+
+from accounts.avatars import avatar_rendition_url
+
+register = template.Library()
+
+
+@register.simple_tag
+def avatar_url(user, size=64, extension='webp'):
+    """{% avatar_url user 64 %} - tayyor nusxa URL manzili"""
+    return avatar_rendition_url(user, int(size), extension)
+
+
+@register.simple_tag
+def avatar(user, size=64, css_class=''):
+    """
+    {% avatar user 32 "user-avatar" %}
+
+    <picture>: WebP (1x/2x) va JPEG zaxira. class <img> ga qo'yiladi -
+    mavjud CSS o'zgarishsiz ishlaydi. Avatar yo'q bo'lsa bo'sh satr.
+    """
+    if not user or not getattr(user, 'avatar', None):
+        return ''
+
+    size = int(size)
+    return format_html(
+        '<picture>'
+        '<source type="image/webp" srcset="{} 1x, {} 2x">'
+        '<img src="{}" srcset="{} 2x" width="{}" height="{}" class="{}" alt="{}" loading="lazy">'
+        '</picture>',
+        avatar_rendition_url(user, size, 'webp'),
+        avatar_rendition_url(user, size * 2, 'webp'),
+        avatar_rendition_url(user, size, 'jpg'),
+        avatar_rendition_url(user, size * 2, 'jpg'),
+        size,
+        size,
+        css_class,
+        user.get_full_name(),
+    )
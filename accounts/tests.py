@@ -1,3 +1,166 @@
-from django.test import TestCase
+import shutil
+import tempfile
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.conf import settings
+from django.contrib.sessions.backends.db import SessionStore
+from django.contrib.sessions.models import Session
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from . import avatars
+from .checks import check_session_cache
+from .middleware import SESSION_REFRESHED_KEY
+from .models import User
+from .search import search_users
+
+
+class SearchUsersTest(TestCase):
+    """accounts.search.search_users - ism, sharif va login bo'yicha qidirish"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(
+            username='jnazarov', last_name='Nazarov', first_name='Javohir', middle_name='Olimovich',
+        )
+        User.objects.create(username='bkarimov', last_name='Karimov', first_name='Botir')
+
+    def search(self, query):
+        return list(search_users(User.objects.all(), query).values_list('username', flat=True))
+
+    def test_first_and_middle_name(self):
+        self.assertEqual(self.search('Javohir'), ['jnazarov'])
+        self.assertEqual(self.search('olim'), ['jnazarov'])
+
+    def test_short_query(self):
+        self.assertEqual(self.search('ja'), ['jnazarov'])
+
+    def test_every_token_must_match(self):
+        self.assertEqual(self.search('jav naz'), ['jnazarov'])
+        self.assertEqual(self.search('Javohir Karimov'), [])
+
+    def test_cyrillic_and_username(self):
+        self.assertEqual(self.search('Каримов'), ['bkarimov'])
+        self.assertEqual(self.search('JNAZAROV'), ['jnazarov'])
+
+    def test_empty_query(self):
+        self.assertEqual(len(self.search('  ')), 2)
+
+
+class AvatarRenditionTest(TestCase):
+    """accounts.avatars - nusxa nomlari va o'qilmagan avatarlar"""
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        cache.clear()
+
+    def test_same_basename_in_different_directories(self):
+        first = avatars.rendition_name('avatars/a/me.jpg', 64, 'webp')
+        second = avatars.rendition_name('avatars/b/me.jpg', 64, 'webp')
+        self.assertNotEqual(first, second)
+        self.assertTrue(first.startswith(avatars.THUMBS_DIR + '/me_'))
+
+    def test_failed_generation_is_not_retried(self):
+        name = default_storage.save('avatars/broken.jpg', ContentFile(b'rasm emas'))
+        user = User.objects.create(username='broken', avatar=name)
+
+        with mock.patch.object(avatars, '_open_square', wraps=avatars._open_square) as open_square, \
+                self.assertLogs('accounts.avatars', 'WARNING'):
+            self.assertEqual(avatars.avatar_rendition_url(user), user.avatar.url)
+            self.assertEqual(avatars.avatar_rendition_url(user, 32), user.avatar.url)
+        self.assertEqual(open_square.call_count, 1)
+
+
+class SessionRefreshTest(TestCase):
+    """accounts.middleware.SessionRefreshMiddleware - sessiya kamdan-kam yoziladi"""
+
+    def setUp(self):
+        self.user = User.objects.create(username='usr', role='user')
+        self.client.force_login(self.user)
+        self.url = reverse('notifications:unread_count')
+
+    def refreshed_at(self):
+        return SessionStore(self.client.session.session_key).load().get(SESSION_REFRESHED_KEY)
+
+    def test_refresh_after_fraction_of_age(self):
+        self.client.get(self.url)
+        first = self.refreshed_at()
+        self.assertIsNotNone(first)
+
+        with mock.patch('accounts.middleware.time.time', return_value=first + 60):
+            self.client.get(self.url)
+        self.assertEqual(self.refreshed_at(), first)
+
+        later = first + settings.SESSION_COOKIE_AGE // 2
+        with mock.patch('accounts.middleware.time.time', return_value=later):
+            self.client.get(self.url)
+        self.assertEqual(self.refreshed_at(), later)
+
+    def test_anonymous_request_creates_no_session(self):
+        self.client.logout()
+        self.client.get(reverse('accounts:login'))
+        self.assertFalse(Session.objects.exists())
+
+    @override_settings(SESSION_SAVE_EVERY_REQUEST=True)
+    def test_disabled_when_saving_every_request(self):
+        self.client.get(self.url)
+        self.assertIsNone(self.refreshed_at())
+
+
+class CleanupSessionsTest(TestCase):
+    """cleanup_sessions - muddati o'tgan sessiyalar bo'laklab o'chiriladi"""
+
+    def setUp(self):
+        now = timezone.now()
+        for index in range(5):
+            Session.objects.create(session_key=f'old{index}', session_data='', expire_date=now - timedelta(days=1))
+        Session.objects.create(session_key='live', session_data='', expire_date=now + timedelta(days=1))
+
+    def test_batches(self):
+        out = StringIO()
+        call_command('cleanup_sessions', batch_size=2, stdout=out)
+        self.assertIn('✓ O\'chirilgan sessiyalar: 5', out.getvalue())
+        self.assertEqual(list(Session.objects.values_list('session_key', flat=True)), ['live'])
+
+    @override_settings(SESSION_ENGINE='django.contrib.sessions.backends.cache')
+    def test_cache_backend_is_skipped(self):
+        out = StringIO()
+        call_command('cleanup_sessions', stdout=out)
+        self.assertIn('○', out.getvalue())
+        self.assertEqual(Session.objects.count(), 6)
+
+
+class SessionCacheCheckTest(TestCase):
+    """accounts.checks - cache sessiyalari jarayon ichidagi kesh bilan"""
+
+    def check_ids(self):
+        return [message.id for message in check_session_cache(None)]
+
+    def test_db_backend(self):
+        self.assertEqual(self.check_ids(), [])
+
+    @override_settings(SESSION_ENGINE='django.contrib.sessions.backends.cache')
+    def test_cache_backend_with_locmem(self):
+        self.assertEqual(self.check_ids(), ['accounts.E001'])
+
+    @override_settings(SESSION_ENGINE='django.contrib.sessions.backends.cached_db')
+    def test_cached_db_with_locmem(self):
+        self.assertEqual(self.check_ids(), ['accounts.W001'])
+
+    @override_settings(
+        SESSION_ENGINE='django.contrib.sessions.backends.cache',
+        CACHES={'default': {'BACKEND': 'django.core.cache.backends.redis.RedisCache', 'LOCATION': 'redis://'}},
+    )
+    def test_shared_cache(self):
+        self.assertEqual(self.check_ids(), [])
@@ -101,6 +101,34 @@ def can_admin_see_ticket(user, ticket):
     return False
 
 
+def can_view_ticket(user, ticket):
+    """
+    Foydalanuvchi ticketni (va uning fayllarini) ko'ra oladimi?
+
+    ticket_detail dagi qoidalar bilan bir xil:
+    - user: faqat o'z ticketi
+    - technician: faqat o'ziga biriktirilgan
+    - admin: tizim va viloyat bo'yicha
+    - superadmin: hammasi
+
+    Returns:
+        bool: True/False
+    """
+    if user.is_superadmin():
+        return True
+
+    if user.role == 'user':
+        return ticket.user_id == user.id
+
+    if user.is_technician() and not user.is_admin():
+        return ticket.assigned_to_id == user.id
+
+    if user.is_admin():
+        return can_admin_see_ticket(user, ticket)
+
+    return False
+
+
 def filter_tickets_for_admin(queryset, user):
     """
     Admin uchun ticketlarni filtrlash
@@ -131,6 +159,26 @@ def filter_tickets_for_admin(queryset, user):
     return queryset
 
 
+def filter_tickets_for_user(queryset, user):
+    """
+    can_view_ticket ning queryset varianti (API ro'yxatlari uchun)
+    
+    - user: faqat o'z ticketlari
+    - technician: faqat o'ziga biriktirilganlar
+    - admin/superadmin: filter_tickets_for_admin
+    """
+    if user.is_superadmin():
+        return queryset
+    
+    if user.role == 'user':
+        return queryset.filter(user=user)
+    
+    if user.is_technician() and not user.is_admin():
+        return queryset.filter(assigned_to=user)
+    
+    return filter_tickets_for_admin(queryset, user)
+
+
 def get_admin_context(user):
     """
     Admin dashboard uchun context ma'lumotlari
@@ -173,8 +173,8 @@ def change_language(request):
     
     return redirect('tickets:dashboard')
 
-def get_departments(request, region_id):
-    """Viloyatga qarab bo'limlarni qaytarish (AJAX uchun)"""
+async def get_departments(request, region_id):
+    """Viloyatga qarab bo'limlarni qaytarish (AJAX uchun, async)"""
     try:
         departments = Department.objects.filter(
             region_id=region_id, 
@@ -182,7 +182,7 @@ def get_departments(request, region_id):
         ).values('id', 'name')
         
         return JsonResponse({
-            'departments': list(departments)
+            'departments': [department async for department in departments]
         })
     except Exception as e:
         return JsonResponse({
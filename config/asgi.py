@@ -5,6 +5,21 @@ It exposes the ASGI callable as a module-level variable named ``application``.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.0/howto/deployment/asgi/
+
+ASGI deploy profili (async JSON endpointlar: bildirishnomalar soni/ro'yxati,
+bo'limlar, superadmin API lari, tizimlar qidiruvi):
+
+    # Bitta jarayon (kichik server / tekshirish)
+    uvicorn config.asgi:application --host 0.0.0.0 --port $PORT
+
+    # Production: gunicorn jarayonlarni boshqaradi, uvicorn worker
+    gunicorn config.asgi:application -c config/gunicorn_asgi.py
+
+- DJANGO_ASGI=1 shu fayl tomonidan o'rnatiladi: doimiy DB ulanishlar
+  o'chiriladi (CONN_MAX_AGE=0), pool uchun PgBouncer tavsiya etiladi
+- Sync viewlar (sahifalar, eksportlar) ASGI da ham ishlaydi, lekin har biri
+  threadga o'tkaziladi - asosan shu viewlar bo'lsa WSGI (gunicorn) tezroq
+- Solishtirish: python manage.py benchmark_asgi
 """
 
 import os
@@ -12,5 +27,6 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+os.environ.setdefault('DJANGO_ASGI', '1')
 
 application = get_asgi_application()
@@ -0,0 +1,21 @@
+# config/gunicorn_asgi.py - GUNICORN + UVICORN WORKER (ASGI DEPLOY PROFILI)
+#
+# gunicorn config.asgi:application -c config/gunicorn_asgi.py
+#
+# Har bir worker - bitta event loop: bildirishnoma so'rovlari (polling) uchun
+# har so'rovga alohida thread/worker kerak emas. Sync viewlar Django tomonidan
+# threadga o'tkaziladi (sync_to_async).
+
+import multiprocessing
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+worker_class = 'uvicorn_worker.UvicornWorker'
+# Async workerlar kam kerak: CPU soni (WSGI dagi 2*CPU+1 emas)
+workers = int(os.getenv('WEB_CONCURRENCY', multiprocessing.cpu_count()))
+timeout = 120
+graceful_timeout = 30
+keepalive = 5
+# Xotira sizib chiqishidan himoya - worker vaqti-vaqti bilan qayta ishga tushadi
+max_requests = 5000
+max_requests_jitter = 500
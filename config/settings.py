@@ -34,8 +34,15 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
-    'whitenoise.middleware.WhiteNoiseMiddleware',
+    'tickets.static_middleware.AsyncWhiteNoiseMiddleware',
+    'tickets.compression.CompressionMiddleware',
+    'django.middleware.http.ConditionalGetMiddleware',
+    'tickets.metrics.MetricsMiddleware',
+    'tickets.profiling.RequestProfilingMiddleware',
+    'tickets.query_budget.QueryBudgetMiddleware',
+    'tickets.db_router.ReplicaStickinessMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
+    'accounts.middleware.SessionRefreshMiddleware',
     'django.middleware.locale.LocaleMiddleware',  # ✅ Til middleware
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -50,8 +57,14 @@ TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
         'DIRS': [BASE_DIR / 'templates'],
-        'APP_DIRS': True,
         'OPTIONS': {
+            # Kompilyatsiya qilingan shablonlar jarayon xotirasida saqlanadi
+            'loaders': [
+                ('django.template.loaders.cached.Loader', [
+                    'django.template.loaders.filesystem.Loader',
+                    'django.template.loaders.app_directories.Loader',
+                ]),
+            ],
             'context_processors': [
                 'django.template.context_processors.debug',
                 'django.template.context_processors.request',
@@ -59,18 +72,23 @@ TEMPLATES = [
                 'django.contrib.messages.context_processors.messages',
                 'django.template.context_processors.i18n',  # ✅ i18n context
                 'accounts.context_processors.new_tickets_count',
+                'notifications.context_processors.notifications',
             ],
         },
     },
 ]
 
 WSGI_APPLICATION = 'config.wsgi.application'
+# config/asgi.py orqali ishga tushganda (uvicorn) o'rnatiladi
+ASGI_MODE = os.getenv('DJANGO_ASGI', '') == '1'
 
 # Database
 DATABASE_URL = os.getenv("DATABASE_URL")
 if DATABASE_URL:
     DATABASES = {
-        'default': dj_database_url.parse(DATABASE_URL, conn_max_age=600)
+        # ASGI da doimiy ulanishlar o'chiriladi - har bir so'rov o'z threadida
+        # ulanish ochadi va ular yopilmay qoladi (pool kerak bo'lsa: PgBouncer)
+        'default': dj_database_url.parse(DATABASE_URL, conn_max_age=0 if ASGI_MODE else 600)
     }
 else:
     DATABASES = {
@@ -80,6 +98,20 @@ else:
         }
     }
 
+# Read-replica (ixtiyoriy): hisobotlar, dashboardlar va exportlar o'qishi
+# (tickets.db_router.replica_reads). Lokal sinov uchun ikki SQLite fayl:
+#   cp db.sqlite3 replica.sqlite3
+#   DATABASE_REPLICA_URL=sqlite:///replica.sqlite3 python manage.py runserver
+DATABASE_REPLICA_URL = os.getenv('DATABASE_REPLICA_URL')
+if DATABASE_REPLICA_URL:
+    DATABASES['replica'] = dj_database_url.parse(DATABASE_REPLICA_URL, conn_max_age=0 if ASGI_MODE else 600)
+    # Testlarda alohida baza yaratilmaydi - default ga ulanadi
+    DATABASES['replica']['TEST'] = {'MIRROR': 'default'}
+
+DATABASE_ROUTERS = ['tickets.db_router.ReplicaRouter']
+# Yozgan foydalanuvchi shuncha soniya primarydan o'qiydi (replica kechikishi)
+DATABASE_REPLICA_STICKY_SECONDS = int(os.getenv('DATABASE_REPLICA_STICKY_SECONDS', 5))
+
 # Custom User Model
 AUTH_USER_MODEL = 'accounts.User'
 
@@ -152,6 +184,14 @@ STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Ruxsat tekshirilgandan keyin faylni kim yuboradi:
+#   ''         - Django (FileResponse, Range/ETag bilan)
+#   'nginx'    - X-Accel-Redirect: MEDIA_ACCEL_PREFIX + yo'l
+#                location /protected-media/ { internal; alias /app/media/; }
+#   'sendfile' - X-Sendfile: to'liq fayl yo'li (Apache mod_xsendfile, lighttpd)
+MEDIA_ACCEL_MODE = os.getenv('MEDIA_ACCEL_MODE', '')
+MEDIA_ACCEL_PREFIX = os.getenv('MEDIA_ACCEL_PREFIX', '/protected-media/')
+
 # ============================================
 # DEFAULT SETTINGS
 # ============================================
@@ -165,4 +205,130 @@ LOGOUT_REDIRECT_URL = 'accounts:login'
 
 # Session settings
 SESSION_COOKIE_AGE = 86400  # 24 hours
-SESSION_SAVE_EVERY_REQUEST = True
\ No newline at end of file
+# Har so'rovda UPDATE o'rniga - muddat faqat sessiya yoshi
+# SESSION_COOKIE_AGE * SESSION_REFRESH_FRACTION dan oshganda yangilanadi
+# (accounts.middleware.SessionRefreshMiddleware)
+SESSION_SAVE_EVERY_REQUEST = False
+SESSION_REFRESH_FRACTION = float(os.getenv('SESSION_REFRESH_FRACTION', 0.5))
+# db | cached_db | cache
+# cache va cached_db umumiy kesh talab qiladi (CACHE_BACKEND=Redis/FileBasedCache):
+# LocMemCache bilan cache - manage.py check xatolik (accounts.E001), cached_db - ogohlantirish
+SESSION_ENGINE = 'django.contrib.sessions.backends.' + os.getenv('SESSION_BACKEND', 'db')
+
+# ============================================
+# CACHE
+# ============================================
+
+# Default: jarayon ichidagi xotira. Fragment kesh kalitlari (navbar, bildirishnomalar)
+# bazadagi versiyalardan olinadi - har bir worker o'z keshini isitadi, lekin eskirgan
+# fragment ko'rsatmaydi. Bir nechta gunicorn worker uchun umumiy kesh:
+#   CACHE_BACKEND=django.core.cache.backends.redis.RedisCache CACHE_LOCATION=redis://...
+#   CACHE_BACKEND=django.core.cache.backends.filebased.FileBasedCache CACHE_LOCATION=/var/tmp/iiv-cache
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv('CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.getenv('CACHE_LOCATION', ''),
+    }
+}
+
+# ============================================
+# SQL SO'ROVLAR BYUDJETI (tickets.query_budget)
+# ============================================
+
+# raise - byudjetdan oshsa xatolik (dev/test), log - ogohlantirish, off - sanalmaydi
+QUERY_BUDGET_MODE = os.getenv('QUERY_BUDGET_MODE', 'raise' if DEBUG else 'log')
+# @query_budget e'lon qilinmagan viewlar uchun (None - tekshirilmaydi)
+QUERY_BUDGET_DEFAULT = int(os.getenv('QUERY_BUDGET_DEFAULT')) if os.getenv('QUERY_BUDGET_DEFAULT') else None
+
+# ============================================
+# SO'ROVLARNI PROFILLASH (tickets.profiling)
+# ============================================
+
+# O'chiq bo'lsa middleware zanjirdan chiqariladi (qo'shimcha xarajat yo'q)
+REQUEST_PROFILING_ENABLED = os.getenv('REQUEST_PROFILING', '') == '1'
+# DB/shablon vaqti o'lchanadigan so'rovlar ulushi (0.1 = 10%)
+REQUEST_PROFILING_SAMPLE_RATE = float(os.getenv('REQUEST_PROFILING_SAMPLE_RATE', 0.1))
+# Bundan sekin so'rovlar tickets.profiling loggeriga JSON bo'lib yoziladi
+REQUEST_PROFILING_SLOW_MS = int(os.getenv('REQUEST_PROFILING_SLOW_MS', 1000))
+REQUEST_PROFILING_TOP_SQL = 5
+# URL nomi bo'yicha javob vaqtlari (oxirgi 15 daqiqa) xulosasi har worker dan shu oraliqda
+# tickets.profiling loggeriga yoziladi (0 - yozilmaydi)
+REQUEST_PROFILING_HISTOGRAM_LOG_SECONDS = int(os.getenv('REQUEST_PROFILING_HISTOGRAM_LOG_SECONDS', 300))
+REQUEST_PROFILING_SERVER_TIMING = True
+# X-Profile-Token (python manage.py profile_token) bilan kelgan so'rovlar cProfile natijasi
+REQUEST_PROFILING_DIR = os.getenv('REQUEST_PROFILING_DIR', str(BASE_DIR / 'profiles'))
+REQUEST_PROFILING_TOKEN_MAX_AGE = 3600
+
+# ============================================
+# PROMETHEUS METRIKALARI (tickets.metrics, /metrics)
+# ============================================
+
+# O'chiq bo'lsa middleware zanjirdan chiqariladi va /metrics 404 qaytaradi
+METRICS_ENABLED = os.getenv('METRICS', '') == '1'
+# Gunicorn workerlari holatini yozadigan katalog (bo'sh - faqat joriy jarayon).
+# Deploy paytida tozalanishi kerak, masalan: rm -rf $METRICS_DIR && gunicorn ...
+METRICS_DIR = os.getenv('METRICS_DIR', '')
+METRICS_FLUSH_SECONDS = int(os.getenv('METRICS_FLUSH_SECONDS', 5))
+# Sessiyasiz (Prometheus) kirish: Authorization: Bearer <METRICS_TOKEN>
+METRICS_TOKEN = os.getenv('METRICS_TOKEN', '')
+# Yoki manzillar, vergul bilan - xom REMOTE_ADDR bilan solishtiriladi. Ilova nginx
+# orqasida bo'lsa barcha so'rovlar 127.0.0.1 dan keladi: bu yerga proxy manzilini
+# qo'shmang (/metrics ochiq bo'lib qoladi), METRICS_TOKEN ishlating
+METRICS_ALLOWED_IPS = [ip.strip() for ip in os.getenv('METRICS_ALLOWED_IPS', '').split(',') if ip.strip()]
+
+# ============================================
+# JAVOBLARNI SIQISH (tickets.compression)
+# ============================================
+
+# Bundan kichik HTML/JSON javoblar siqilmaydi (bayt)
+COMPRESSION_MIN_SIZE = int(os.getenv('COMPRESSION_MIN_SIZE', 1024))
+# 0-11: 4-6 dinamik javoblar uchun tezlik/hajm muvozanati
+COMPRESSION_BROTLI_QUALITY = int(os.getenv('COMPRESSION_BROTLI_QUALITY', 5))
+
+# ============================================
+# AVTOMATIK BIRIKTIRISH (tickets.assignment, System.assignment_mode)
+# ============================================
+
+# hybrid rejim: eng kam yuklangan texnikda shuncha ochiq murojaat bo'lsa - navbatda qoladi
+AUTO_ASSIGN_HYBRID_MAX_LOAD = int(os.getenv('AUTO_ASSIGN_HYBRID_MAX_LOAD', 5))
+
+# ============================================
+# TEXNIK NAVBATI (tickets.queue)
+# ============================================
+
+# 'priority' - ustuvorlik va kutish vaqti bo'yicha, 'newest' - eng yangilari birinchi
+TICKET_QUEUE_ORDERING = os.getenv('TICKET_QUEUE_ORDERING', 'priority')
+# Ustuvorlik "oldindan kutilgan" soatlar sifatida: high murojaat 48 soat kutgan
+# low murojaat bilan teng. O'zgartirgandan keyin: python manage.py rebuild_queue_keys
+TICKET_QUEUE_PRIORITY_BOOST_HOURS = {
+    'high': int(os.getenv('TICKET_QUEUE_BOOST_HIGH', 48)),
+    'medium': int(os.getenv('TICKET_QUEUE_BOOST_MEDIUM', 12)),
+    'low': 0,
+}
+
+# ============================================
+# REJALASHTIRUVCHI (python manage.py run_ticket_scheduler, har 5-15 daqiqada)
+# ============================================
+
+# Baholanmagan pending_approval murojaat shuncha kundan keyin avtomatik yopiladi
+TICKET_AUTO_RESOLVE_DAYS = int(os.getenv('TICKET_AUTO_RESOLVE_DAYS', 7))
+# Foydalanuvchiga baholash eslatmasi (bir marta)
+TICKET_RATING_REMINDER_DAYS = int(os.getenv('TICKET_RATING_REMINDER_DAYS', 2))
+# Shuncha soat biriktirilmagan yangi murojaat viloyat/respublika adminiga eskalatsiya
+TICKET_ESCALATE_AFTER_HOURS = int(os.getenv('TICKET_ESCALATE_AFTER_HOURS', 4))
+# Shuncha soat o'zgarmagan ishlayotgan murojaat - texnikka eslatma
+TICKET_REMINDER_AFTER_HOURS = int(os.getenv('TICKET_REMINDER_AFTER_HOURS', 24))
+
+# ============================================
+# BILDIRISHNOMA XULOSASI (python manage.py send_notification_digests)
+# ============================================
+
+# Birinchi xulosa: shuncha soat ichidagi yangi murojaatlar
+NOTIFICATION_DIGEST_LOOKBACK_HOURS = int(os.getenv('NOTIFICATION_DIGEST_LOOKBACK_HOURS', 24))
+
+# ============================================
+# ARXIVLASH (python manage.py archive_tickets)
+# ============================================
+
+TICKET_ARCHIVE_AFTER_DAYS = int(os.getenv('TICKET_ARCHIVE_AFTER_DAYS', 180))
+NOTIFICATION_PURGE_AFTER_DAYS = int(os.getenv('NOTIFICATION_PURGE_AFTER_DAYS', 90))
@@ -3,8 +3,9 @@ from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
 from django.views.generic import RedirectView
-from django.views.static import serve  # ✅ QOSHISH
 from django.urls import re_path  # ✅ QOSHISH
+from tickets.views_media import serve_media
+from tickets.views_metrics import metrics_view
 
 urlpatterns = [
     path('admin/', admin.site.urls),
@@ -15,15 +16,16 @@ urlpatterns = [
     path('notifications/', include('notifications.urls')),
     path('systems/', include('systems.urls')),
     path('reports/', include('reports.urls')),
+    path('api/v1/', include('tickets.urls_api')),
+    # Prometheus (METRICS_ENABLED, METRICS_TOKEN, METRICS_ALLOWED_IPS yoki superadmin)
+    path('metrics', metrics_view, name='metrics'),
     # Root redirect
     path('', RedirectView.as_view(url='/accounts/login/', permanent=False)),
 ]
 
-# ✅ MEDIA FAYLLAR (DEBUG=False da ham ishlashi uchun)
+# ✅ MEDIA FAYLLAR (ruxsat tekshiruvi bilan; proxy bo'lsa X-Accel-Redirect / X-Sendfile)
 urlpatterns += [
-    re_path(r'^media/(?P<path>.*)$', serve, {
-        'document_root': settings.MEDIA_ROOT,
-    }),
+    re_path(r'^media/(?P<path>.*)$', serve_media, name='serve_media'),
 ]
 
 # Static fayllar (development uchun)
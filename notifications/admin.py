@@ -2,6 +2,7 @@ from django.contrib import admin
 from django.utils.translation import gettext_lazy as _
 from django.utils.html import format_html
 from .models import Notification
+from .cache import bump_notification_version
 
 
 @admin.register(Notification)
@@ -10,6 +11,7 @@ class NotificationAdmin(admin.ModelAdmin):
         'user',
         'notification_type',
         'title',
+        'count',
         'get_read_status',
         'created_at'
     ]
@@ -17,6 +19,7 @@ class NotificationAdmin(admin.ModelAdmin):
     search_fields = ['user__first_name', 'user__last_name', 'title', 'text']
     autocomplete_fields = ['user']
     readonly_fields = ['created_at']
+    list_select_related = ['user']
     ordering = ['-created_at']
     
     fieldsets = (
@@ -24,7 +27,7 @@ class NotificationAdmin(admin.ModelAdmin):
             'fields': ('user',)
         }),
         (_('Bildirishnoma tafsilotlari'), {
-            'fields': ('notification_type', 'title', 'text', 'url')
+            'fields': ('notification_type', 'title', 'text', 'url', 'count')
         }),
         (_('Holat'), {
             'fields': ('is_read', 'created_at')
@@ -33,7 +36,7 @@ class NotificationAdmin(admin.ModelAdmin):
     
     def get_read_status(self, obj):
         """O'qilgan/o'qilmagan holat"""
-        if obj.is_read:
+        if not obj.is_unread:
             return format_html(
                 '<span style="color: #198754;">✓ O\'qilgan</span>'
             )
@@ -48,11 +51,17 @@ class NotificationAdmin(admin.ModelAdmin):
     def mark_as_read(self, request, queryset):
         """Tanlangan bildirishnomalarni o'qilgan deb belgilash"""
         updated = queryset.update(is_read=True)
+        bump_notification_version(*queryset.values_list('user_id', flat=True))
         self.message_user(request, f'{updated} ta bildirishnoma o\'qilgan deb belgilandi.')
     mark_as_read.short_description = _('O\'qilgan deb belgilash')
     
     def mark_as_unread(self, request, queryset):
-        """Tanlangan bildirishnomalarni o'qilmagan deb belgilash"""
+        """
+        Tanlangan bildirishnomalarni o'qilmagan deb belgilash
+        
+        Foydalanuvchining notifications_read_until dan oldingilari o'qilgan bo'lib qoladi.
+        """
         updated = queryset.update(is_read=False)
+        bump_notification_version(*queryset.values_list('user_id', flat=True))
         self.message_user(request, f'{updated} ta bildirishnoma o\'qilmagan deb belgilandi.')
     mark_as_unread.short_description = _('O\'qilmagan deb belgilash')
\ No newline at end of file
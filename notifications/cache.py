@@ -0,0 +1,29 @@
+# notifications/cache.py - BILDIRISHNOMA VERSIYASI (FRAGMENT KESH KALITLARI UCHUN)
+
+from django.db.models import F
+
+from accounts.models import User
+
+
+def get_notification_version(user):
+    """
+    Foydalanuvchi bildirishnomalari versiyasi (har o'zgarishda o'zgaradi)
+
+    Bazada (User.notifications_version) saqlanadi - boshqa worker, cron yoki
+    management buyrug'i yozgan bildirishnoma ham barcha jarayonlarda darhol
+    ko'rinadi. request.user bilan birga o'qiladi, qo'shimcha so'rov yo'q.
+    updated_at ham qo'shiladi: user.save() eski versiyani qayta yozib qo'ysa
+    ham kalit takrorlanmaydi.
+    """
+    updated_at = user.updated_at.timestamp() if user.updated_at else 0
+    return f'{user.notifications_version}.{updated_at}'
+
+
+def bump_notification_version(*user_ids):
+    """Bildirishnoma yaratilgan / o'qilgan / o'chirilganda chaqiriladi (bitta UPDATE)"""
+    if not user_ids:
+        return
+    # update() - updated_at (navbar keshi) o'zgarmaydi
+    User.objects.filter(pk__in=set(user_ids)).update(
+        notifications_version=F('notifications_version') + 1
+    )
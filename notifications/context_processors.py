@@ -0,0 +1,44 @@
+# notifications/context_processors.py - BASE.HTML UCHUN BILDIRISHNOMALAR
+
+from functools import cache as memoize
+
+from .cache import get_notification_version
+
+
+# Navbar va bildirishnoma fragmentlari keshi (soniya)
+NAV_CACHE_TIMEOUT = 300
+RECENT_NOTIFICATIONS_LIMIT = 5
+
+
+def notifications(request):
+    """
+    base.html dagi navbar va bildirishnomalar dropdowni uchun
+
+    unread_notifications_count va recent_notifications funksiya sifatida
+    beriladi - shablon ularni faqat {% cache %} fragmenti eskirganda
+    chaqiradi, kesh ishlaganda bazaga so'rov yuborilmaydi.
+    """
+    user = getattr(request, 'user', None)
+    if user is None or not user.is_authenticated:
+        return {}
+
+    @memoize
+    def unread_notifications_count():
+        return user.notifications.unread_for(user).count()
+
+    @memoize
+    def recent_notifications():
+        return list(
+            user.notifications.unread_for(user)
+            .order_by('-created_at')[:RECENT_NOTIFICATIONS_LIMIT]
+        )
+
+    return {
+        'unread_notifications_count': unread_notifications_count,
+        'recent_notifications': recent_notifications,
+        'notification_version': get_notification_version(user),
+        # Profil / rol o'zgarsa updated_at yangilanadi - navbar qayta chiziladi
+        'nav_version': user.updated_at.timestamp() if user.updated_at else 0,
+        'nav_section': 'reports' if 'reports' in request.path else '',
+        'nav_cache_timeout': NAV_CACHE_TIMEOUT,
+    }
@@ -0,0 +1,77 @@
+# notifications/digest.py - YANGI MUROJAATLAR XULOSASI (ADMINLAR UCHUN)
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Count, Q
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+
+from accounts.models import User
+from systems.models import SystemResponsible
+from tickets.models import Ticket
+
+from .models import Notification
+
+
+DEFAULT_DIGEST_LOOKBACK_HOURS = 24
+
+
+def digest_scope(user):
+    """
+    Admin mas'ul bo'lgan murojaatlar sharti (create_ticket bildirishnomasi bilan bir xil)
+
+    Respublika admini (region bo'sh) - tizimning barcha viloyatlari.
+    """
+    scope = Q(pk__in=[])
+    for system_id, region_id in SystemResponsible.objects.filter(
+        user=user, role_in_system='admin',
+    ).values_list('system_id', 'region_id'):
+        if region_id is None:
+            scope |= Q(system_id=system_id)
+        else:
+            scope |= Q(system_id=system_id, region_id=region_id)
+    return scope
+
+
+def send_new_ticket_digests(now=None):
+    """
+    new_ticket_digest yoqilgan adminlarga bitta xulosa bildirishnomasi
+
+    Oxirgi xulosadan (digest_sent_at, birinchi marta - NOTIFICATION_DIGEST_LOOKBACK_HOURS)
+    beri yaratilgan murojaatlar tizimlar bo'yicha sanaladi. Har bir yangi
+    murojaat uchun qator o'rniga davrda bitta qator yoziladi; murojaat
+    bo'lmasa bildirishnoma yaratilmaydi.
+
+    Returns:
+        dict: {'admins', 'sent', 'tickets'}
+    """
+    now = now or timezone.now()
+    lookback = timedelta(hours=getattr(settings, 'NOTIFICATION_DIGEST_LOOKBACK_HOURS', DEFAULT_DIGEST_LOOKBACK_HOURS))
+    stats = {'admins': 0, 'sent': 0, 'tickets': 0}
+
+    admins = User.objects.filter(
+        new_ticket_digest=True, is_active=True, role__in=['admin', 'superadmin'],
+    ).only('id', 'digest_sent_at')
+    for admin in admins:
+        stats['admins'] += 1
+        since = admin.digest_sent_at or now - lookback
+        rows = list(
+            Ticket.objects.filter(digest_scope(admin), created_at__gt=since, created_at__lte=now)
+            .values('system__name').annotate(total=Count('id')).order_by('-total')
+        )
+        total = sum(row['total'] for row in rows)
+        if total:
+            Notification.objects.create(
+                user=admin,
+                notification_type='digest',
+                title=_('Yangi murojaatlar: {} ta').format(total),
+                text=', '.join(f"{row['system__name']}: {row['total']}" for row in rows),
+                url='/tickets/admin/',
+                count=total,
+            )
+            stats['sent'] += 1
+            stats['tickets'] += total
+        # update() - updated_at (navbar keshi) o'zgarmaydi
+        User.objects.filter(pk=admin.pk).update(digest_sent_at=now)
+    return stats
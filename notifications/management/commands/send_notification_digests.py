@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from notifications.digest import send_new_ticket_digests
+
+
+class Command(BaseCommand):
+    help = (
+        'Xulosa rejimidagi adminlarga oxirgi xulosadan beri kelgan yangi murojaatlar '
+        'haqida bitta bildirishnoma yuborish (davriy, masalan har soatda)'
+    )
+
+    def handle(self, *args, **options):
+        stats = send_new_ticket_digests()
+        if not stats['admins']:
+            self.stdout.write(self.style.WARNING('○ Xulosa rejimidagi admin yo\'q'))
+            return
+        self.stdout.write(self.style.SUCCESS(
+            f"✓ Xulosa yuborildi: {stats['sent']} / {stats['admins']} admin, {stats['tickets']} ta murojaat"
+        ))
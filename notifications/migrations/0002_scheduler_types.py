@@ -0,0 +1,18 @@
+# Generated by Django 5.0 on 2026-10-19 11:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='notification',
+            name='notification_type',
+            field=models.CharField(choices=[('new_ticket', 'Yangi murojaat'), ('status_changed', "Holat o'zgartirildi"), ('new_message', 'Yangi xabar'), ('rating_request', "Baholash so'rovi"), ('ticket_assigned', 'Murojaat biriktirildi'), ('ticket_escalated', 'Murojaat eskalatsiya qilindi'), ('reminder', 'Eslatma')], max_length=20, verbose_name='Turi'),
+        ),
+    ]
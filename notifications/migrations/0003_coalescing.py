@@ -0,0 +1,29 @@
+# Generated by Django 5.0 on 2026-10-19 11:47
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0002_scheduler_types'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='notification',
+            name='count',
+            field=models.PositiveIntegerField(default=1, verbose_name='Soni'),
+        ),
+        migrations.AlterField(
+            model_name='notification',
+            name='notification_type',
+            field=models.CharField(choices=[('new_ticket', 'Yangi murojaat'), ('status_changed', "Holat o'zgartirildi"), ('new_message', 'Yangi xabar'), ('rating_request', "Baholash so'rovi"), ('ticket_assigned', 'Murojaat biriktirildi'), ('ticket_escalated', 'Murojaat eskalatsiya qilindi'), ('reminder', 'Eslatma'), ('digest', 'Xulosa')], max_length=20, verbose_name='Turi'),
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(condition=models.Q(('is_read', False)), fields=['user', 'notification_type', 'url'], name='notification_coalesce_idx'),
+        ),
+    ]
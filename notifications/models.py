@@ -1,6 +1,60 @@
 from django.db import models
+from django.db.models import BooleanField, ExpressionWrapper, F, Q
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from accounts.models import User
+from .cache import bump_notification_version
+
+
+class NotificationQuerySet(models.QuerySet):
+    
+    def unread_for(self, user):
+        """
+        O'qilmaganlar: is_read=False va User.notifications_read_until dan keyin yaratilgan
+        
+        notification_unread_idx bo'yicha (user, created_at > watermark) diapazoni.
+        """
+        unread = self.filter(user=user, is_read=False)
+        if user.notifications_read_until is not None:
+            unread = unread.filter(created_at__gt=user.notifications_read_until)
+        return unread
+    
+    def read(self):
+        """O'qilganlar (barcha foydalanuvchilar): alohida belgilangan yoki watermark dan oldingi"""
+        return self.filter(Q(is_read=True) | Q(created_at__lte=F('user__notifications_read_until')))
+    
+    def with_read_state(self, user):
+        """values() uchun: read = is_read yoki watermark dan oldin yaratilgan"""
+        read = Q(is_read=True)
+        if user.notifications_read_until is not None:
+            read |= Q(created_at__lte=user.notifications_read_until)
+        return self.annotate(read=ExpressionWrapper(read, output_field=BooleanField()))
+
+
+class NotificationManager(models.Manager.from_queryset(NotificationQuerySet)):
+    
+    def coalesce(self, user, notification_type, title, text, url=''):
+        """
+        Bildirishnoma yaratish yoki o'qilmaganini yangilash (bitta suhbat - bitta qator)
+        
+        Shu foydalanuvchi uchun shu turdagi va shu havoladagi (murojaat) o'qilmagan
+        bildirishnoma bo'lsa - yangi qator qo'shilmaydi: count oshadi, sarlavha
+        va matn oxirgisiga almashadi, created_at yangilanadi (ro'yxat boshiga chiqadi).
+        """
+        updated = self.unread_for(user).filter(
+            notification_type=notification_type,
+            url=url,
+        ).update(
+            count=F('count') + 1,
+            title=title,
+            text=text,
+            created_at=timezone.now(),
+        )
+        if updated:
+            bump_notification_version(user.pk)
+            return updated
+        self.create(user=user, notification_type=notification_type, title=title, text=text, url=url)
+        return 1
 
 
 class Notification(models.Model):
@@ -12,6 +66,9 @@ class Notification(models.Model):
         ('new_message', _('Yangi xabar')),
         ('rating_request', _('Baholash so\'rovi')),
         ('ticket_assigned', _('Murojaat biriktirildi')),
+        ('ticket_escalated', _('Murojaat eskalatsiya qilindi')),
+        ('reminder', _('Eslatma')),
+        ('digest', _('Xulosa')),
     ]
     
     user = models.ForeignKey(
@@ -29,17 +86,59 @@ class Notification(models.Model):
     text = models.TextField(verbose_name=_("Matn"))
     url = models.CharField(max_length=500, blank=True, verbose_name=_("Havola"))
     is_read = models.BooleanField(default=False, verbose_name=_("O'qilgan"))
+    # Birlashtirilgan hodisalar soni (NotificationManager.coalesce)
+    count = models.PositiveIntegerField(default=1, verbose_name=_("Soni"))
     created_at = models.DateTimeField(auto_now_add=True, verbose_name=_("Yaratilgan"))
     
+    objects = NotificationManager()
+    
     class Meta:
         verbose_name = _("Bildirishnoma")
         verbose_name_plural = _("Bildirishnomalar")
         ordering = ['-created_at']
+        indexes = [
+            # coalesce(): o'qilmagan (foydalanuvchi, tur, murojaat) qatorini topish
+            models.Index(
+                fields=['user', 'notification_type', 'url'],
+                condition=models.Q(is_read=False),
+                name='notification_coalesce_idx',
+            ),
+            # O'qilmaganlar soni: created_at > notifications_read_until diapazoni
+            models.Index(
+                fields=['user', 'created_at'],
+                condition=models.Q(is_read=False),
+                name='notification_unread_idx',
+            ),
+        ]
     
     def __str__(self):
         return f"{self.user.get_full_name()} - {self.title}"
     
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        bump_notification_version(self.user_id)
+    
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        bump_notification_version(self.user_id)
+        return result
+    
+    @property
+    def is_unread(self):
+        """is_read va foydalanuvchi watermark i bo'yicha (user.notifications orqali olinganda so'rovsiz)"""
+        if self.is_read:
+            return False
+        watermark = self.user.notifications_read_until
+        return watermark is None or self.created_at > watermark
+    
     def mark_as_read(self):
-        """Bildirishnomani o'qilgan deb belgilash"""
+        """
+        Bildirishnomani o'qilgan deb belgilash (tartibsiz o'qish)
+        
+        Faqat is_read ustuni yoziladi; watermark dan oldingilar allaqachon o'qilgan.
+        """
+        if self.is_read:
+            return
         self.is_read = True
-        self.save()
\ No newline at end of file
+        Notification.objects.filter(pk=self.pk).update(is_read=True)
+        bump_notification_version(self.user_id)
\ No newline at end of file
@@ -1,3 +1,176 @@
+from unittest import mock
+
+from django.core.cache import cache
 from django.test import TestCase
+from django.urls import reverse
+
+from accounts.models import User
+from .cache import bump_notification_version, get_notification_version
+from .models import Notification
+
+
+class NotificationTestCase(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(username='usr', role='user', first_name='Ali', last_name='Valiyev')
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.user)
+
+    def notify(self, title='Yangi xabar', **kwargs):
+        return Notification.objects.create(
+            user=self.user, notification_type='new_message', title=title, text=title, **kwargs
+        )
+
+    def version(self):
+        return User.objects.get(pk=self.user.pk).notifications_version
+
+
+class NotificationVersionTest(NotificationTestCase):
+    """notifications.cache - versiya bazada, barcha jarayonlar uchun bir xil"""
+
+    def test_write_paths_bump_version(self):
+        notification = self.notify()
+        self.assertEqual(self.version(), 1)
+
+        notification.mark_as_read()
+        self.assertEqual(self.version(), 2)
+
+        bump_notification_version(self.user.pk, self.user.pk)
+        self.assertEqual(self.version(), 3)
+
+        self.client.get(reverse('notifications:mark_all_as_read'))
+        self.assertEqual(self.version(), 4)
+
+    def test_user_save_does_not_repeat_version(self):
+        stale = User.objects.get(pk=self.user.pk)
+        before = get_notification_version(stale)
+        self.notify()
+        # Eski nusxa saqlanadi - notifications_version 0 ga qaytadi, updated_at o'zgaradi
+        stale.save()
+        self.assertNotEqual(get_notification_version(User.objects.get(pk=self.user.pk)), before)
+
+    def test_cached_dropdown_sees_new_notification(self):
+        self.assertNotContains(self.client.get(reverse('notifications:list')), 'Birinchi')
+        self.notify('Birinchi')
+        self.assertContains(self.client.get(reverse('notifications:list')), 'notificationCount">1<')
+
+
+class NotificationConditionalGetTest(NotificationTestCase):
+    """Bildirishnoma endpointlarining ETag i bazadagi holatdan - eskirgan 304 yo'q"""
+
+    def assertRevalidates(self, url, change):
+        etag = self.client.get(url)['ETag']
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        change()
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_unread_count(self):
+        url = reverse('notifications:unread_count')
+        self.notify()
+        self.assertRevalidates(url, self.notify)
+        self.assertEqual(self.client.get(url).json(), {'count': 2})
+
+    def test_scheduler_bulk_notifications(self):
+        from tickets.scheduler import _notify
+
+        ticket = mock.Mock(id=1)
+        self.assertRevalidates(
+            reverse('notifications:recent'),
+            lambda: _notify([(self.user.pk, 'reminder', 'Eslatma', 'Eslatma', ticket)]),
+        )
+
+    def test_mark_all_as_read(self):
+        self.notify()
+        self.assertRevalidates(
+            reverse('notifications:list'),
+            lambda: self.client.get(reverse('notifications:mark_all_as_read')),
+        )
+
+    def test_relogin_changes_page_etag(self):
+        self.user.set_password('parol12345')
+        self.user.save()
+
+        def login():
+            self.client.logout()
+            self.client.post(reverse('accounts:login'), {'username': 'usr', 'password': 'parol12345'})
+            # Birinchi sahifa "Xush kelibsiz" flash xabarini ko'rsatadi
+            self.client.get(url)
+            return self.client.cookies['csrftoken'].value
+
+        url = reverse('notifications:list')
+        first_token = login()
+        etag = self.client.get(url)['ETag']
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        self.assertNotEqual(login(), first_token)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+
+class CoalesceTest(NotificationTestCase):
+    """NotificationManager.coalesce - o'qilmagan qator bilan birlashtirish"""
+
+    def coalesce(self, url='/tickets/1/', title='Yangi xabar'):
+        user = User.objects.get(pk=self.user.pk)
+        return Notification.objects.coalesce(user, 'new_message', title, title, url=url)
+
+    def test_merges_unread(self):
+        self.coalesce(title='Birinchi')
+        self.coalesce(title='Ikkinchi')
+        self.coalesce(url='/tickets/2/')
+
+        notification = Notification.objects.get(url='/tickets/1/')
+        self.assertEqual((notification.count, notification.title), (2, 'Ikkinchi'))
+        self.assertEqual(Notification.objects.count(), 2)
+
+    def test_read_notification_is_not_reused(self):
+        self.coalesce()
+        Notification.objects.get().mark_as_read()
+        self.coalesce()
+        self.assertEqual(list(Notification.objects.values_list('count', 'is_read')), [(1, False), (1, True)])
+
+    def test_watermark_starts_new_row(self):
+        self.coalesce()
+        self.client.get(reverse('notifications:mark_all_as_read'))
+        self.coalesce()
+        self.coalesce()
+
+        user = User.objects.get(pk=self.user.pk)
+        self.assertEqual(Notification.objects.count(), 2)
+        self.assertEqual(list(Notification.objects.unread_for(user).values_list('count', flat=True)), [2])
+
+
+class MarkAllAsReadTest(NotificationTestCase):
+    """mark_all_as_read - faqat User.notifications_read_until yoziladi"""
+
+    def test_watermark(self):
+        old = [self.notify() for _ in range(3)]
+        response = self.client.get(reverse('notifications:mark_all_as_read'))
+        self.assertRedirects(response, reverse('notifications:list'))
+
+        user = User.objects.get(pk=self.user.pk)
+        self.assertIsNotNone(user.notifications_read_until)
+        # Bildirishnoma qatorlari yozilmaydi
+        self.assertFalse(Notification.objects.filter(is_read=True).exists())
+        self.assertFalse(Notification.objects.unread_for(user).exists())
+        self.assertEqual(Notification.objects.read().count(), 3)
+        self.assertFalse(Notification.objects.select_related('user').get(pk=old[0].pk).is_unread)
+
+        new = self.notify()
+        self.assertEqual(list(Notification.objects.unread_for(user)), [new])
+        self.assertTrue(Notification.objects.select_related('user').get(pk=new.pk).is_unread)
+        self.assertEqual(self.client.get(reverse('notifications:unread_count')).json(), {'count': 1})
+
+    def test_repeated_call_moves_watermark(self):
+        self.client.get(reverse('notifications:mark_all_as_read'))
+        first = User.objects.get(pk=self.user.pk).notifications_read_until
+        self.notify()
+        self.client.get(reverse('notifications:mark_all_as_read'))
 
-# Create your tests here.
+        user = User.objects.get(pk=self.user.pk)
+        self.assertGreater(user.notifications_read_until, first)
+        self.assertFalse(Notification.objects.unread_for(user).exists())
@@ -1,11 +1,17 @@
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
+from django.db.models import F
 from django.http import JsonResponse
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
+from accounts.models import User
+from accounts.decorators import alogin_required
+from tickets.conditional import conditional_view, notifications_page_state, notifications_state
 from .models import Notification
 
 
 @login_required
+@conditional_view(notifications_page_state)
 def notifications_list(request):
     """Bildirishnomalar ro'yxati"""
     notifications = request.user.notifications.all().order_by('-created_at')[:50]
@@ -32,33 +38,38 @@ def mark_as_read(request, pk):
 
 @login_required
 def mark_all_as_read(request):
-    """Barcha bildirishnomalarni o'qilgan deb belgilash"""
-    request.user.notifications.filter(is_read=False).update(is_read=True)
+    """Barcha bildirishnomalarni o'qilgan deb belgilash (watermark - bitta qator yoziladi)"""
+    # update() - updated_at (navbar keshi) o'zgarmaydi; versiya shu UPDATE da oshadi
+    User.objects.filter(pk=request.user.pk).update(
+        notifications_read_until=timezone.now(),
+        notifications_version=F('notifications_version') + 1,
+    )
     return redirect('notifications:list')
 
 
-@login_required
-def get_unread_count(request):
-    """O'qilmagan bildirishnomalar sonini olish (AJAX)"""
-    count = request.user.notifications.filter(is_read=False).count()
+@alogin_required
+@conditional_view(notifications_state)
+async def get_unread_count(request):
+    """O'qilmagan bildirishnomalar sonini olish (AJAX, async)"""
+    count = await Notification.objects.unread_for(request.user).acount()
     return JsonResponse({'count': count})
 
 
-@login_required
-def get_recent_notifications(request):
-    """Oxirgi bildirishnomalarni olish (AJAX)"""
-    notifications = request.user.notifications.filter(
-        is_read=False
-    ).order_by('-created_at')[:5]
+@alogin_required
+@conditional_view(notifications_state)
+async def get_recent_notifications(request):
+    """Oxirgi bildirishnomalarni olish (AJAX, async)"""
+    notifications = Notification.objects.unread_for(request.user).order_by('-created_at')[:5]
     
     data = []
-    for notif in notifications:
+    async for notif in notifications:
         data.append({
             'id': notif.id,
             'title': notif.title,
             'text': notif.text,
             'url': notif.url,
+            'count': notif.count,
             'created_at': notif.created_at.strftime('%d.%m.%Y %H:%M'),
         })
     
-    return JsonResponse({'notifications': data})
\ No newline at end of file
+    return JsonResponse({'notifications': data})
@@ -0,0 +1,71 @@
+# reports/aggregates.py - PERSENTIL AGREGATI (MEDIANA, P90) BAZADA
+
+import math
+
+from django.db import NotSupportedError
+from django.db.models import Aggregate, DurationField, FloatField
+
+
+class _SQLitePercentile:
+    """SQLite uchun PERCENTILE_CONT(qiymat, ulush) - PostgreSQL bilan bir xil interpolatsiya"""
+
+    def __init__(self):
+        self.values = []
+        self.fraction = 0.5
+
+    def step(self, value, fraction):
+        self.fraction = fraction
+        if value is not None:
+            self.values.append(value)
+
+    def finalize(self):
+        if not self.values:
+            return None
+        ordered = sorted(self.values)
+        rank = (len(ordered) - 1) * self.fraction
+        low, high = math.floor(rank), math.ceil(rank)
+        return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+class Percentile(Aggregate):
+    """
+    Uzluksiz persentil (chiziqli interpolatsiya), guruh bo'yicha bazada hisoblanadi
+
+        tickets.values('system__name').annotate(
+            median=Percentile('resolution_seconds', 0.5),
+            p90=Percentile(F('first_response_at') - F('created_at'), 0.9),
+        )
+
+    PostgreSQL: percentile_cont(...) WITHIN GROUP (ORDER BY ...).
+    SQLite: xuddi shu nomli agregat ulanishga ro'yxatdan o'tkaziladi (Python,
+    lekin SQL ichida - qatorlar Django ga yuklanmaydi). NULL lar hisobga olinmaydi.
+    Natija: davomiylik (timedelta) yoki son (float).
+    """
+
+    function = 'PERCENTILE_CONT'
+    name = 'Percentile'
+
+    def __init__(self, expression, fraction, **extra):
+        if not 0 <= fraction <= 1:
+            raise ValueError('fraction 0 va 1 oralig\'ida bo\'lishi kerak')
+        self.fraction = float(fraction)
+        super().__init__(expression, **extra)
+
+    def _resolve_output_field(self):
+        source = self.get_source_expressions()[0].output_field
+        return DurationField() if isinstance(source, DurationField) else FloatField()
+
+    def as_sql(self, compiler, connection, **extra_context):
+        raise NotSupportedError(f'Percentile {connection.vendor} uchun qo\'llab-quvvatlanmaydi')
+
+    def as_postgresql(self, compiler, connection, **extra_context):
+        extra_context['template'] = (
+            f'%(function)s({self.fraction!r}) WITHIN GROUP (ORDER BY %(expressions)s)'
+        )
+        return super().as_sql(compiler, connection, **extra_context)
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        connection.ensure_connection()
+        connection.connection.create_aggregate(self.function, 2, _SQLitePercentile)
+        extra_context['template'] = f'%(function)s(%(expressions)s, {self.fraction!r})'
+        return super().as_sql(compiler, connection, **extra_context)
@@ -92,6 +92,13 @@ class ReportFilterForm(forms.Form):
         label=_('Baholash')
     )
     
+    # Arxiv
+    archived = forms.BooleanField(
+        required=False,
+        label=_('Arxivdan'),
+        widget=forms.CheckboxInput(attrs={'class': 'form-checkbox'})
+    )
+    
     # Hisobot turi
     report_type = forms.ChoiceField(
         required=False,
@@ -101,6 +108,9 @@ class ReportFilterForm(forms.Form):
             ('technician_performance', _('Texniklar samaradorligi')),
             ('system_analysis', _('Tizimlar tahlili')),
             ('regional_analysis', _('Viloyatlar tahlili')),
+            ('sla_system', _('SLA: tizimlar bo\'yicha')),
+            ('sla_region', _('SLA: viloyatlar bo\'yicha')),
+            ('sla_technician', _('SLA: texniklar bo\'yicha')),
         ],
         initial='tickets',
         widget=forms.Select(attrs={'class': 'form-select'}),
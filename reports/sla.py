@@ -0,0 +1,99 @@
+# reports/sla.py - SLA HISOBOTLARI (BIRINCHI JAVOB VA HAL QILISH VAQTI)
+
+from django.db.models import Count, F
+from django.utils.translation import gettext_lazy as _
+
+from .aggregates import Percentile
+
+
+# Hisobot turi -> (guruhlash ustunlari, guruh sarlavhasi, hisobot nomi)
+SLA_REPORT_TYPES = {
+    'sla_system': (('system__name',), _('Tizim'), _('SLA: tizimlar bo\'yicha')),
+    'sla_region': (('region__name',), _('Viloyat'), _('SLA: viloyatlar bo\'yicha')),
+    'sla_technician': (
+        ('assigned_to__id', 'assigned_to__first_name', 'assigned_to__last_name'),
+        _('Texnik'),
+        _('SLA: texniklar bo\'yicha'),
+    ),
+}
+
+
+def _hours(value):
+    if value is None:
+        return None
+    seconds = value.total_seconds() if hasattr(value, 'total_seconds') else value
+    return round(seconds / 3600, 2)
+
+
+def _group_name(row, report_type):
+    if report_type == 'sla_technician':
+        return f"{row['assigned_to__first_name']} {row['assigned_to__last_name']}".strip()
+    return row[SLA_REPORT_TYPES[report_type][0][0]] or '-'
+
+
+def get_sla_analysis(tickets, report_type):
+    """
+    Birinchi javob va hal qilish vaqtining mediana / p90 qiymatlari (soatda)
+
+    Denormalizatsiya qilingan first_response_at va resolution_seconds
+    ustunlaridan, guruh bo'yicha bazada hisoblanadi (reports.aggregates.Percentile) -
+    tarix va xabarlar jadvallari o'qilmaydi.
+
+    Birinchi javob - egasidan boshqa har qanday xodimning (texnik yoki admin)
+    birinchi xabari (TicketMessage._record_first_response).
+    """
+    group_fields = SLA_REPORT_TYPES[report_type][0]
+    if report_type == 'sla_technician':
+        tickets = tickets.filter(assigned_to__isnull=False)
+
+    response_time = F('first_response_at') - F('created_at')
+    rows = tickets.values(*group_fields).annotate(
+        total=Count('id'),
+        responded=Count('first_response_at'),
+        resolved=Count('resolution_seconds'),
+        response_median=Percentile(response_time, 0.5),
+        response_p90=Percentile(response_time, 0.9),
+        resolution_median=Percentile('resolution_seconds', 0.5),
+        resolution_p90=Percentile('resolution_seconds', 0.9),
+    ).order_by('-total')
+
+    return [
+        {
+            'name': _group_name(row, report_type),
+            'total': row['total'],
+            'responded': row['responded'],
+            'resolved': row['resolved'],
+            'response_median_hours': _hours(row['response_median']),
+            'response_p90_hours': _hours(row['response_p90']),
+            'resolution_median_hours': _hours(row['resolution_median']),
+            'resolution_p90_hours': _hours(row['resolution_p90']),
+        }
+        for row in rows
+    ]
+
+
+def sla_headers(report_type):
+    """Jadval sarlavhalari (web, Excel, PDF uchun bir xil)"""
+    return [
+        SLA_REPORT_TYPES[report_type][1],
+        _('Jami'),
+        _('Javob berilgan'),
+        _('Hal qilingan'),
+        _('Javob: mediana (soat)'),
+        _('Javob: p90 (soat)'),
+        _('Hal qilish: mediana (soat)'),
+        _('Hal qilish: p90 (soat)'),
+    ]
+
+
+def sla_row_values(row):
+    return [
+        row['name'],
+        row['total'],
+        row['responded'],
+        row['resolved'],
+        row['response_median_hours'],
+        row['response_p90_hours'],
+        row['resolution_median_hours'],
+        row['resolution_p90_hours'],
+    ]
@@ -1,3 +1,63 @@
+from datetime import timedelta
+
+from django.db.models import F
 from django.test import TestCase
 
-# Create your tests here.
+from accounts.models import Region, User
+from systems.models import System
+from tickets.models import Ticket
+from .aggregates import Percentile
+from .sla import get_sla_analysis
+
+
+class PercentileTest(TestCase):
+    """
+    reports.aggregates.Percentile - PostgreSQL percentile_cont bilan bir xil
+
+    Kutilgan qiymatlar percentile_cont(...) WITHIN GROUP natijalari -
+    test SQLite da ham, PostgreSQL da ham bir xil o'tishi kerak.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        region = Region.objects.create(name='Toshkent', code='TSH')
+        user = User.objects.create(username='usr', role='user', region=region)
+        cls.first = System.objects.create(name='Qalqon')
+        cls.second = System.objects.create(name='Pasport')
+
+        # (tizim, hal qilish soniyalari, birinchi javob soatlari)
+        for system, seconds, hours in (
+            (cls.first, 100, 1), (cls.first, 200, 2), (cls.first, 300, 3), (cls.first, 400, 4),
+            (cls.first, None, None), (cls.second, 50, 0.5),
+        ):
+            ticket = Ticket.objects.create(user=user, system=system, region=region, description='Test')
+            response = ticket.created_at + timedelta(hours=hours) if hours is not None else None
+            Ticket.objects.filter(pk=ticket.pk).update(resolution_seconds=seconds, first_response_at=response)
+
+    def aggregate(self, expression, fraction):
+        rows = Ticket.objects.values('system').annotate(value=Percentile(expression, fraction))
+        return {row['system']: row['value'] for row in rows}
+
+    def test_interpolation(self):
+        self.assertEqual(self.aggregate('resolution_seconds', 0.5), {self.first.pk: 250, self.second.pk: 50})
+        self.assertAlmostEqual(self.aggregate('resolution_seconds', 0.9)[self.first.pk], 370)
+        self.assertEqual(self.aggregate('resolution_seconds', 0)[self.first.pk], 100)
+        self.assertEqual(self.aggregate('resolution_seconds', 1)[self.first.pk], 400)
+
+    def test_duration(self):
+        values = self.aggregate(F('first_response_at') - F('created_at'), 0.9)
+        self.assertIsInstance(values[self.first.pk], timedelta)
+        self.assertAlmostEqual(values[self.first.pk].total_seconds(), 3.7 * 3600, places=3)
+
+    def test_invalid_fraction(self):
+        with self.assertRaises(ValueError):
+            Percentile('resolution_seconds', 1.5)
+
+    def test_sla_analysis(self):
+        rows = {row['name']: row for row in get_sla_analysis(Ticket.objects.all(), 'sla_system')}
+        self.assertEqual(
+            (rows['Qalqon']['total'], rows['Qalqon']['responded'], rows['Qalqon']['resolved']), (5, 4, 4),
+        )
+        self.assertEqual(rows['Qalqon']['response_median_hours'], 2.5)
+        self.assertEqual(rows['Qalqon']['resolution_p90_hours'], 0.1)
+        self.assertEqual(rows['Pasport']['response_p90_hours'], 0.5)
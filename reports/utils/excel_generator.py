@@ -7,6 +7,8 @@ from django.http import HttpResponse
 from django.utils import timezone
 from django.utils.translation import gettext as _
 
+from reports.sla import SLA_REPORT_TYPES, sla_headers, sla_row_values
+
 
 def generate_excel_report(tickets, filters, report_type, stats_data=None):
     """Excel hisobot yaratish"""
@@ -34,6 +36,9 @@ def generate_excel_report(tickets, filters, report_type, stats_data=None):
     elif report_type == 'regional_analysis':
         create_regional_analysis_sheet(wb, stats_data, filters)
     
+    elif report_type in SLA_REPORT_TYPES:
+        create_sla_sheet(wb, stats_data, report_type)
+    
     # Response
     response = HttpResponse(
         content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
@@ -373,6 +378,52 @@ def create_regional_analysis_sheet(wb, analysis_data, filters):
         ws.column_dimensions[get_column_letter(i)].width = 18
 
 
+def create_sla_sheet(wb, sla_data, report_type):
+    """SLA sheet: birinchi javob va hal qilish vaqti (mediana / p90, soat)"""
+    
+    title = str(SLA_REPORT_TYPES[report_type][2])
+    ws = wb.create_sheet(title.replace(':', '')[:31])  # Excel varaq nomida ':' taqiqlangan
+    
+    # Title
+    ws.append([title.upper()])
+    ws.merge_cells('A1:H1')
+    ws['A1'].font = Font(size=16, bold=True, color='1e40af')
+    ws['A1'].alignment = Alignment(horizontal='center', vertical='center')
+    ws.row_dimensions[1].height = 30
+    
+    ws.append([])
+    
+    # Headers
+    headers = [str(header) for header in sla_headers(report_type)]
+    header_row = ws.max_row + 1
+    ws.append(headers)
+    
+    for col_num in range(1, len(headers) + 1):
+        cell = ws.cell(row=header_row, column=col_num)
+        cell.fill = PatternFill(start_color='1e40af', end_color='1e40af', fill_type='solid')
+        cell.font = Font(color='FFFFFF', bold=True)
+        cell.alignment = Alignment(horizontal='center', vertical='center', wrap_text=True)
+        cell.border = get_border()
+    
+    # Data
+    for row in sla_data:
+        ws.append([value if value is not None else '-' for value in sla_row_values(row)])
+        
+        row_num = ws.max_row
+        for col_num in range(1, len(headers) + 1):
+            cell = ws.cell(row=row_num, column=col_num)
+            cell.border = get_border()
+            cell.alignment = Alignment(horizontal='center', vertical='center')
+            
+            if row_num % 2 == 0:
+                cell.fill = PatternFill(start_color='f8fafc', end_color='f8fafc', fill_type='solid')
+    
+    # Column widths
+    ws.column_dimensions['A'].width = 30
+    for i in range(2, len(headers) + 1):
+        ws.column_dimensions[get_column_letter(i)].width = 18
+
+
 # ============================================
 # HELPER FUNCTIONS
 # ============================================
@@ -14,6 +14,8 @@ from django.utils import timezone
 from django.utils.translation import gettext as _
 import io
 
+from reports.sla import SLA_REPORT_TYPES, sla_headers, sla_row_values
+
 
 def generate_pdf_report(tickets, filters, report_type, stats_data=None):
     """PDF hisobot yaratish"""
@@ -22,7 +24,7 @@ def generate_pdf_report(tickets, filters, report_type, stats_data=None):
     buffer = io.BytesIO()
     
     # PDF document
-    if report_type == 'tickets':
+    if report_type == 'tickets' or report_type in SLA_REPORT_TYPES:
         # Landscape for table
         doc = SimpleDocTemplate(
             buffer,
@@ -108,6 +110,9 @@ def generate_pdf_report(tickets, filters, report_type, stats_data=None):
     elif report_type == 'regional_analysis':
         add_regional_analysis(story, stats_data, styles, heading_style)
     
+    elif report_type in SLA_REPORT_TYPES:
+        add_sla_analysis(story, stats_data, report_type, heading_style)
+    
     # Footer
     story.append(Spacer(1, 30))
     footer_text = f"{_('IIV Support System')} • {_('Hisobot yaratildi')}: {timezone.now().strftime('%d.%m.%Y %H:%M')}"
@@ -314,6 +319,21 @@ def add_regional_analysis(story, analysis_data, styles, heading_style):
     story.append(table)
 
 
+def add_sla_analysis(story, sla_data, report_type, heading_style):
+    """SLA: birinchi javob va hal qilish vaqti (mediana / p90, soat)"""
+    
+    story.append(Paragraph(str(SLA_REPORT_TYPES[report_type][2]), heading_style))
+    story.append(Spacer(1, 12))
+    
+    data = [[str(header) for header in sla_headers(report_type)]]
+    for row in sla_data:
+        data.append(['-' if value is None else str(value) for value in sla_row_values(row)])
+    
+    table = Table(data)
+    table.setStyle(get_simple_table_style())
+    story.append(table)
+
+
 def get_simple_table_style():
     """Oddiy jadval style"""
     return TableStyle([
@@ -8,11 +8,17 @@ from django.db.models import Q, Count, Avg, Sum, F
 from django.utils import timezone
 from django.http import HttpResponse
 from datetime import datetime, timedelta
+import time
 
 from tickets.models import Ticket, TicketHistory
+from tickets.archive import ticket_source
 from accounts.models import User, Region
 from systems.models import System
+from tickets.query_budget import query_budget
+from tickets.db_router import replica_reads
+from tickets import metrics
 from .forms import ReportFilterForm
+from .sla import SLA_REPORT_TYPES, get_sla_analysis, sla_headers
 from .utils.pdf_generator import generate_pdf_report
 from .utils.excel_generator import generate_excel_report
 from .utils.csv_generator import generate_csv_report
@@ -28,8 +34,10 @@ def require_admin(view_func):
     return wrapper
 
 
+@query_budget(25)
 @login_required
 @require_admin
+@replica_reads
 def reports_dashboard(request):
     """Hisobotlar asosiy sahifasi"""
     
@@ -57,8 +65,10 @@ def reports_dashboard(request):
     return render(request, 'reports/dashboard.html', context)
 
 
+@query_budget(20)
 @login_required
 @require_admin
+@replica_reads
 def generate_report(request):
     """Hisobot yaratish va export qilish"""
     
@@ -74,8 +84,8 @@ def generate_report(request):
     # Filter parametrlari
     filters = get_filters_from_form(form)
     
-    # Ticketlarni olish
-    tickets = Ticket.objects.all()
+    # Ticketlarni olish (so'ralganda - arxivdan)
+    tickets = ticket_source(archived=filters['archived'])
     
     # ✅ YANGI: Admin ruxsatlariga qarab filtrlash
     from accounts.utils import filter_tickets_for_admin
@@ -109,31 +119,27 @@ def generate_report(request):
         else:
             tickets = tickets.filter(rating=int(filters['rating']))
     
+    # Ro'yxat va eksportlar har bir qatorda shu bog'lanishlarni o'qiydi (N+1 bo'lmasligi uchun)
+    tickets = tickets.select_related('user', 'system', 'region', 'assigned_to')
+    
     # Export format
     export_format = form.cleaned_data.get('export_format')
     report_type = form.cleaned_data.get('report_type', 'tickets')
     
+    started = time.perf_counter()
+    
     # Statistika hisobotlar uchun
-    if report_type == 'statistics':
-        stats_data = get_statistics_data(tickets, filters)
-    elif report_type == 'technician_performance':
-        stats_data = get_technician_performance(tickets, filters)
-    elif report_type == 'system_analysis':
-        stats_data = get_system_analysis(tickets, filters)
-    elif report_type == 'regional_analysis':
-        stats_data = get_regional_analysis(tickets, filters)
-    else:
-        stats_data = None
+    stats_data = get_report_stats(report_type, tickets, filters)
     
     # Export
     if export_format == 'pdf':
-        return generate_pdf_report(tickets, filters, report_type, stats_data)
+        response = generate_pdf_report(tickets, filters, report_type, stats_data)
     
     elif export_format == 'excel':
-        return generate_excel_report(tickets, filters, report_type, stats_data)
+        response = generate_excel_report(tickets, filters, report_type, stats_data)
     
     elif export_format == 'csv':
-        return generate_csv_report(tickets, filters)
+        response = generate_csv_report(tickets, filters)
     
     # Web ko'rinish
     else:
@@ -147,9 +153,19 @@ def generate_report(request):
         }
         
         if report_type == 'tickets':
-            return render(request, 'reports/tickets_report.html', context)
+            response = render(request, 'reports/tickets_report.html', context)
+        elif report_type in SLA_REPORT_TYPES:
+            context['sla_headers'] = sla_headers(report_type)
+            context['report_title'] = SLA_REPORT_TYPES[report_type][2]
+            response = render(request, 'reports/sla_report.html', context)
         else:
-            return render(request, 'reports/stats_report.html', context)
+            response = render(request, 'reports/stats_report.html', context)
+    
+    metrics.observe(
+        'report_generation_seconds', time.perf_counter() - started,
+        report_type=report_type or 'tickets', format=export_format or 'web',
+    )
+    return response
 
 
 # ============================================
@@ -167,9 +183,25 @@ def get_filters_from_form(form):
         'priority': form.cleaned_data.get('priority'),
         'assigned_to': form.cleaned_data.get('assigned_to'),
         'rating': form.cleaned_data.get('rating'),
+        'archived': form.cleaned_data.get('archived', False),
     }
 
 
+def get_report_stats(report_type, tickets, filters):
+    """Hisobot turi bo'yicha statistika (murojaatlar ro'yxati uchun None)"""
+    if report_type == 'statistics':
+        return get_statistics_data(tickets, filters)
+    elif report_type == 'technician_performance':
+        return get_technician_performance(tickets, filters)
+    elif report_type == 'system_analysis':
+        return get_system_analysis(tickets, filters)
+    elif report_type == 'regional_analysis':
+        return get_regional_analysis(tickets, filters)
+    elif report_type in SLA_REPORT_TYPES:
+        return get_sla_analysis(tickets, report_type)
+    return None
+
+
 # reports/views.py - get_quick_stats TO'G'RILASH
 
 def get_quick_stats(date_from, date_to, user):
@@ -12,15 +12,15 @@ class SystemResponsibleInline(admin.TabularInline):
 
 @admin.register(System)
 class SystemAdmin(admin.ModelAdmin):
-    list_display = ['name', 'is_active', 'created_at']
-    list_filter = ['is_active', 'created_at']
+    list_display = ['name', 'assignment_mode', 'is_active', 'created_at']
+    list_filter = ['is_active', 'assignment_mode', 'created_at']
     search_fields = ['name', 'description']
     ordering = ['name']
     inlines = [SystemResponsibleInline]
     
     fieldsets = (
         (None, {
-            'fields': ('name', 'description', 'is_active')
+            'fields': ('name', 'description', 'is_active', 'assignment_mode')
         }),
     )
 
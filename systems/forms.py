@@ -9,7 +9,7 @@ class SystemForm(forms.ModelForm):
     
     class Meta:
         model = System
-        fields = ['name', 'description', 'is_active']
+        fields = ['name', 'description', 'assignment_mode', 'is_active']
         widgets = {
             'name': forms.TextInput(attrs={
                 'class': 'form-input',
@@ -20,6 +20,9 @@ class SystemForm(forms.ModelForm):
                 'rows': 3,
                 'placeholder': _('Tizim haqida qisqacha...'),
             }),
+            'assignment_mode': forms.Select(attrs={
+                'class': 'form-select',
+            }),
             'is_active': forms.CheckboxInput(attrs={
                 'class': 'form-checkbox',
             }),
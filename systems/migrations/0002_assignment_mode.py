@@ -0,0 +1,18 @@
+# Generated by Django 5.0 on 2026-10-19 11:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('systems', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='system',
+            name='assignment_mode',
+            field=models.CharField(choices=[('self', "Texniklar o'zlari oladi"), ('auto', 'Avtomatik (eng kam yuklangan texnik)'), ('hybrid', "Aralash (bo'sh texnik bo'lsa avtomatik)")], default='self', help_text='Yangi murojaatlar texniklarga qanday taqsimlanadi', max_length=10, verbose_name='Biriktirish rejimi'),
+        ),
+    ]
@@ -5,9 +5,23 @@ from accounts.models import User, Region
 
 class System(models.Model):
     """Tizimlar (Qalqon, 112, E-Material, va boshqalar)"""
+    
+    ASSIGNMENT_MODE_CHOICES = [
+        ('self', _("Texniklar o'zlari oladi")),
+        ('auto', _('Avtomatik (eng kam yuklangan texnik)')),
+        ('hybrid', _("Aralash (bo'sh texnik bo'lsa avtomatik)")),
+    ]
+    
     name = models.CharField(max_length=200, unique=True, verbose_name=_("Tizim nomi"))
     description = models.TextField(blank=True, verbose_name=_("Ta'rif"))
     is_active = models.BooleanField(default=True, verbose_name=_("Faol"))
+    assignment_mode = models.CharField(
+        max_length=10,
+        choices=ASSIGNMENT_MODE_CHOICES,
+        default='self',
+        verbose_name=_("Biriktirish rejimi"),
+        help_text=_("Yangi murojaatlar texniklarga qanday taqsimlanadi")
+    )
     created_at = models.DateTimeField(auto_now_add=True, verbose_name=_("Yaratilgan"))
     
     class Meta:
@@ -9,6 +9,9 @@ from django import forms
 from .models import System, SystemResponsible
 from .forms import SystemForm, SystemResponsibleForm
 from accounts.models import User, Region
+from tickets.models import Ticket
+from tickets.query_budget import query_budget
+from accounts.decorators import alogin_required, arole_required
 
 
 # ============================================
@@ -29,6 +32,7 @@ def require_admin(view_func):
 # SYSTEMS MANAGEMENT
 # ============================================
 
+@query_budget(15)
 @login_required
 @require_admin
 def systems_list(request):
@@ -50,15 +54,26 @@ def systems_list(request):
     elif status == 'inactive':
         systems = systems.filter(is_active=False)
     
-    # Har bir tizim uchun statistika
+    # Har bir tizim uchun statistika - barcha tizimlar uchun 2 ta GROUP BY so'rov
+    systems = list(systems)
+    system_ids = [system.id for system in systems]
+    tickets_counts = dict(
+        Ticket.objects.filter(system_id__in=system_ids)
+        .values('system_id').annotate(count=Count('id'))
+        .values_list('system_id', 'count')
+    )
+    responsibles_counts = dict(
+        SystemResponsible.objects.filter(system_id__in=system_ids)
+        .values('system_id').annotate(count=Count('id'))
+        .values_list('system_id', 'count')
+    )
+    
     systems_data = []
     for system in systems:
-        tickets_count = system.tickets.count()
-        responsibles_count = system.responsibles.count()
         systems_data.append({
             'system': system,
-            'tickets_count': tickets_count,
-            'responsibles_count': responsibles_count,
+            'tickets_count': tickets_counts.get(system.id, 0),
+            'responsibles_count': responsibles_counts.get(system.id, 0),
         })
     
     context = {
@@ -164,6 +179,7 @@ def system_toggle_status(request, pk):
 # SYSTEM RESPONSIBLES MANAGEMENT
 # ============================================
 
+@query_budget(15)
 @login_required
 @require_admin
 def system_responsibles(request, system_id):
@@ -320,25 +336,26 @@ def system_quick_toggle(request, pk):
     })
 
 
-@login_required
-@require_admin
-def systems_search_ajax(request):
-    """AJAX - tizimlarni qidirish"""
+@alogin_required
+@arole_required(lambda user: user.is_admin(), _('Sizda bu sahifaga kirish huquqi yo\'q.'))
+async def systems_search_ajax(request):
+    """AJAX - tizimlarni qidirish (async)"""
     search = request.GET.get('q', '')
     
+    # Murojaatlar soni bitta so'rovda (har tizim uchun alohida COUNT emas)
     systems = System.objects.filter(
         Q(name__icontains=search) | 
         Q(description__icontains=search)
-    )[:20]
+    ).annotate(tickets_count=Count('tickets'))[:20]
     
     results = []
-    for system in systems:
+    async for system in systems:
         results.append({
             'id': system.id,
             'name': system.name,
             'description': system.description,
             'is_active': system.is_active,
-            'tickets_count': system.tickets.count(),
+            'tickets_count': system.tickets_count,
         })
     
     return JsonResponse({
@@ -1,7 +1,7 @@
 from django.contrib import admin
 from django.utils.translation import gettext_lazy as _
 from django.utils.html import format_html
-from .models import Ticket, TicketMessage, TicketHistory
+from .models import Ticket, TicketMessage, TicketHistory, ArchivedTicket, StoredBlob, AttachmentPreview
 
 
 class TicketMessageInline(admin.TabularInline):
@@ -151,4 +151,38 @@ class TicketHistoryAdmin(admin.ModelAdmin):
         (_('Vaqt'), {
             'fields': ('timestamp',)
         }),
-    )
\ No newline at end of file
+    )
+
+@admin.register(ArchivedTicket)
+class ArchivedTicketAdmin(admin.ModelAdmin):
+    list_display = ['get_ticket_number', 'user', 'system', 'region', 'status', 'assigned_to', 'created_at', 'archived_at']
+    list_filter = ['status', 'system', 'region']
+    search_fields = ['id', 'description']
+    raw_id_fields = ['user', 'system', 'region', 'assigned_to']
+    ordering = ['-created_at']
+    
+    def has_add_permission(self, request):
+        return False
+    
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(StoredBlob)
+class StoredBlobAdmin(admin.ModelAdmin):
+    list_display = ['name', 'size', 'ref_count', 'created_at', 'last_referenced_at']
+    search_fields = ['name', 'sha256']
+    readonly_fields = ['name', 'sha256', 'size', 'ref_count', 'created_at', 'last_referenced_at']
+    ordering = ['-created_at']
+    
+    def has_add_permission(self, request):
+        return False
+
+
+@admin.register(AttachmentPreview)
+class AttachmentPreviewAdmin(admin.ModelAdmin):
+    list_display = ['source', 'status', 'width', 'height', 'attempts', 'updated_at']
+    list_filter = ['status']
+    search_fields = ['source']
+    readonly_fields = ['source', 'preview', 'width', 'height', 'attempts', 'created_at', 'updated_at']
+    ordering = ['-id']
@@ -0,0 +1,167 @@
+# tickets/archive.py - HOT/COLD ARXIVLASH
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.http import Http404
+from django.utils import timezone
+
+from notifications.models import Notification
+from .models import (
+    Ticket,
+    TicketMessage,
+    TicketHistory,
+    ArchivedTicket,
+    ArchivedTicketMessage,
+    ArchivedTicketHistory,
+)
+
+
+ARCHIVABLE_STATUSES = ('resolved', 'rejected')
+
+DEFAULT_ARCHIVE_AFTER_DAYS = 180
+DEFAULT_NOTIFICATION_PURGE_DAYS = 90
+DEFAULT_BATCH_SIZE = 500
+
+
+def get_archive_after_days():
+    return getattr(settings, 'TICKET_ARCHIVE_AFTER_DAYS', DEFAULT_ARCHIVE_AFTER_DAYS)
+
+
+def get_notification_purge_days():
+    return getattr(settings, 'NOTIFICATION_PURGE_AFTER_DAYS', DEFAULT_NOTIFICATION_PURGE_DAYS)
+
+
+def _copy_to(model, instance):
+    """
+    Hot yozuvni arxiv modeliga ko'chirish (bir xil nomli ustunlar)
+
+    Arxiv modelida yo'q ustunlar e'tiborsiz qoldiriladi.
+    """
+    values = {}
+    for field in model._meta.concrete_fields:
+        if hasattr(instance, field.attname):
+            values[field.attname] = getattr(instance, field.attname)
+    return model(**values)
+
+
+def archivable_tickets(older_than_days):
+    """Arxivlanadigan murojaatlar: hal qilingan/rad etilgan va eski"""
+    cutoff = timezone.now() - timedelta(days=older_than_days)
+    return Ticket.objects.filter(
+        status__in=ARCHIVABLE_STATUSES,
+        updated_at__lt=cutoff,
+    )
+
+
+def _archive_batch(ticket_ids, older_than_days):
+    """Bitta tranzaksiyada bir guruh murojaatni arxivga ko'chirish"""
+    with transaction.atomic():
+        # Tranzaksiya ichida qayta tekshirish (shu orada qayta ochilgan bo'lishi mumkin)
+        tickets = list(
+            archivable_tickets(older_than_days)
+            .select_for_update()
+            .filter(id__in=ticket_ids)
+        )
+        if not tickets:
+            return 0
+        
+        ids = [ticket.id for ticket in tickets]
+        
+        ArchivedTicket.objects.bulk_create(
+            [_copy_to(ArchivedTicket, ticket) for ticket in tickets]
+        )
+        ArchivedTicketMessage.objects.bulk_create(
+            [_copy_to(ArchivedTicketMessage, msg) for msg in TicketMessage.objects.filter(ticket_id__in=ids)]
+        )
+        ArchivedTicketHistory.objects.bulk_create(
+            [_copy_to(ArchivedTicketHistory, item) for item in TicketHistory.objects.filter(ticket_id__in=ids)]
+        )
+        
+        TicketMessage.objects.filter(ticket_id__in=ids).delete()
+        TicketHistory.objects.filter(ticket_id__in=ids).delete()
+        Ticket.objects.filter(id__in=ids).delete()
+        
+        return len(ids)
+
+
+def archive_tickets(older_than_days=None, batch_size=DEFAULT_BATCH_SIZE, dry_run=False):
+    """
+    Eski murojaatlarni xabarlari va tarixi bilan arxivga ko'chirish
+    
+    Har bir guruh (batch_size) alohida tranzaksiyada ko'chiriladi,
+    shuning uchun jarayon to'xtatilsa ham ma'lumot yo'qolmaydi.
+    
+    Returns:
+        int: arxivlangan murojaatlar soni (dry_run da - nomzodlar soni)
+    """
+    if older_than_days is None:
+        older_than_days = get_archive_after_days()
+    
+    candidates = archivable_tickets(older_than_days)
+    if dry_run:
+        return candidates.count()
+    
+    archived = 0
+    last_id = 0
+    while True:
+        ticket_ids = list(
+            candidates.filter(id__gt=last_id)
+            .order_by('id')
+            .values_list('id', flat=True)[:batch_size]
+        )
+        if not ticket_ids:
+            break
+        archived += _archive_batch(ticket_ids, older_than_days)
+        last_id = ticket_ids[-1]
+    
+    return archived
+
+
+def purge_read_notifications(older_than_days=None, batch_size=DEFAULT_BATCH_SIZE * 4, dry_run=False):
+    """O'qilgan (is_read yoki watermark dan oldingi) va eski bildirishnomalarni guruhlab o'chirish"""
+    if older_than_days is None:
+        older_than_days = get_notification_purge_days()
+    
+    cutoff = timezone.now() - timedelta(days=older_than_days)
+    candidates = Notification.objects.read().filter(created_at__lt=cutoff)
+    if dry_run:
+        return candidates.count()
+    
+    purged = 0
+    while True:
+        ids = list(candidates.order_by('id').values_list('id', flat=True)[:batch_size])
+        if not ids:
+            break
+        deleted, _ = Notification.objects.filter(id__in=ids).delete()
+        purged += deleted
+    
+    return purged
+
+
+# ============================================
+# ARXIVNI O'QISH
+# ============================================
+
+def get_ticket_or_archived(pk):
+    """
+    Murojaatni hot jadvaldan, topilmasa arxivdan olish
+    
+    Arxiv faqat hot jadvalda topilmaganda so'raladi.
+    """
+    related = ('user', 'system', 'region', 'assigned_to')
+    ticket = Ticket.objects.select_related(*related).filter(pk=pk).first()
+    if ticket is not None:
+        return ticket
+    
+    archived = ArchivedTicket.objects.select_related(*related).filter(pk=pk).first()
+    if archived is not None:
+        return archived
+    
+    raise Http404
+
+
+def ticket_source(archived=False):
+    """Ro'yxatlar va hisobotlar uchun manba: hot yoki arxiv"""
+    return ArchivedTicket.objects.all() if archived else Ticket.objects.all()
@@ -0,0 +1,120 @@
+# tickets/assignment.py - YANGI MUROJAATLARNI AVTOMATIK BIRIKTIRISH (ENG KAM YUKLANGAN TEXNIK)
+
+import random
+
+from django.conf import settings
+from django.db.models import Count
+from django.utils.translation import gettext_lazy as _
+
+from notifications.models import Notification
+from systems.models import SystemResponsible
+
+from .models import Ticket, TicketHistory
+
+
+# Texnik yukini tashkil qiladigan (ochiq) holatlar
+OPEN_STATUSES = ('new', 'in_progress', 'reopened')
+
+
+def eligible_technicians(system_id, region_id):
+    """
+    Murojaatni olishi mumkin bo'lgan texniklar (user id lar)
+
+    Avval tizimning shu viloyatdagi texniklari, ular bo'lmasa - respublika
+    miqyosidagi asosiy (is_default, region bo'sh) texniklar.
+    """
+    responsibles = SystemResponsible.objects.filter(
+        system_id=system_id,
+        role_in_system='technician',
+        user__is_active=True,
+        user__role='technician',
+    )
+    user_ids = list(
+        responsibles.filter(region_id=region_id).values_list('user_id', flat=True).distinct()
+    )
+    if not user_ids:
+        user_ids = list(
+            responsibles.filter(region__isnull=True, is_default=True)
+            .values_list('user_id', flat=True).distinct()
+        )
+    return user_ids
+
+
+def get_loads(user_ids):
+    """
+    Texniklarning ochiq murojaatlar soni - bazadan, bitta GROUP BY so'rovi
+
+    Har tanlovda qayta hisoblanadi (assigned_to indeksi bo'yicha, nomzodlar
+    bir necha kishi): boshqa worker, claim_next_ticket yoki rejalashtiruvchi
+    o'zgartirgan murojaatlar ham darhol hisobga olinadi.
+    """
+    counted = dict(
+        Ticket.objects.filter(assigned_to_id__in=user_ids, status__in=OPEN_STATUSES)
+        .values('assigned_to').annotate(total=Count('id'))
+        .values_list('assigned_to', 'total')
+    )
+    return {user_id: counted.get(user_id, 0) for user_id in user_ids}
+
+
+def pick_technician(ticket):
+    """
+    Eng kam yuklangan texnikni tanlash (teng bo'lsa - tasodifiy)
+
+    hybrid rejimda eng kam yuk ham AUTO_ASSIGN_HYBRID_MAX_LOAD dan kam
+    bo'lmasa None - murojaat navbatda qoladi, texniklar o'zlari oladi.
+    """
+    user_ids = eligible_technicians(ticket.system_id, ticket.region_id)
+    if not user_ids:
+        return None
+
+    loads = get_loads(user_ids)
+    lowest = min(loads.values())
+    if ticket.system.assignment_mode == 'hybrid':
+        if lowest >= getattr(settings, 'AUTO_ASSIGN_HYBRID_MAX_LOAD', 5):
+            return None
+    return random.choice([user_id for user_id in user_ids if loads[user_id] == lowest])
+
+
+def auto_assign(ticket):
+    """
+    Yangi murojaatni tizim sozlamasiga ko'ra texnikka biriktirish
+
+    System.assignment_mode:
+    - self   - biriktirilmaydi (texniklar new_tickets_list dan o'zlari oladi)
+    - auto   - har doim eng kam yuklangan texnikka
+    - hybrid - faqat bo'sh (yuki chegaradan kam) texnik bo'lsa
+
+    Holat 'new' bo'lib qoladi - texnik ishni boshlaganda o'zgartiradi.
+    Qaror TicketHistory ga (changed_by=None) yoziladi.
+
+    Returns:
+        User yoki None
+    """
+    if ticket.system.assignment_mode == 'self' or ticket.assigned_to_id:
+        return None
+
+    user_id = pick_technician(ticket)
+    if user_id is None:
+        return None
+
+    ticket.assigned_to_id = user_id
+    ticket.assignment_type = 'auto'
+    ticket.save(update_fields=['assigned_to', 'assignment_type', 'first_assigned_at',
+                               'resolution_seconds', 'updated_at'])
+
+    technician = ticket.assigned_to
+    TicketHistory.objects.create(
+        ticket=ticket,
+        changed_by=None,
+        action_type='assigned',
+        new_value=technician.get_full_name(),
+        message=_('Avtomatik biriktirildi (eng kam yuklangan texnik)'),
+    )
+    Notification.objects.create(
+        user=technician,
+        notification_type='ticket_assigned',
+        title=_('Sizga murojaat biriktirildi'),
+        text=_('Yangi murojaat: {}').format(ticket.get_ticket_number()),
+        url=f'/tickets/{ticket.id}/',
+    )
+    return technician
@@ -0,0 +1,226 @@
+# tickets/audit.py - AUDIT LOG: FILTRLAR, KURSOR SAHIFALASH, STREAM EXPORT
+
+import base64
+import csv
+import json
+from datetime import datetime, time
+
+from django.db.models import Q
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+
+AUDIT_PAGE_SIZE = 100
+EXPORT_CHUNK_SIZE = 2000
+
+EXPORT_FIELDS = [
+    'id',
+    'timestamp',
+    'ticket_id',
+    'ticket__system__name',
+    'ticket__region__name',
+    'action_type',
+    'changed_by_id',
+    'changed_by__username',
+    'old_value',
+    'new_value',
+    'message',
+]
+
+
+# ============================================
+# FILTRLAR
+# ============================================
+
+def _to_int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _to_date(value):
+    try:
+        return parse_date(value or '')
+    except ValueError:
+        return None
+
+
+def get_audit_filters(params):
+    """GET parametrlaridan filtrlarni olish (noto'g'ri qiymatlar e'tiborsiz)"""
+    date_from = _to_date(params.get('date_from'))
+    date_to = _to_date(params.get('date_to'))
+
+    return {
+        'action_type': params.get('action_type') or '',
+        'user_id': _to_int(params.get('user_id')),
+        'ticket_id': _to_int((params.get('ticket') or '').lstrip('#').split('-')[-1]),
+        'system_id': _to_int(params.get('system')),
+        'date_from': date_from,
+        'date_to': date_to,
+    }
+
+
+def filter_audit_logs(queryset, filters):
+    """
+    Audit loglarni filtrlash
+
+    Sana oralig'i timestamp ustunidagi oraliq sifatida beriladi
+    (timestamp__date ishlatilmaydi - u indeksdan foydalanmaydi).
+    """
+    if filters['action_type']:
+        queryset = queryset.filter(action_type=filters['action_type'])
+
+    if filters['user_id']:
+        queryset = queryset.filter(changed_by_id=filters['user_id'])
+
+    if filters['ticket_id']:
+        queryset = queryset.filter(ticket_id=filters['ticket_id'])
+
+    if filters['system_id']:
+        # JOIN orqali - TicketHistory da system_id yo'q, mos indeks ham yo'q.
+        # Baza history_ts_id_idx bo'yicha tartibda yurib har qatorning
+        # murojaatini PK bo'yicha tekshiradi: ko'p uchraydigan tizimda sahifa
+        # tez to'ladi, kam uchraydiganida (yoki filtr natijasi bo'sh bo'lsa)
+        # butun log ko'rib chiqiladi. Sana oralig'i bilan birga ishlatilsin.
+        queryset = queryset.filter(ticket__system_id=filters['system_id'])
+
+    tz = timezone.get_current_timezone()
+    if filters['date_from']:
+        start = timezone.make_aware(datetime.combine(filters['date_from'], time.min), tz)
+        queryset = queryset.filter(timestamp__gte=start)
+
+    if filters['date_to']:
+        end = timezone.make_aware(datetime.combine(filters['date_to'], time.max), tz)
+        queryset = queryset.filter(timestamp__lte=end)
+
+    return queryset
+
+
+# ============================================
+# KURSOR (KEYSET) SAHIFALASH
+# ============================================
+
+def encode_cursor(timestamp, pk):
+    """(timestamp, id) -> URL uchun xavfsiz kursor"""
+    raw = f"{timestamp.isoformat()}|{pk}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """Kursorni (timestamp, id) ga qaytarish. Noto'g'ri kursor -> None"""
+    if not cursor:
+        return None
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode()).decode()
+        value, pk = raw.rsplit('|', 1)
+        timestamp = parse_datetime(value)
+        if timestamp is None:
+            return None
+        return timestamp, int(pk)
+    except (ValueError, UnicodeDecodeError):
+        return None
+
+
+def _after_cursor(queryset, position):
+    timestamp, pk = position
+    return queryset.filter(
+        Q(timestamp__lt=timestamp) |
+        Q(timestamp=timestamp, id__lt=pk)
+    )
+
+
+def paginate_audit_logs(queryset, cursor=None, page_size=AUDIT_PAGE_SIZE):
+    """
+    Keyset sahifalash: (-timestamp, -id) tartibida
+
+    COUNT so'rovi bajarilmaydi - keyingi sahifa borligini bilish uchun
+    page_size + 1 ta yozuv olinadi.
+
+    Returns:
+        (logs_list, next_cursor yoki None)
+    """
+    queryset = queryset.order_by('-timestamp', '-id')
+
+    position = decode_cursor(cursor)
+    if position:
+        queryset = _after_cursor(queryset, position)
+
+    logs = list(queryset[:page_size + 1])
+    next_cursor = None
+    if len(logs) > page_size:
+        logs = logs[:page_size]
+        last = logs[-1]
+        next_cursor = encode_cursor(last.timestamp, last.pk)
+
+    return logs, next_cursor
+
+
+def iter_audit_rows(queryset, chunk_size=EXPORT_CHUNK_SIZE):
+    """Filtrlangan loglarni keyset bo'laklarida values() sifatida aylanish"""
+    queryset = queryset.order_by('-timestamp', '-id').values(*EXPORT_FIELDS)
+    position = None
+
+    while True:
+        chunk = queryset
+        if position:
+            chunk = _after_cursor(chunk, position)
+        rows = list(chunk[:chunk_size])
+        if not rows:
+            return
+        yield from rows
+        if len(rows) < chunk_size:
+            return
+        position = (rows[-1]['timestamp'], rows[-1]['id'])
+
+
+# ============================================
+# STREAM EXPORT (CSV / NDJSON)
+# ============================================
+
+class _Echo:
+    """csv.writer uchun yozilgan qatorni qaytaruvchi psevdo-fayl"""
+
+    def write(self, value):
+        return value
+
+
+def _export_filename(extension):
+    return f"audit_logs_{timezone.now().strftime('%Y%m%d_%H%M%S')}.{extension}"
+
+
+def _serialize_row(row):
+    row = dict(row)
+    row['timestamp'] = timezone.localtime(row['timestamp']).isoformat()
+    return row
+
+
+def stream_audit_csv(queryset):
+    """CSV export - butun fayl xotirada yig'ilmaydi"""
+    writer = csv.writer(_Echo())
+
+    def rows():
+        yield '\ufeff'  # BOM for Excel UTF-8 support
+        yield writer.writerow(EXPORT_FIELDS)
+        for row in iter_audit_rows(queryset):
+            row = _serialize_row(row)
+            yield writer.writerow([row[field] for field in EXPORT_FIELDS])
+
+    response = StreamingHttpResponse(rows(), content_type='text/csv; charset=utf-8')
+    response['Content-Disposition'] = f'attachment; filename="{_export_filename("csv")}"'
+    return response
+
+
+def stream_audit_ndjson(queryset):
+    """NDJSON export - har bir qator alohida JSON obyekt"""
+
+    def rows():
+        for row in iter_audit_rows(queryset):
+            yield json.dumps(_serialize_row(row), ensure_ascii=False) + '\n'
+
+    response = StreamingHttpResponse(rows(), content_type='application/x-ndjson; charset=utf-8')
+    response['Content-Disposition'] = f'attachment; filename="{_export_filename("ndjson")}"'
+    return response
+
@@ -0,0 +1,124 @@
+# tickets/benchmarks.py - BENCHMARK YORDAMCHILARI (PERSENTIL, BASELINE, SOLISHTIRISH)
+
+import json
+import math
+import os
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from django.utils import timezone
+
+
+def percentile(values, pct):
+    """
+    Chiziqli interpolatsiya bilan persentil (numpy 'linear' usuli)
+
+    percentile([...], 50) - mediana, percentile([...], 95) - p95
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100
+    low, high = math.floor(rank), math.ceil(rank)
+    if low == high:
+        return float(ordered[low])
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def summarize(seconds):
+    """Vaqtlar (sekund) -> millisekundlardagi p50/p95/o'rtacha/min/max"""
+    ms = [value * 1000 for value in seconds]
+    return {
+        'p50_ms': round(percentile(ms, 50), 2),
+        'p95_ms': round(percentile(ms, 95), 2),
+        'mean_ms': round(sum(ms) / len(ms), 2) if ms else 0.0,
+        'min_ms': round(min(ms), 2) if ms else 0.0,
+        'max_ms': round(max(ms), 2) if ms else 0.0,
+    }
+
+
+# ============================================
+# JARAYON XOTIRASI (RSS)
+# ============================================
+
+def current_rss_kb():
+    """Joriy RSS (KB) - Linux da /proc dan, boshqa tizimlarda None"""
+    try:
+        with open('/proc/self/statm') as file:
+            pages = int(file.read().split()[1])
+    except (OSError, ValueError, IndexError):
+        return None
+    return round(pages * os.sysconf('SC_PAGE_SIZE') / 1024)
+
+
+def peak_rss_kb():
+    """Jarayonning eng yuqori RSS i (KB) - faqat o'sadi, kamaymaydi"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS da bayt, Linux da KB
+    return round(peak / 1024) if os.uname().sysname == 'Darwin' else peak
+
+
+# ============================================
+# BASELINE FAYLI
+# ============================================
+
+def save_baseline(path, results, meta=None):
+    """Natijalarni JSON ga yozish (kalitlar tartiblangan - diff qilish oson)"""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    data = {
+        'meta': {'created_at': timezone.now().isoformat(), **(meta or {})},
+        'results': results,
+    }
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump(data, file, ensure_ascii=False, indent=2, sort_keys=True)
+
+
+def load_baseline(path):
+    with open(path, encoding='utf-8') as file:
+        return json.load(file)
+
+
+def compare_results(baseline, current, threshold=0.2, min_delta_ms=5.0, metrics=('p50_ms', 'p95_ms')):
+    """
+    Joriy natijalarni baseline bilan solishtirish
+
+    - Vaqt (metrics): threshold (0.2 = +20%) dan ko'p VA min_delta_ms dan ko'p
+      oshgan bo'lsa - regressiya (kichik sahifalardagi shovqin hisobga olinmaydi)
+    - SQL so'rovlar soni: deterministik, har qanday oshish - regressiya
+    - Xotira (peak_kb): threshold dan ko'p oshsa - regressiya
+
+    Returns:
+        list: [(kalit, metrika, eski, yangi), ...]
+    """
+    regressions = []
+    for key, new in sorted(current.items()):
+        old = baseline.get(key)
+        if not old:
+            continue
+
+        for metric in metrics:
+            before, after = old.get(metric), new.get(metric)
+            if before is None or after is None:
+                continue
+            if after > before * (1 + threshold) and after - before > min_delta_ms:
+                regressions.append((key, metric, before, after))
+
+        if new.get('queries') is not None and old.get('queries') is not None:
+            if new['queries'] > old['queries']:
+                regressions.append((key, 'queries', old['queries'], new['queries']))
+
+        if new.get('peak_kb') and old.get('peak_kb'):
+            if new['peak_kb'] > old['peak_kb'] * (1 + threshold):
+                regressions.append((key, 'peak_kb', old['peak_kb'], new['peak_kb']))
+
+        if new.get('status') != old.get('status'):
+            regressions.append((key, 'status', old.get('status'), new.get('status')))
+
+    return regressions
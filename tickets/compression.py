@@ -0,0 +1,60 @@
+# tickets/compression.py - HTML VA JSON JAVOBLARNI SIQISH (BROTLI / GZIP)
+
+import re
+
+try:
+    import brotli
+except ImportError:  # ixtiyoriy - bo'lmasa faqat gzip
+    brotli = None
+
+from django.conf import settings
+from django.middleware.gzip import GZipMiddleware
+from django.utils.cache import patch_vary_headers
+
+
+COMPRESSIBLE_TYPES = ('text/html', 'application/json', 'text/plain', 'text/csv')
+re_accepts_br = re.compile(r'\bbr\b')
+
+
+class CompressionMiddleware(GZipMiddleware):
+    """
+    GZipMiddleware ning kengaytmasi: o'lcham chegarasi, tur filtri va brotli
+
+    - Faqat COMPRESSIBLE_TYPES (HTML, JSON, matn) va COMPRESSION_MIN_SIZE
+      baytdan katta javoblar siqiladi - kichik JSON (unread_count) uchun
+      siqish vaqti tejalgan baytlardan qimmat.
+    - Streaming javoblar (fayllar, Excel/PDF eksport) siqilmaydi: rasm/PDF
+      allaqachon siqilgan, statikani WhiteNoise o'zi siqilgan holda beradi.
+    - Brauzer "br" qabul qilsa va brotli paketi o'rnatilgan bo'lsa - brotli,
+      aks holda Django gzip (BREACH ga qarshi tasodifiy padding bilan).
+    """
+
+    def process_response(self, request, response):
+        if response.streaming or response.has_header('Content-Encoding'):
+            return response
+        content_type = response.get('Content-Type', '').split(';')[0].strip()
+        if content_type not in COMPRESSIBLE_TYPES:
+            return response
+        if len(response.content) < getattr(settings, 'COMPRESSION_MIN_SIZE', 1024):
+            return response
+
+        accept_encoding = request.META.get('HTTP_ACCEPT_ENCODING', '')
+        if brotli is None or not re_accepts_br.search(accept_encoding):
+            return super().process_response(request, response)
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        compressed = brotli.compress(
+            response.content,
+            mode=brotli.MODE_TEXT,
+            quality=getattr(settings, 'COMPRESSION_BROTLI_QUALITY', 5),
+        )
+        if len(compressed) >= len(response.content):
+            return response
+        response.content = compressed
+        response.headers['Content-Length'] = str(len(compressed))
+
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response.headers['ETag'] = 'W/' + etag
+        response.headers['Content-Encoding'] = 'br'
+        return response
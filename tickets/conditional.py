@@ -0,0 +1,191 @@
+# tickets/conditional.py - CONDITIONAL GET (ETAG / LAST-MODIFIED, 304)
+
+import hashlib
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.contrib.messages import get_messages
+from django.db.models import Count, Max, OuterRef, Subquery
+from django.middleware.csrf import get_token
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+
+from accounts.utils import can_view_ticket
+from notifications.cache import get_notification_version
+from .models import ArchivedTicket, Ticket
+
+
+def make_etag(*parts):
+    """Qismlardan weak ETag (siqish bodyni o'zgartiradi - strong bo'lolmaydi)"""
+    digest = hashlib.md5(repr(parts).encode(), usedforsecurity=False).hexdigest()
+    return f'W/"{digest}"'
+
+
+def conditional_view(state_func):
+    """
+    Viewni render qilishdan oldin holatni tekshirish (If-None-Match / If-Modified-Since)
+
+    state_func(request, *args, **kwargs) -> (etag, last_modified) yoki None.
+    None - shartli javob yo'q (masalan ruxsat yo'q yoki ko'rsatiladigan flash xabar bor),
+    view odatdagidek ishlaydi. Mos kelsa 304 qaytadi - view, shablon va uning
+    so'rovlari bajarilmaydi. Django ning condition() dan farqi: holat bitta
+    funksiyada (ETag va Last-Modified uchun bitta so'rov) va async viewlarda
+    state_func threadda ishlaydi (DB / DB kesh so'rovlari uchun).
+
+    Javobga Cache-Control: private, no-cache qo'shiladi - brauzer saqlaydi,
+    lekin har safar qayta tekshiradi; umumiy proxy keshlamaydi.
+
+    login_required / alogin_required dan keyin (ichkarida) turishi kerak.
+    """
+    def evaluate(request, *args, **kwargs):
+        if request.method not in ('GET', 'HEAD'):
+            return None, None, None
+        state = state_func(request, *args, **kwargs)
+        if state is None:
+            return None, None, None
+        etag, last_modified = state
+        timestamp = int(last_modified.timestamp()) if last_modified else None
+        response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+        return response, etag, timestamp
+
+    def finish(response, etag, timestamp):
+        if etag:
+            response.headers.setdefault('ETag', etag)
+        if timestamp and not response.has_header('Last-Modified'):
+            response.headers['Last-Modified'] = http_date(timestamp)
+        if etag or timestamp:
+            patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+    def decorator(view_func):
+        if iscoroutinefunction(view_func):
+            @wraps(view_func)
+            async def wrapper(request, *args, **kwargs):
+                response, etag, timestamp = await sync_to_async(evaluate)(request, *args, **kwargs)
+                if response is None:
+                    response = await view_func(request, *args, **kwargs)
+                return finish(response, etag, timestamp)
+        else:
+            @wraps(view_func)
+            def wrapper(request, *args, **kwargs):
+                response, etag, timestamp = evaluate(request, *args, **kwargs)
+                if response is None:
+                    response = view_func(request, *args, **kwargs)
+                return finish(response, etag, timestamp)
+        return wrapper
+    return decorator
+
+
+# ============================================
+# HOLAT FUNKSIYALARI
+# ============================================
+
+def ticket_state(pk):
+    """
+    Murojaat (hot yoki arxiv) va uning oxirgi o'zgarish vaqti - bitta so'rov
+
+    max(Ticket.updated_at, oxirgi xabar created_at, oxirgi tarix timestamp).
+    Returns: (ticket, last_modified) yoki (None, None)
+    """
+    for model in (Ticket, ArchivedTicket):
+        message_model = model.messages.rel.related_model
+        history_model = model.history.rel.related_model
+        ticket = model.objects.filter(pk=pk).annotate(
+            last_message_at=Subquery(
+                message_model.objects.filter(ticket=OuterRef('pk'))
+                .order_by('-created_at').values('created_at')[:1]
+            ),
+            last_history_at=Subquery(
+                history_model.objects.filter(ticket=OuterRef('pk'))
+                .order_by('-timestamp').values('timestamp')[:1]
+            ),
+        ).first()
+        if ticket is not None:
+            times = [ticket.updated_at, ticket.last_message_at, ticket.last_history_at]
+            return ticket, max(value for value in times if value is not None)
+    return None, None
+
+
+def _new_tickets_marker(user):
+    # accounts.context_processors.new_tickets_count - texnik navbaridagi son
+    if not user.is_technician():
+        return None
+    marker = Ticket.objects.filter(status='new', assigned_to__isnull=True).aggregate(
+        last_id=Max('id'), count=Count('id'),
+    )
+    return marker['last_id'], marker['count']
+
+
+def notification_state_parts(user):
+    """
+    Foydalanuvchi bildirishnomalari holati - bazadan (request.user qatori)
+
+    notifications_version har bir bildirishnoma yozuvida (boshqa worker, cron,
+    management buyrug'i ham) bazada oshadi, notifications_read_until -
+    "barchasini o'qildi". Jarayon ichidagi keshga bog'liq emas.
+    """
+    read_until = user.notifications_read_until
+    return get_notification_version(user), read_until.timestamp() if read_until else 0
+
+
+def page_state_parts(request):
+    """
+    HTML sahifaning foydalanuvchiga bog'liq qismlari (base.html navbari)
+
+    None - sahifada bir martalik flash xabar bor, 304 qaytarib bo'lmaydi.
+
+    Sessiya kaliti va CSRF secret ham qo'shiladi: qayta login ikkalasini
+    almashtiradi, updated_at esa o'zgarmaydi (update_last_login faqat
+    last_login ni yozadi). Aks holda 304 sahifadagi eski CSRF token bilan
+    formalar 403 qaytaradi. ETag da ular xesh ichida - oshkor bo'lmaydi.
+    get_token - cookie hali yo'q bo'lsa secret shu javobda beriladi
+    (keyingi so'rov bir xil ETag oladi).
+    """
+    if len(get_messages(request)):
+        return None
+    user = request.user
+    session = getattr(request, 'session', None)
+    get_token(request)
+    return (
+        user.pk,
+        session.session_key if session is not None else '',
+        request.META.get('CSRF_COOKIE', ''),
+        user.updated_at.timestamp() if user.updated_at else 0,
+        notification_state_parts(user),
+        getattr(request, 'LANGUAGE_CODE', ''),
+        _new_tickets_marker(user),
+    )
+
+
+def ticket_page_state(request, pk):
+    """ticket_detail (HTML): murojaat holati + navbar; ruxsat bo'lmasa None"""
+    page_parts = page_state_parts(request)
+    if page_parts is None:
+        return None
+    ticket, last_modified = ticket_state(pk)
+    if ticket is None or not can_view_ticket(request.user, ticket):
+        return None
+    # Last-Modified berilmaydi - sahifa murojaatdan tashqari navbarga ham bog'liq
+    return make_etag('ticket-page', pk, last_modified.isoformat(), page_parts), None
+
+
+def ticket_api_state(request, pk):
+    """API: murojaat va xabarlari - faqat murojaat holatiga bog'liq"""
+    ticket, last_modified = ticket_state(pk)
+    if ticket is None or not can_view_ticket(request.user, ticket):
+        return None
+    return make_etag('ticket', request.path, last_modified.isoformat(), request.GET.urlencode()), last_modified
+
+
+def notifications_state(request):
+    """Bildirishnoma endpointlari: foydalanuvchining bildirishnomalar holati"""
+    parts = notification_state_parts(request.user)
+    return make_etag('notifications', request.user.pk, parts, request.path, request.GET.urlencode()), None
+
+
+def notifications_page_state(request):
+    """Bildirishnomalar sahifasi (HTML): versiya + navbar"""
+    page_parts = page_state_parts(request)
+    if page_parts is None:
+        return None
+    return make_etag('notifications-page', page_parts), None
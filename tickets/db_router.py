@@ -0,0 +1,180 @@
+# tickets/db_router.py - READ-REPLICA ROUTER (HISOBOTLAR, DASHBOARDLAR, EXPORTLAR)
+
+from contextvars import ContextVar
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+REPLICA_DB_ALIAS = 'replica'
+STICKY_COOKIE_NAME = 'db_primary'
+
+# Sessiyani saqlash (har so'rovda) yozuv hisoblanmaydi - aks holda hamma doim primaryda qoladi
+IGNORED_WRITE_APPS = {'sessions'}
+# Har doim primarydan o'qiladi (eskirgan sessiya - tizimdan chiqib ketish)
+PRIMARY_ONLY_APPS = {'sessions'}
+
+
+class RoutingState:
+    """Bitta so'rov holati: replica ruxsat etilganmi, foydalanuvchi primaryga bog'langanmi"""
+
+    def __init__(self, pinned=False):
+        self.pinned = pinned
+        self.wrote = False
+        self.replica = False
+
+
+_state = ContextVar('db_routing_state', default=None)
+
+
+def replica_configured():
+    return REPLICA_DB_ALIAS in settings.DATABASES
+
+
+class ReplicaRouter:
+    """
+    replica_reads bilan belgilangan viewlardagi o'qishlarni replicaga yuborish
+
+    Primaryda qoladi:
+    - replica sozlanmagan (DATABASE_REPLICA_URL yo'q) yoki so'rov tashqarisida
+      (management commandlar, scheduler)
+    - foydalanuvchi oxirgi DATABASE_REPLICA_STICKY_SECONDS ichida yozgan
+      (read-your-writes, ReplicaStickinessMiddleware cookie si)
+    - shu so'rovda yozuv bo'lgan yoki ochiq tranzaksiya ichida
+    Yozuvlar har doim primaryga.
+    """
+
+    def db_for_read(self, model, **hints):
+        state = _state.get()
+        if state is None or not state.replica or state.pinned or state.wrote:
+            return None
+        if model._meta.app_label in PRIMARY_ONLY_APPS or not replica_configured():
+            return None
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return None
+        return REPLICA_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        state = _state.get()
+        if state is not None and model._meta.app_label not in IGNORED_WRITE_APPS:
+            state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replica - primary nusxasi, obyektlar bitta bazadan
+        aliases = {DEFAULT_DB_ALIAS, REPLICA_DB_ALIAS}
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+        return None
+
+
+def _replica_iterator(content, state):
+    # StreamingHttpResponse: exportning so'rovlari view (va middleware) qaytgandan
+    # keyin bajariladi - holat har bir bo'lak uchun qayta o'rnatiladi
+    iterator = iter(content)
+    while True:
+        token = _state.set(state)
+        previous, state.replica = state.replica, True
+        try:
+            chunk = next(iterator)
+        except StopIteration:
+            return
+        finally:
+            state.replica = previous
+            _state.reset(token)
+        yield chunk
+
+
+def replica_reads(view_func):
+    """
+    View ichidagi o'qishlarni replicaga ruxsat berish (hisobot, dashboard, export)
+
+    Ruxsat tekshiruvlaridan keyin (eng ichkarida) turishi kerak - foydalanuvchi
+    va sessiya primarydan o'qiladi. Streaming javoblarning so'rovlari ham
+    replicadan. Replica sozlanmagan bo'lsa hech narsa o'zgarmaydi.
+    """
+    if iscoroutinefunction(view_func):
+        @wraps(view_func)
+        async def wrapper(request, *args, **kwargs):
+            state = _state.get()
+            if state is None:
+                return await view_func(request, *args, **kwargs)
+            previous, state.replica = state.replica, True
+            try:
+                return await view_func(request, *args, **kwargs)
+            finally:
+                state.replica = previous
+        return wrapper
+
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        state = _state.get()
+        if state is None:
+            return view_func(request, *args, **kwargs)
+        previous, state.replica = state.replica, True
+        try:
+            response = view_func(request, *args, **kwargs)
+        finally:
+            state.replica = previous
+        if response.streaming and not response.is_async:
+            response.streaming_content = _replica_iterator(response.streaming_content, state)
+        return response
+    return wrapper
+
+
+class ReplicaStickinessMiddleware:
+    """
+    Read-your-writes: yozgan foydalanuvchini bir necha soniya primaryda ushlab turish
+
+    So'rovda yozuv bo'lsa DATABASE_REPLICA_STICKY_SECONDS muddatli cookie
+    qo'yiladi; cookie bor ekan replica_reads viewlari ham primarydan o'qiydi
+    (replica kechikishi foydalanuvchiga ko'rinmaydi). Cookie - brauzerga
+    bog'liq, shuning uchun gunicorn workerlari orasida umumiy holat kerak emas.
+
+    Replica sozlanmagan bo'lsa zanjirdan chiqariladi (MiddlewareNotUsed).
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not replica_configured():
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        state = RoutingState(pinned=STICKY_COOKIE_NAME in request.COOKIES)
+        token = _state.set(state)
+        try:
+            response = self.get_response(request)
+        finally:
+            _state.reset(token)
+        return self._stick(state, response)
+
+    async def __acall__(self, request):
+        state = RoutingState(pinned=STICKY_COOKIE_NAME in request.COOKIES)
+        token = _state.set(state)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _state.reset(token)
+        return self._stick(state, response)
+
+    def _stick(self, state, response):
+        if state.wrote:
+            response.set_cookie(
+                STICKY_COOKIE_NAME, '1',
+                max_age=getattr(settings, 'DATABASE_REPLICA_STICKY_SECONDS', 5),
+                httponly=True,
+                samesite='Lax',
+                secure=settings.SESSION_COOKIE_SECURE,
+            )
+        return response
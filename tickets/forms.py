@@ -130,6 +130,18 @@ class TicketFilterForm(forms.Form):
         widget=forms.Select(attrs={'class': 'form-select'})
     )
     
+    # NAVBAT TARTIBI (texnik sahifalari)
+    order = forms.ChoiceField(
+        choices=[
+            ('', _('Standart tartib')),
+            ('priority', _('Ustuvorlik va kutish vaqti')),
+            ('newest', _('Eng yangilari')),
+        ],
+        required=False,
+        label=_('Tartib'),
+        widget=forms.Select(attrs={'class': 'form-select'})
+    )
+    
     # ✅ MAS'UL XODIM
     assigned_to = forms.ModelChoiceField(
         queryset=User.objects.filter(
@@ -160,4 +172,11 @@ class TicketFilterForm(forms.Form):
             'type': 'date',
             'class': 'form-input'
         })
+    )
+    
+    # ✅ ARXIV (eski hal qilingan murojaatlar)
+    archived = forms.BooleanField(
+        required=False,
+        label=_('Arxivdan'),
+        widget=forms.CheckboxInput(attrs={'class': 'form-checkbox'})
     )
\ No newline at end of file
@@ -0,0 +1,83 @@
+from django.core.management.base import BaseCommand
+
+from tickets.archive import (
+    DEFAULT_BATCH_SIZE,
+    archive_tickets,
+    get_archive_after_days,
+    get_notification_purge_days,
+    purge_read_notifications,
+)
+
+
+class Command(BaseCommand):
+    help = 'Eski hal qilingan/rad etilgan murojaatlarni arxivga ko\'chirish va o\'qilgan bildirishnomalarni tozalash'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=None,
+            help='Necha kundan eski murojaatlar arxivlanadi (default: settings.TICKET_ARCHIVE_AFTER_DAYS)',
+        )
+        parser.add_argument(
+            '--notification-days',
+            type=int,
+            default=None,
+            help='Necha kundan eski o\'qilgan bildirishnomalar o\'chiriladi (default: settings.NOTIFICATION_PURGE_AFTER_DAYS)',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help='Bitta tranzaksiyadagi murojaatlar soni',
+        )
+        parser.add_argument(
+            '--skip-notifications',
+            action='store_true',
+            help='Bildirishnomalarni tozalamaslik',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Faqat nomzodlar sonini ko\'rsatish',
+        )
+
+    def handle(self, *args, **options):
+        days = options['days'] if options['days'] is not None else get_archive_after_days()
+        notification_days = (
+            options['notification_days']
+            if options['notification_days'] is not None
+            else get_notification_purge_days()
+        )
+        dry_run = options['dry_run']
+
+        archived = archive_tickets(
+            older_than_days=days,
+            batch_size=options['batch_size'],
+            dry_run=dry_run,
+        )
+        if dry_run:
+            self.stdout.write(
+                self.style.WARNING(f'○ {archived} ta murojaat arxivlanishi mumkin ({days} kundan eski)')
+            )
+        else:
+            self.stdout.write(
+                self.style.SUCCESS(f'✓ {archived} ta murojaat arxivga ko\'chirildi ({days} kundan eski)')
+            )
+
+        if options['skip_notifications']:
+            return
+
+        purged = purge_read_notifications(
+            older_than_days=notification_days,
+            batch_size=options['batch_size'] * 4,
+            dry_run=dry_run,
+        )
+        if dry_run:
+            self.stdout.write(
+                self.style.WARNING(f'○ {purged} ta o\'qilgan bildirishnoma o\'chirilishi mumkin ({notification_days} kundan eski)')
+            )
+        else:
+            self.stdout.write(
+                self.style.SUCCESS(f'✓ {purged} ta o\'qilgan bildirishnoma o\'chirildi ({notification_days} kundan eski)')
+            )
@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from tickets.sla import DEFAULT_BATCH_SIZE, backfill_sla_metrics
+
+
+class Command(BaseCommand):
+    help = (
+        'Murojaatlarning first_assigned_at, first_response_at va resolution_seconds '
+        'ustunlarini tarix va xabarlardan to\'ldirish (hot va arxiv)'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help='Bitta tranzaksiyadagi murojaatlar soni',
+        )
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='To\'ldirilgan ustunlarni ham qayta hisoblash',
+        )
+        parser.add_argument(
+            '--skip-archive',
+            action='store_true',
+            help='Arxiv jadvallarini o\'tkazib yuborish',
+        )
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size kamida 1 bo\'lishi kerak')
+
+        stats = backfill_sla_metrics(
+            batch_size=options['batch_size'],
+            force=options['force'],
+            archived=not options['skip_archive'],
+        )
+        self.stdout.write(self.style.SUCCESS(f"✓ Ko'rib chiqilgan murojaatlar: {stats['tickets']}"))
+        self.stdout.write(self.style.SUCCESS(f"✓ Birinchi biriktirish: {stats['assigned']}"))
+        self.stdout.write(self.style.SUCCESS(f"✓ Birinchi javob: {stats['responded']}"))
+        self.stdout.write(self.style.SUCCESS(f"✓ Hal qilish vaqti: {stats['resolved']}"))
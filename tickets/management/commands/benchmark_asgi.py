@@ -0,0 +1,177 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlencode
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.test import AsyncClient, Client
+from django.urls import reverse
+
+from accounts.models import Region, User
+from tickets.benchmarks import save_baseline, summarize
+
+
+DEFAULT_OUTPUT = 'benchmarks/asgi.json'
+
+# (URL nomi, GET parametrlari) - async viewga o'tkazilgan JSON endpointlar
+ENDPOINTS = (
+    ('notifications:unread_count', {}),
+    ('notifications:recent', {}),
+    ('accounts:get_departments', {}),
+    ('tickets:api_unassigned_tickets', {}),
+    ('tickets:api_reopened_tickets', {}),
+    ('tickets:api_users_search', {'q': 'ali'}),
+    ('systems:systems_search_ajax', {'q': 'a'}),
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Async JSON endpointlarni WSGI (threadlar) va ASGI (event loop) handlerlari '
+        'orqali bir vaqtda chaqirib o\'tkazuvchanlikni solishtirish'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=500, help='Har bir endpoint uchun so\'rovlar')
+        parser.add_argument('--concurrency', type=int, default=50, help='Bir vaqtdagi so\'rovlar')
+        parser.add_argument('--username', help='Kim nomidan (default: birinchi superadmin)')
+        parser.add_argument('--only', help='Faqat nomida shu matn bor endpointlar')
+        parser.add_argument('--output', default=DEFAULT_OUTPUT)
+
+    def handle(self, *args, **options):
+        if options['requests'] < 1 or options['concurrency'] < 1:
+            raise CommandError('--requests va --concurrency kamida 1 bo\'lishi kerak')
+        if connections['default'].vendor == 'sqlite' and connections['default'].settings_dict['NAME'] == ':memory:':
+            raise CommandError('Xotiradagi SQLite threadlar orasida bo\'linmaydi - fayl yoki PostgreSQL kerak')
+
+        self.options = options
+        user = self._get_user(options['username'])
+        client = Client()
+        client.force_login(user)
+
+        header = (
+            f"  {'Endpoint':36} {'WSGI rps':>9} {'p95':>8}   {'ASGI rps':>9} {'p95':>8} {'ASGI/WSGI':>9}"
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"✓ {user.username}: {options['requests']} so'rov, {options['concurrency']} parallel"
+        ))
+        self.stdout.write(header)
+        self.stdout.write('  ' + '-' * (len(header) - 2))
+
+        results = {}
+        for name, query in ENDPOINTS:
+            if options['only'] and options['only'] not in name:
+                continue
+            url = self._url(name, query)
+            wsgi = self._run_wsgi(client.cookies, url)
+            asgi = asyncio.run(self._run_asgi(client.cookies, url))
+            results[f'wsgi:{name}'] = wsgi
+            results[f'asgi:{name}'] = asgi
+            ratio = asgi['rps'] / wsgi['rps'] if wsgi['rps'] else 0
+            self.stdout.write(
+                f"  {name:36} {wsgi['rps']:9.0f} {wsgi['p95_ms']:6.1f}ms   "
+                f"{asgi['rps']:9.0f} {asgi['p95_ms']:6.1f}ms {ratio:8.2f}x"
+            )
+            for mode, result in (('WSGI', wsgi), ('ASGI', asgi)):
+                if result['errors']:
+                    self.stdout.write(self.style.WARNING(
+                        f"    ○ {mode}: {result['errors']} ta javob 200 emas (status: {result['status']})"
+                    ))
+
+        meta = {
+            'requests': options['requests'],
+            'concurrency': options['concurrency'],
+            'database': connections['default'].vendor,
+            'user': user.username,
+        }
+        save_baseline(options['output'], results, meta)
+        self.stdout.write(self.style.SUCCESS(f"\n✓ Natijalar yozildi: {options['output']}"))
+        self.stdout.write(
+            'Eslatma: jarayon ichidagi test handlerlari - real server (gunicorn vs uvicorn) '
+            'natijasi tarmoq va DB kechikishiga qarab farq qiladi'
+        )
+
+    def _get_user(self, username):
+        users = User.objects.filter(is_active=True)
+        user = users.filter(username=username).first() if username else users.filter(role='superadmin').first()
+        if user is None:
+            raise CommandError('Foydalanuvchi topilmadi (--username bering)')
+        return user
+
+    def _url(self, name, query):
+        kwargs = {}
+        if name == 'accounts:get_departments':
+            region_id = Region.objects.values_list('id', flat=True).first()
+            if region_id is None:
+                raise CommandError('Viloyat yo\'q (generate_load_dataset ni ishga tushiring)')
+            kwargs['region_id'] = region_id
+        url = reverse(name, kwargs=kwargs)
+        return f'{url}?{urlencode(query)}' if query else url
+
+    def _summary(self, timings, statuses, elapsed):
+        errors = [status for status in statuses if status != 200]
+        return {
+            'rps': round(len(timings) / elapsed, 1) if elapsed else 0.0,
+            'errors': len(errors),
+            'status': sorted(set(errors)),
+            **summarize(timings),
+        }
+
+    # ============================================
+    # WSGI: HAR BIR SO'ROV - THREAD (gunicorn gthread kabi)
+    # ============================================
+
+    def _run_wsgi(self, cookies, url):
+        def worker(count):
+            client = Client()
+            client.cookies = cookies
+            timings, statuses = [], []
+            try:
+                for _ in range(count):
+                    start = time.perf_counter()
+                    response = client.get(url)
+                    timings.append(time.perf_counter() - start)
+                    statuses.append(response.status_code)
+            finally:
+                connections.close_all()
+            return timings, statuses
+
+        client = Client()
+        client.cookies = cookies
+        client.get(url)  # qizdirish
+
+        total, concurrency = self.options['requests'], self.options['concurrency']
+        shares = [total // concurrency + (1 if i < total % concurrency else 0) for i in range(concurrency)]
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            parts = list(pool.map(worker, [share for share in shares if share]))
+        elapsed = time.perf_counter() - start
+
+        timings = [value for part_timings, _statuses in parts for value in part_timings]
+        statuses = [value for _timings, part_statuses in parts for value in part_statuses]
+        return self._summary(timings, statuses, elapsed)
+
+    # ============================================
+    # ASGI: BITTA EVENT LOOP (uvicorn worker kabi)
+    # ============================================
+
+    async def _run_asgi(self, cookies, url):
+        client = AsyncClient()
+        client.cookies = cookies
+        await client.get(url)  # qizdirish
+
+        semaphore = asyncio.Semaphore(self.options['concurrency'])
+        timings, statuses = [], []
+
+        async def one():
+            async with semaphore:
+                start = time.perf_counter()
+                response = await client.get(url)
+                timings.append(time.perf_counter() - start)
+                statuses.append(response.status_code)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(self.options['requests'])))
+        elapsed = time.perf_counter() - start
+        return self._summary(timings, statuses, elapsed)
@@ -0,0 +1,245 @@
+import platform
+import time
+import tracemalloc
+
+import django
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from reports.utils.csv_generator import generate_csv_report
+from reports.utils.excel_generator import generate_excel_report
+from reports.utils.pdf_generator import generate_pdf_report
+from reports.views import get_report_stats
+from tickets.benchmarks import (
+    compare_results,
+    current_rss_kb,
+    load_baseline,
+    peak_rss_kb,
+    save_baseline,
+    summarize,
+)
+from tickets.models import Ticket
+from tickets.query_budget import count_queries
+
+
+REPORT_TYPES = (
+    'tickets', 'statistics', 'technician_performance', 'system_analysis', 'regional_analysis',
+    'sla_system', 'sla_region', 'sla_technician',
+)
+FORMATS = ('pdf', 'excel', 'csv')
+DEFAULT_SIZES = '100,1000,10000'
+DEFAULT_OUTPUT = 'benchmarks/reports.json'
+
+# Filtrsiz hisobot (superadmin "hammasi" ni tanlagandek)
+EMPTY_FILTERS = {
+    'date_from': None,
+    'date_to': None,
+    'system': None,
+    'region': None,
+    'status': None,
+    'priority': None,
+    'assigned_to': None,
+    'rating': None,
+    'archived': False,
+}
+
+
+def build_report(export_format, report_type, tickets, filters):
+    """generate_report view idagi bilan bir xil: statistika + eksport"""
+    stats_data = get_report_stats(report_type, tickets, filters)
+    if export_format == 'pdf':
+        return generate_pdf_report(tickets, filters, report_type, stats_data)
+    if export_format == 'excel':
+        return generate_excel_report(tickets, filters, report_type, stats_data)
+    return generate_csv_report(tickets, filters)
+
+
+class Command(BaseCommand):
+    help = (
+        'Hisobot generatorlarini (hisobot turi x format) turli hajmdagi ma\'lumotda o\'lchash: '
+        'vaqt, tracemalloc xotirasi, RSS, SQL soni, fayl hajmi; JSON baseline va --compare'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', default=DEFAULT_SIZES,
+                            help=f'Murojaatlar soni, vergul bilan (default: {DEFAULT_SIZES})')
+        parser.add_argument('--iterations', type=int, default=3)
+        parser.add_argument('--report-type', action='append', dest='report_types', choices=REPORT_TYPES)
+        parser.add_argument('--format', action='append', dest='formats', choices=FORMATS)
+        parser.add_argument('--output', help=f'Natijalar fayli (default: {DEFAULT_OUTPUT})')
+        parser.add_argument('--compare', metavar='BASELINE', help='Baseline fayl bilan solishtirish')
+        parser.add_argument('--threshold', type=float, default=0.2,
+                            help='Ruxsat etilgan sekinlashish (0.2 = +20%%)')
+        parser.add_argument('--min-delta-ms', type=float, default=20.0,
+                            help='Bundan kichik farq shovqin hisoblanadi')
+        parser.add_argument('--cliff', type=float, default=2.0,
+                            help='Vaqt hajmdan shuncha marta tez o\'ssa - ogohlantirish')
+
+    def handle(self, *args, **options):
+        if options['iterations'] < 1:
+            raise CommandError('--iterations kamida 1 bo\'lishi kerak')
+        try:
+            sizes = sorted({int(size) for size in options['sizes'].split(',') if size.strip()})
+        except ValueError:
+            raise CommandError(f"--sizes noto'g'ri: {options['sizes']}")
+        if not sizes or sizes[0] < 1:
+            raise CommandError('--sizes musbat sonlar bo\'lishi kerak')
+
+        self.options = options
+        baseline = load_baseline(options['compare']) if options['compare'] else None
+        datasets = self._datasets(sizes)
+        cases = [
+            (report_type, export_format)
+            for report_type in options['report_types'] or REPORT_TYPES
+            for export_format in options['formats'] or FORMATS
+            # CSV generator hisobot turidan qat'i nazar faqat ro'yxatni yozadi
+            if export_format != 'csv' or report_type == 'tickets'
+        ]
+
+        header = (
+            f"  {'Hisobot':24} {'Format':6} {'Hajm':>7} {'p50':>10} {'max':>10} "
+            f"{'SQL':>5} {'Xotira':>10} {'RSS+':>9} {'Fayl':>10}"
+        )
+        self.stdout.write(header)
+        self.stdout.write('  ' + '-' * (len(header) - 2))
+
+        results = {}
+        for report_type, export_format in cases:
+            previous = None
+            for size, tickets in datasets:
+                result = self._measure(export_format, report_type, tickets, warm_up=previous is None)
+                result.update(report_type=report_type, format=export_format, size=size)
+                results[f'{report_type}:{export_format}:{size}'] = result
+                self.stdout.write(
+                    f"  {report_type:24} {export_format:6} {size:>7} {result['p50_ms']:8.1f}ms "
+                    f"{result['max_ms']:8.1f}ms {result['queries']:5} {result['peak_kb']:8.0f}KB "
+                    f"{self._kb(result['rss_growth_kb']):>9} {result['bytes'] / 1024:8.0f}KB"
+                )
+                self._check_cliff(previous, result)
+                previous = result
+
+        meta = {
+            'iterations': options['iterations'],
+            'sizes': [size for size, _tickets in datasets],
+            'database': connection.vendor,
+            'django': django.get_version(),
+            'python': platform.python_version(),
+            'peak_rss_kb': peak_rss_kb(),
+        }
+
+        output = options['output'] or (None if baseline else DEFAULT_OUTPUT)
+        if output:
+            save_baseline(output, results, meta)
+            self.stdout.write(self.style.SUCCESS(f'\n✓ Natijalar yozildi: {output}'))
+
+        if baseline:
+            self._report_comparison(baseline, results)
+
+    def _datasets(self, sizes):
+        """
+        Har bir hajm uchun birinchi N ta murojaat (pk bo'yicha)
+
+        Kichik to'plam kattasining boshi - hajmlar orasidagi farq faqat
+        qatorlar soni. Yetmasa: python manage.py generate_load_dataset --tickets N
+        """
+        datasets = []
+        base = Ticket.objects.order_by('pk')
+        for size in sizes:
+            cutoff = base.values_list('pk', flat=True)[size - 1:size].first()
+            if cutoff is None:
+                self.stdout.write(self.style.WARNING(
+                    f'○ {size}: bazada yetarli murojaat yo\'q '
+                    f'(generate_load_dataset --tickets {size}), o\'tkazib yuborildi'
+                ))
+                continue
+            tickets = Ticket.objects.filter(pk__lte=cutoff).select_related('user', 'system', 'region', 'assigned_to')
+            datasets.append((size, tickets))
+
+        if not datasets:
+            raise CommandError('Hech bir hajm uchun ma\'lumot yetarli emas (generate_load_dataset ni ishga tushiring)')
+        return datasets
+
+    # ============================================
+    # O'LCHASH
+    # ============================================
+
+    def _run(self, export_format, report_type, tickets):
+        # Har safar yangi queryset - natija keshi qayta ishlatilmasin
+        response = build_report(export_format, report_type, tickets.all(), dict(EMPTY_FILTERS))
+        size = len(response.content)
+        response.close()
+        return response.status_code, size
+
+    def _measure(self, export_format, report_type, tickets, warm_up=False):
+        if warm_up:
+            # Qizdirish: shriftlar, importlar, shablonlar
+            self._run(export_format, report_type, tickets)
+
+        rss_peak_before = peak_rss_kb()
+        timings, query_counts = [], []
+        for _ in range(self.options['iterations']):
+            with count_queries() as counter:
+                start = time.perf_counter()
+                status, size = self._run(export_format, report_type, tickets)
+                timings.append(time.perf_counter() - start)
+            query_counts.append(counter.count)
+        rss_peak_after = peak_rss_kb()
+
+        # Xotira alohida o'lchanadi - tracemalloc vaqtni sezilarli sekinlashtiradi
+        tracemalloc.start()
+        try:
+            self._run(export_format, report_type, tickets)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+        return {
+            'status': status,
+            'bytes': size,
+            'queries': max(query_counts),
+            'peak_kb': round(peak / 1024, 1),
+            'rss_kb': current_rss_kb(),
+            'rss_growth_kb': (
+                rss_peak_after - rss_peak_before if rss_peak_before is not None else None
+            ),
+            **summarize(timings),
+        }
+
+    def _kb(self, value):
+        return '-' if value is None else f'{value:.0f}KB'
+
+    def _check_cliff(self, previous, result):
+        """Vaqt yoki xotira hajmdan --cliff marta tezroq o'ssa (masalan O(n^2))"""
+        if previous is None:
+            return
+        size_ratio = result['size'] / previous['size']
+        for metric in ('p50_ms', 'peak_kb'):
+            if previous[metric] <= 0:
+                continue
+            ratio = result[metric] / previous[metric]
+            if ratio > size_ratio * self.options['cliff']:
+                self.stdout.write(self.style.WARNING(
+                    f"    ○ {metric}: hajm x{size_ratio:.1f}, {metric} x{ratio:.1f} - nochiziqli o'sish"
+                ))
+
+    def _report_comparison(self, baseline, results):
+        old = baseline.get('results', {})
+        regressions = compare_results(
+            old, results,
+            threshold=self.options['threshold'],
+            min_delta_ms=self.options['min_delta_ms'],
+            metrics=('p50_ms',),
+        )
+
+        added = sorted(set(results) - set(old))
+        if added:
+            self.stdout.write(self.style.WARNING(f'\n○ Baseline da yo\'q (yangi): {len(added)}'))
+
+        if not regressions:
+            self.stdout.write(self.style.SUCCESS(f'\n✓ Regressiya yo\'q ({len(results)} ta o\'lchov)'))
+            return
+
+        self.stdout.write(self.style.ERROR(f'\n✗ Regressiyalar: {len(regressions)}'))
+        for key, metric, before, after in regressions:
+            self.stdout.write(f'  {key:50} {metric:8} {before} -> {after}')
+        raise CommandError(f'{len(regressions)} ta regressiya topildi')
@@ -0,0 +1,111 @@
+import statistics
+import time
+from contextlib import contextmanager
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.template.backends.django import Template as DjangoTemplate
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from accounts.models import User
+
+
+# Rol bo'yicha eng og'ir sahifalar
+PAGES_BY_ROLE = {
+    'superadmin': [
+        'tickets:superadmin_dashboard',
+        'tickets:superadmin_users_list',
+        'tickets:superadmin_audit_logs',
+        'tickets:admin_dashboard',
+        'reports:dashboard',
+    ],
+    'admin': ['tickets:admin_dashboard', 'tickets:users_list', 'reports:dashboard'],
+    'technician': ['tickets:technician_tickets', 'tickets:new_tickets_list'],
+    'user': ['tickets:dashboard', 'tickets:system_responsibles'],
+}
+
+
+@contextmanager
+def template_timer(durations):
+    """Yuqori darajadagi shablon render vaqtini o'lchash (context processorlar bilan)"""
+    original = DjangoTemplate.render
+
+    def timed_render(self, context=None, request=None):
+        start = time.perf_counter()
+        try:
+            return original(self, context, request)
+        finally:
+            durations.append(time.perf_counter() - start)
+
+    DjangoTemplate.render = timed_render
+    try:
+        yield
+    finally:
+        DjangoTemplate.render = original
+
+
+class Command(BaseCommand):
+    help = 'Shablon render vaqtini fragment keshsiz (cold) va kesh bilan (warm) solishtirish'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--username', help='Qaysi foydalanuvchi nomidan (default: birinchi superadmin)')
+        parser.add_argument('--iterations', type=int, default=20)
+        parser.add_argument('--url', action='append', dest='urls', help='Qo\'shimcha URL nomi yoki yo\'li')
+
+    def handle(self, *args, **options):
+        user = self._get_user(options['username'])
+        client = Client()
+        client.force_login(user)
+
+        pages = [reverse(name) for name in PAGES_BY_ROLE.get(user.role, [])]
+        for url in options['urls'] or []:
+            pages.append(url if url.startswith('/') else reverse(url))
+
+        self.stdout.write(f"Foydalanuvchi: {user.username} ({user.role}), takrorlar: {options['iterations']}\n")
+        header = f"{'Sahifa':45} {'Rejim':6} {'Render p50':>11} {'Jami p50':>10} {'SQL':>5}"
+        self.stdout.write(header)
+        self.stdout.write('-' * len(header))
+
+        for url in pages:
+            for mode in ('cold', 'warm'):
+                render_ms, total_ms, queries = self._measure(client, url, mode, options['iterations'])
+                self.stdout.write(
+                    f"{url:45} {mode:6} {render_ms:9.1f}ms {total_ms:8.1f}ms {queries:5}"
+                )
+
+    def _get_user(self, username):
+        users = User.objects.filter(is_active=True)
+        user = users.filter(username=username).first() if username else users.filter(role='superadmin').first()
+        if user is None:
+            raise CommandError('Foydalanuvchi topilmadi')
+        return user
+
+    def _measure(self, client, url, mode, iterations):
+        render_times, total_times, query_counts = [], [], []
+
+        # Warm rejimi uchun fragmentlarni oldindan keshga yozish
+        client.get(url)
+
+        for _ in range(iterations):
+            if mode == 'cold':
+                cache.clear()
+
+            durations = []
+            with template_timer(durations), CaptureQueriesContext(connection) as queries:
+                start = time.perf_counter()
+                response = client.get(url)
+                total_times.append(time.perf_counter() - start)
+
+            if response.status_code != 200:
+                raise CommandError(f'{url}: HTTP {response.status_code}')
+            render_times.append(sum(durations))
+            query_counts.append(len(queries))
+
+        return (
+            statistics.median(render_times) * 1000,
+            statistics.median(total_times) * 1000,
+            int(statistics.median(query_counts)),
+        )
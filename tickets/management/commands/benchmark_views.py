@@ -0,0 +1,338 @@
+import platform
+import time
+import tracemalloc
+from urllib.parse import urlencode
+
+import django
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import get_resolver, resolve, reverse
+
+from accounts.models import Department, Region, User
+from accounts.utils import filter_tickets_for_admin
+from systems.models import System, SystemResponsible
+from tickets.benchmarks import compare_results, load_baseline, save_baseline, summarize
+from tickets.models import Ticket
+from tickets.query_budget import get_view_budget
+
+
+ROLES = ('user', 'technician', 'viloyat_admin', 'respublika_admin', 'superadmin')
+NAMESPACES = ('tickets', 'reports', 'systems', 'notifications', 'api')
+DEFAULT_OUTPUT = 'benchmarks/views.json'
+
+# URL parametri -> namuna obyekti turi
+PARAM_OBJECTS = {
+    'system_id': 'system',
+    'user_id': 'user',
+    'dept_id': 'department',
+    'region_id': 'region',
+}
+# <pk> har bir namespace da boshqa model
+PK_OBJECTS = {
+    'tickets': 'ticket',
+    'systems': 'system',
+    'notifications': 'notification',
+    'api': 'ticket',
+}
+PK_OVERRIDES = {
+    'systems:responsible_edit': 'responsible',
+    'systems:responsible_delete': 'responsible',
+}
+
+# GET parametrlari bilan qo'shimcha variantlar
+QUERY_VARIANTS = {
+    'reports:generate': [
+        {'report_type': report_type}
+        for report_type in ('tickets', 'statistics', 'technician_performance',
+                            'system_analysis', 'regional_analysis')
+    ],
+    'tickets:superadmin_users_search_ajax': [{'q': 'a'}],
+    'tickets:api_users_search': [{'q': 'ali'}],
+    'systems:systems_search_ajax': [{'q': 'a'}],
+    'api:tickets': [{}, {'fields': 'id,status,user,description', 'limit': 200}],
+}
+
+
+class Command(BaseCommand):
+    help = (
+        'Barcha sahifalarni har bir rol nomidan chaqirib p50/p95 vaqt, SQL soni va '
+        'xotirani JSON baseline ga yozish; --compare bilan regressiyalarni aniqlash'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=20)
+        parser.add_argument('--role', action='append', dest='roles', choices=ROLES,
+                            help='Faqat shu rollar (bir necha marta berish mumkin)')
+        parser.add_argument('--user', action='append', dest='users', default=[], metavar='ROL=LOGIN',
+                            help='Rol uchun foydalanuvchini qo\'lda tanlash, masalan superadmin=admin')
+        parser.add_argument('--only', help='Faqat nomida shu matn bor URL lar (masalan superadmin)')
+        parser.add_argument('--cold', action='store_true',
+                            help='Har bir so\'rovdan oldin keshni tozalash')
+        parser.add_argument('--output', help=f'Natijalar fayli (default: {DEFAULT_OUTPUT})')
+        parser.add_argument('--compare', metavar='BASELINE', help='Baseline fayl bilan solishtirish')
+        parser.add_argument('--threshold', type=float, default=0.2,
+                            help='Ruxsat etilgan sekinlashish (0.2 = +20%%)')
+        parser.add_argument('--min-delta-ms', type=float, default=5.0,
+                            help='Bundan kichik farq shovqin hisoblanadi')
+        parser.add_argument('--check-budgets', action='store_true',
+                            help='@query_budget dan oshgan viewlar bo\'lsa xatolik bilan tugash (CI uchun)')
+
+    def handle(self, *args, **options):
+        if options['iterations'] < 1:
+            raise CommandError('--iterations kamida 1 bo\'lishi kerak')
+
+        self.options = options
+        baseline = load_baseline(options['compare']) if options['compare'] else None
+
+        users = self._role_users(options['roles'] or ROLES, options['users'])
+        results = {}
+        for role, user in users.items():
+            self.stdout.write(self.style.SUCCESS(f'\n✓ {role}: {user.username}'))
+            header = f"  {'Sahifa':60} {'HTTP':>4} {'p50':>9} {'p95':>9} {'SQL':>5} {'Xotira':>9}"
+            self.stdout.write(header)
+            self.stdout.write('  ' + '-' * (len(header) - 2))
+
+            client = Client(raise_request_exception=False)
+            client.force_login(user)
+            for key, url in self._url_cases(self._samples(role, user)):
+                result = self._measure(client, url)
+                result.update(role=role, url=url, budget=get_view_budget(resolve(url.split('?')[0]).func))
+                results[f'{role}:{key}'] = result
+                self.stdout.write(
+                    f"  {key:60} {result['status']:>4} {result['p50_ms']:7.1f}ms "
+                    f"{result['p95_ms']:7.1f}ms {result['queries']:5} {result['peak_kb']:7.0f}KB"
+                )
+
+        meta = {
+            'iterations': options['iterations'],
+            'cold': options['cold'],
+            'database': connection.vendor,
+            'django': django.get_version(),
+            'python': platform.python_version(),
+            'tickets': Ticket.objects.count(),
+            'users': {role: user.username for role, user in users.items()},
+        }
+
+        output = options['output'] or (None if baseline else DEFAULT_OUTPUT)
+        if output:
+            save_baseline(output, results, meta)
+            self.stdout.write(self.style.SUCCESS(f'\n✓ Natijalar yozildi: {output}'))
+
+        if options['check_budgets']:
+            self._check_budgets(results)
+
+        if baseline:
+            self._report_comparison(baseline, results)
+
+    # ============================================
+    # ROLLAR VA NAMUNA OBYEKTLAR
+    # ============================================
+
+    def _role_users(self, roles, overrides):
+        """Har bir rol uchun faol foydalanuvchi (ma'lumoti bor bo'lganlari afzal)"""
+        chosen = {}
+        for item in overrides:
+            role, _sep, username = item.partition('=')
+            if role not in ROLES or not username:
+                raise CommandError(f'--user noto\'g\'ri: {item} (kutilgan: ROL=LOGIN)')
+            try:
+                chosen[role] = User.objects.get(username=username, is_active=True)
+            except User.DoesNotExist:
+                raise CommandError(f'Foydalanuvchi topilmadi: {username}')
+
+        active = User.objects.filter(is_active=True).order_by('id')
+        admin_scopes = SystemResponsible.objects.filter(role_in_system='admin')
+        respublika_ids = admin_scopes.filter(region__isnull=True).values('user_id')
+
+        users = {}
+        for role in roles:
+            user = chosen.get(role)
+            if user is None and role == 'user':
+                user_id = (
+                    Ticket.objects.filter(user__role='user', user__is_active=True)
+                    .order_by('-id').values_list('user_id', flat=True).first()
+                )
+                user = active.filter(pk=user_id).first() or active.filter(role='user').first()
+            elif user is None and role == 'technician':
+                user_id = (
+                    Ticket.objects.filter(assigned_to__role='technician', assigned_to__is_active=True)
+                    .order_by('-id').values_list('assigned_to_id', flat=True).first()
+                )
+                user = active.filter(pk=user_id).first() or active.filter(role='technician').first()
+            elif user is None and role == 'viloyat_admin':
+                user = self._admin_with_tickets(
+                    active.filter(role='admin', id__in=admin_scopes.filter(region__isnull=False).values('user_id'))
+                    .exclude(id__in=respublika_ids)
+                )
+            elif user is None and role == 'respublika_admin':
+                user = self._admin_with_tickets(active.filter(role='admin', id__in=respublika_ids))
+            elif user is None and role == 'superadmin':
+                user = active.filter(role='superadmin').first()
+
+            if user is None:
+                self.stdout.write(self.style.WARNING(f'○ {role}: foydalanuvchi topilmadi, o\'tkazib yuborildi'))
+                continue
+            users[role] = user
+
+        if not users:
+            raise CommandError('Hech bir rol uchun foydalanuvchi topilmadi (generate_load_dataset ni ishga tushiring)')
+        return users
+
+    def _admin_with_tickets(self, admins, limit=20):
+        """Ticketlari ko'rinadigan birinchi admin (bo'lmasa - birinchisi)"""
+        candidates = list(admins[:limit])
+        for admin in candidates:
+            if filter_tickets_for_admin(Ticket.objects.all(), admin).exists():
+                return admin
+        return candidates[0] if candidates else None
+
+    def _samples(self, role, user):
+        """URL parametrlari uchun shu rol ko'ra oladigan obyektlar"""
+        if role == 'user':
+            tickets = Ticket.objects.filter(user=user)
+        elif role == 'technician':
+            tickets = Ticket.objects.filter(assigned_to=user)
+        else:
+            tickets = filter_tickets_for_admin(Ticket.objects.all(), user)
+
+        ticket = tickets.order_by('-id').values('id', 'system_id').first()
+        system_id = ticket['system_id'] if ticket else System.objects.values_list('id', flat=True).first()
+
+        return {
+            'ticket': ticket and ticket['id'],
+            'system': system_id,
+            'responsible': (
+                SystemResponsible.objects.filter(system_id=system_id).values_list('id', flat=True).first()
+            ),
+            'notification': user.notifications.order_by('-id').values_list('id', flat=True).first(),
+            'user': (
+                User.objects.filter(role='user').exclude(pk=user.pk)
+                .order_by('-id').values_list('id', flat=True).first()
+            ),
+            'department': Department.objects.values_list('id', flat=True).first(),
+            'region': Region.objects.values_list('id', flat=True).first(),
+        }
+
+    def _url_cases(self, samples):
+        """(kalit, URL) - NAMESPACES dagi barcha URL lar, parametrlar namunalar bilan"""
+        namespaces = get_resolver().namespace_dict
+        for namespace in NAMESPACES:
+            _prefix, resolver = namespaces[namespace]
+            for pattern in resolver.url_patterns:
+                name = f'{namespace}:{pattern.name}'
+                if self.options['only'] and self.options['only'] not in name:
+                    continue
+
+                kwargs = {}
+                for param in pattern.pattern.converters:
+                    if param == 'pk':
+                        kind = PK_OVERRIDES.get(name, PK_OBJECTS[namespace])
+                    else:
+                        kind = PARAM_OBJECTS[param]
+                    kwargs[param] = samples.get(kind)
+
+                if None in kwargs.values():
+                    self.stdout.write(self.style.WARNING(f'  ○ {name}: namuna obyekt yo\'q'))
+                    continue
+
+                url = reverse(name, kwargs=kwargs)
+                for query in QUERY_VARIANTS.get(name, [{}]):
+                    if query:
+                        yield f'{name}?{urlencode(query)}', f'{url}?{urlencode(query)}'
+                    else:
+                        yield name, url
+
+    # ============================================
+    # O'LCHASH
+    # ============================================
+
+    def _request(self, client, url):
+        """
+        So'rov tranzaksiya ichida va oxirida rollback
+
+        Ba'zi sahifalar GET da ham ma'lumot o'zgartiradi (take, toggle, mark-as-read) -
+        rollback tufayli har bir takror bir xil holatdan boshlanadi va baza buzilmaydi.
+        Streaming javoblar ham shu yerda o'qiladi (generatorlar so'rovni kechiktiradi).
+        """
+        with transaction.atomic():
+            response = client.get(url)
+            if response.streaming:
+                size = sum(len(chunk) for chunk in response.streaming_content)
+            else:
+                size = len(response.content)
+            response.close()
+            transaction.set_rollback(True)
+        return response.status_code, size
+
+    def _measure(self, client, url):
+        # Qizdirish: shablon va fragment keshlari
+        self._request(client, url)
+
+        timings, query_counts = [], []
+        for _ in range(self.options['iterations']):
+            if self.options['cold']:
+                cache.clear()
+            with CaptureQueriesContext(connection) as queries:
+                start = time.perf_counter()
+                status, size = self._request(client, url)
+                timings.append(time.perf_counter() - start)
+            query_counts.append(len(queries))
+
+        # Xotira alohida o'lchanadi - tracemalloc vaqtni sezilarli sekinlashtiradi
+        tracemalloc.start()
+        try:
+            self._request(client, url)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+        return {
+            'status': status,
+            'bytes': size,
+            'queries': max(query_counts),
+            'peak_kb': round(peak / 1024, 1),
+            **summarize(timings),
+        }
+
+    def _check_budgets(self, results):
+        over = [
+            (key, result['queries'], result['budget'])
+            for key, result in sorted(results.items())
+            if result['budget'] is not None and result['queries'] > result['budget']
+        ]
+        if not over:
+            budgeted = sum(1 for result in results.values() if result['budget'] is not None)
+            self.stdout.write(self.style.SUCCESS(f'\n✓ SQL byudjetlari: {budgeted} ta sahifa byudjet ichida'))
+            return
+
+        self.stdout.write(self.style.ERROR(f'\n✗ SQL byudjetidan oshgan: {len(over)}'))
+        for key, queries, budget in over:
+            self.stdout.write(f'  {key:70} {queries} > {budget}')
+        raise CommandError(f'{len(over)} ta sahifa SQL byudjetidan oshdi')
+
+    def _report_comparison(self, baseline, results):
+        old = baseline.get('results', {})
+        regressions = compare_results(
+            old, results,
+            threshold=self.options['threshold'],
+            min_delta_ms=self.options['min_delta_ms'],
+        )
+
+        missing = sorted(set(old) - set(results))
+        added = sorted(set(results) - set(old))
+        if added:
+            self.stdout.write(self.style.WARNING(f'\n○ Baseline da yo\'q (yangi): {len(added)}'))
+        if missing and not (self.options['only'] or self.options['roles']):
+            self.stdout.write(self.style.WARNING(f'○ Baseline da bor, hozir o\'lchanmadi: {len(missing)}'))
+
+        if not regressions:
+            self.stdout.write(self.style.SUCCESS(f'\n✓ Regressiya yo\'q ({len(results)} ta sahifa)'))
+            return
+
+        self.stdout.write(self.style.ERROR(f'\n✗ Regressiyalar: {len(regressions)}'))
+        for key, metric, before, after in regressions:
+            self.stdout.write(f'  {key:70} {metric:8} {before} -> {after}')
+        raise CommandError(f'{len(regressions)} ta regressiya topildi')
@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+
+from tickets.storage import collect_garbage
+
+
+class Command(BaseCommand):
+    help = 'Biriktirma bloklari havolalarini qayta hisoblash va ishlatilmayotgan bloklarni o\'chirish'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--grace-hours',
+            type=int,
+            default=24,
+            help='Shu vaqtdan yangi bloklarga tegilmaydi (yuklanayotgan fayllar uchun)',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Faqat hisobot - hech narsa o\'chirilmaydi',
+        )
+
+    def handle(self, *args, **options):
+        stats = collect_garbage(
+            grace_hours=options['grace_hours'],
+            dry_run=options['dry_run'],
+        )
+        prefix = '○' if options['dry_run'] else '✓'
+        style = self.style.WARNING if options['dry_run'] else self.style.SUCCESS
+
+        self.stdout.write(style(f"{prefix} Qayta hisoblangan: {stats['recounted']}"))
+        self.stdout.write(style(f"{prefix} O'chirilgan bloklar: {stats['deleted']}"))
+        self.stdout.write(style(f"{prefix} Yetim fayllar: {stats['orphan_files']}"))
+        self.stdout.write(style(f"{prefix} Bo'shatilgan joy: {stats['freed_bytes'] / 1024 / 1024:.1f} MB"))
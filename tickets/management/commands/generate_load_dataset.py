@@ -0,0 +1,482 @@
+import math
+import random
+import time
+from datetime import timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.core.management.color import no_style
+from django.db import connection, models, transaction
+from django.utils import timezone
+
+from accounts.models import Department, Region, User
+from accounts.search import build_search_name
+from notifications.models import Notification
+from systems.models import System, SystemResponsible
+from tickets.models import (
+    ArchivedTicket, Ticket, TicketHistory, TicketMessage, queue_key, resolution_seconds,
+)
+
+
+REGION_NAMES = [
+    'Toshkent shahri', 'Toshkent viloyati', 'Andijon', 'Buxoro', 'Farg\'ona',
+    'Jizzax', 'Xorazm', 'Namangan', 'Navoiy', 'Qashqadaryo', 'Qoraqalpog\'iston',
+    'Samarqand', 'Sirdaryo', 'Surxondaryo',
+]
+SYSTEM_NAMES = [
+    'Qalqon', '112', 'E-Material', 'E-Jinoyat', 'Yo\'l harakati', 'Migratsiya',
+    'Pasport', 'Ruxsatnoma', 'Kadrlar', 'Moliya', 'Arxiv', 'E-Hujjat',
+]
+LAST_NAMES = [
+    'Karimov', 'Rahimov', 'Toshmatov', 'Yusupov', 'Aliyev', 'Qodirov', 'Saidov',
+    'Ergashev', 'Nazarov', 'Umarov', 'Xolmatov', 'Abdullayev', 'Mirzayev', 'Sobirov',
+]
+FIRST_NAMES = [
+    'Alisher', 'Bobur', 'Dilshod', 'Jasur', 'Sherzod', 'Aziz', 'Otabek', 'Sardor',
+    'Nodira', 'Dilnoza', 'Malika', 'Gulnora', 'Kamola', 'Shahnoza', 'Javohir', 'Umid',
+]
+MIDDLE_NAMES = ['Akmalovich', 'Bahodirovich', 'Rustamovich', 'Anvarovna', 'Shavkatovna', '']
+PROBLEMS = [
+    'Tizimga kira olmayapman, parol xato deb chiqmoqda.',
+    'Ma\'lumotlarni saqlashda xatolik chiqmoqda.',
+    'Hisobot shakllanmayapti, sahifa uzoq yuklanmoqda.',
+    'Printerga chiqarishda muammo bor.',
+    'Yangi xodimga ruxsat berish kerak.',
+    'Qidiruv natija bermayapti.',
+    'Sahifa ochilmayapti, 500 xatolik.',
+    'Fayl yuklab bo\'lmayapti.',
+]
+REPLIES = [
+    'Murojaatingiz qabul qilindi, tekshirmoqdamiz.',
+    'Iltimos, xatolik skrinshotini yuboring.',
+    'Muammo bartaraf etildi, tekshirib ko\'ring.',
+    'Rahmat, hozir ishlayapti.',
+    'Hali ham xuddi shu xatolik chiqmoqda.',
+    'Parol tiklandi, qayta kiring.',
+]
+
+# Taqsimotlar (qiymat, og'irlik)
+STATUS_WEIGHTS = [
+    ('resolved', 62), ('pending_approval', 7), ('in_progress', 11),
+    ('new', 7), ('rejected', 8), ('reopened', 5),
+]
+FRESH_STATUS_WEIGHTS = [('new', 45), ('in_progress', 35), ('pending_approval', 15), ('resolved', 5)]
+PRIORITY_WEIGHTS = [('low', 50), ('medium', 35), ('high', 15)]
+RATING_WEIGHTS = [(5, 55), (4, 25), (3, 10), (2, 5), (1, 5)]
+ASSIGNMENT_WEIGHTS = [('auto', 50), ('self', 35), ('admin', 15)]
+# Ish soatlari (9-18) da ko'proq murojaat
+HOUR_WEIGHTS = [1, 1, 1, 1, 1, 2, 4, 8, 14, 18, 18, 16, 10, 14, 16, 15, 12, 8, 5, 3, 2, 2, 1, 1]
+# Yechish vaqti (soat) - lognormal, medianasi ~6 soat
+RESOLUTION_MU = math.log(6)
+RESOLUTION_SIGMA = 1.3
+PRIORITY_SPEED = {'high': 0.4, 'medium': 1.0, 'low': 1.6}
+
+
+def _weighted(rng, pairs):
+    values, weights = zip(*pairs)
+    return rng.choices(values, weights)[0]
+
+
+class BulkInserter:
+    """
+    Katta jadvallar uchun to'g'ridan-to'g'ri executemany INSERT
+
+    bulk_create har bir qiymat uchun Field.pre_save / get_db_prep_save
+    chaqiradi - millionlab qatorda bu generatsiyaning asosiy vaqtini oladi.
+    Bu yerda qiymatlar tayyor holda beriladi, faqat sanalar backend
+    formatiga o'tkaziladi. auto_now / auto_now_add chetlab o'tiladi -
+    o'tmishdagi sanalar saqlanadi.
+
+    Berilmagan ustunlar maydonning default qiymatini oladi.
+    """
+
+    def __init__(self, model, batch_size, include_pk=False):
+        self.model = model
+        self.batch_size = batch_size
+        fields = [
+            field for field in model._meta.concrete_fields
+            if include_pk or not field.primary_key
+        ]
+        self.columns = [field.attname for field in fields]
+        self.defaults = [field.get_default() if field.has_default() else (None if field.null else '')
+                         for field in fields]
+        self.datetime_indexes = [
+            index for index, field in enumerate(fields) if isinstance(field, models.DateTimeField)
+        ]
+        quote = connection.ops.quote_name
+        self.sql = 'INSERT INTO {} ({}) VALUES ({})'.format(
+            quote(model._meta.db_table),
+            ', '.join(quote(field.column) for field in fields),
+            ', '.join(['%s'] * len(fields)),
+        )
+        self.rows = []
+        self.total = 0
+
+    def add(self, **values):
+        row = [values.get(column, default) for column, default in zip(self.columns, self.defaults)]
+        adapt = connection.ops.adapt_datetimefield_value
+        for index in self.datetime_indexes:
+            if row[index] is not None:
+                row[index] = adapt(row[index])
+        self.rows.append(row)
+        if len(self.rows) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if self.rows:
+            with connection.cursor() as cursor:
+                cursor.executemany(self.sql, self.rows)
+            self.total += len(self.rows)
+            self.rows = []
+
+
+class Command(BaseCommand):
+    help = 'Yuklama testi uchun katta sintetik ma\'lumotlar bazasini yaratish (bulk_create)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--regions', type=int, default=14)
+        parser.add_argument('--departments-per-region', type=int, default=5)
+        parser.add_argument('--systems', type=int, default=12)
+        parser.add_argument('--technicians-per-region', type=int, default=2,
+                            help='Har bir tizim va viloyat uchun texniklar soni')
+        parser.add_argument('--superadmins', type=int, default=1,
+                            help='Superadminlar soni (benchmark_views/benchmark_templates ular nomidan ishlaydi)')
+        parser.add_argument('--users', type=int, default=5000)
+        parser.add_argument('--tickets', type=int, default=100000)
+        parser.add_argument('--messages-per-ticket', type=float, default=2.0,
+                            help='O\'rtacha chat xabarlari soni (geometrik taqsimot)')
+        parser.add_argument('--days', type=int, default=365, help='Murojaatlar qancha kunga tarqatiladi')
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--prefix', default='load', help='Yaratilgan foydalanuvchilar login prefiksi')
+        parser.add_argument('--password', default='load12345')
+
+    def handle(self, *args, **options):
+        self.rng = random.Random(options['seed'])
+        self.options = options
+        self.batch_size = options['batch_size']
+        self.now = timezone.now()
+        started = time.monotonic()
+
+        regions = self._create_regions(options['regions'])
+        departments = self._create_departments(regions, options['departments_per_region'])
+        systems = self._create_systems(options['systems'])
+        self._create_staff(systems, regions)
+        self._create_users(options['users'], regions, departments)
+
+        self._create_tickets(options['tickets'], systems, regions)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'\n✓ Tayyor: {time.monotonic() - started:.1f} s'
+        ))
+
+    # ============================================
+    # SPRAVOCHNIKLAR
+    # ============================================
+
+    def _create_regions(self, count):
+        names = REGION_NAMES[:count] + [f'Hudud {i}' for i in range(len(REGION_NAMES) + 1, count + 1)]
+        codes = [f'LD{i:02d}' for i in range(1, count + 1)]
+        Region.objects.bulk_create(
+            [Region(name=name, code=code) for name, code in zip(names, codes)],
+            ignore_conflicts=True,
+        )
+        regions = list(Region.objects.filter(code__in=codes))
+        self.stdout.write(self.style.SUCCESS(f'✓ Viloyatlar: {len(regions)}'))
+        return regions
+
+    def _create_departments(self, regions, per_region):
+        existing = set(Department.objects.filter(region__in=regions).values_list('region_id', 'name'))
+        new = [
+            Department(region=region, name=f'{region.name} {i}-bo\'lim')
+            for region in regions
+            for i in range(1, per_region + 1)
+            if (region.id, f'{region.name} {i}-bo\'lim') not in existing
+        ]
+        Department.objects.bulk_create(new, batch_size=self.batch_size)
+        departments = {}
+        for department in Department.objects.filter(region__in=regions):
+            departments.setdefault(department.region_id, []).append(department)
+        self.stdout.write(self.style.SUCCESS(f'✓ Bo\'limlar: {sum(map(len, departments.values()))}'))
+        return departments
+
+    def _create_systems(self, count):
+        names = SYSTEM_NAMES[:count] + [f'Tizim {i}' for i in range(len(SYSTEM_NAMES) + 1, count + 1)]
+        System.objects.bulk_create([System(name=name) for name in names], ignore_conflicts=True)
+        systems = list(System.objects.filter(name__in=names))
+        self.stdout.write(self.style.SUCCESS(f'✓ Tizimlar: {len(systems)}'))
+        return systems
+
+    # ============================================
+    # FOYDALANUVCHILAR
+    # ============================================
+
+    def _new_users(self, role, count, regions, departments=None):
+        """Foydalanuvchilarni bulk_create bilan yaratish (search_name qo'lda to'ldiriladi)"""
+        prefix = f"{self.options['prefix']}_{role}"
+        offset = User.objects.filter(username__startswith=f'{prefix}_').count()
+        password = self.password_hash
+        rng = self.rng
+
+        users = []
+        for i in range(offset, offset + count):
+            region = regions[i % len(regions)] if regions else None
+            department = rng.choice(departments.get(region.id, [None])) if departments and region else None
+            user = User(
+                username=f'{prefix}_{i}',
+                password=password,
+                role=role,
+                last_name=rng.choice(LAST_NAMES),
+                first_name=rng.choice(FIRST_NAMES),
+                middle_name=rng.choice(MIDDLE_NAMES),
+                region=region,
+                department=department,
+                position='Inspektor',
+                phone=f'+99890{rng.randrange(10**7):07d}',
+            )
+            user.search_name = build_search_name(user)
+            users.append(user)
+        return User.objects.bulk_create(users, batch_size=self.batch_size)
+
+    @property
+    def password_hash(self):
+        # Har bir foydalanuvchi uchun alohida hash hisoblash juda sekin - bitta hash
+        if not hasattr(self, '_password_hash'):
+            self._password_hash = make_password(self.options['password'])
+        return self._password_hash
+
+    def _create_staff(self, systems, regions):
+        """Superadmin; har bir tizimga: respublika admini, asosiy texnik va viloyat texniklari; har viloyatga admin"""
+        per_region = self.options['technicians_per_region']
+        superadmins = self._new_users('superadmin', self.options['superadmins'], [])
+        admins = self._new_users('admin', len(systems), [])
+        regional_admins = self._new_users('admin', len(regions), regions)
+        default_techs = self._new_users('technician', len(systems), [])
+        regional_techs = self._new_users('technician', len(systems) * len(regions) * per_region, regions)
+
+        responsibles = []
+        self.technicians = {}
+        self.system_admins = {}
+        tech_iter = iter(regional_techs)
+        for system, admin, default_tech in zip(systems, admins, default_techs):
+            responsibles.append(SystemResponsible(system=system, user=admin, role_in_system='admin'))
+            responsibles.append(SystemResponsible(
+                system=system, user=default_tech, role_in_system='technician', is_default=True,
+            ))
+            self.technicians[(system.id, None)] = [default_tech.id]
+            for region in regions:
+                techs = [next(tech_iter) for _ in range(per_region)]
+                for tech in techs:
+                    responsibles.append(SystemResponsible(
+                        system=system, user=tech, role_in_system='technician', region=region,
+                    ))
+                self.technicians[(system.id, region.id)] = [tech.id for tech in techs]
+            self.system_admins[system.id] = admin.id
+
+        # Viloyat admini - o'z viloyatidagi barcha tizimlar
+        for admin in regional_admins:
+            for system in systems:
+                responsibles.append(SystemResponsible(
+                    system=system, user=admin, role_in_system='admin', region_id=admin.region_id,
+                ))
+
+        SystemResponsible.objects.bulk_create(responsibles, batch_size=self.batch_size, ignore_conflicts=True)
+        self.stdout.write(self.style.SUCCESS(
+            f'✓ Mas\'ullar: {len(superadmins)} superadmin, {len(admins) + len(regional_admins)} admin, '
+            f'{len(default_techs) + len(regional_techs)} texnik'
+        ))
+
+    def _create_users(self, count, regions, departments):
+        self.user_ids = {}
+        created = 0
+        while created < count:
+            chunk = min(self.batch_size, count - created)
+            for user in self._new_users('user', chunk, regions, departments):
+                self.user_ids.setdefault(user.region_id, []).append(user.id)
+            created += chunk
+        self.stdout.write(self.style.SUCCESS(f'✓ Foydalanuvchilar: {created}'))
+
+    # ============================================
+    # MUROJAATLAR
+    # ============================================
+
+    def _random_created_at(self):
+        """Oxirgi N kun ichida; dam olish kunlari kamroq, ish soatlarida ko'proq"""
+        rng = self.rng
+        while True:
+            day = self.now - timedelta(days=rng.randrange(self.options['days']))
+            if day.weekday() < 5 or rng.random() < 0.3:
+                break
+        hour = rng.choices(range(24), HOUR_WEIGHTS)[0]
+        created = day.replace(hour=hour, minute=rng.randrange(60), second=rng.randrange(60))
+        return min(created, self.now - timedelta(minutes=1))
+
+    def _create_tickets(self, count, systems, regions):
+        """
+        Murojaatlar, xabarlar, tarix va bildirishnomalar
+
+        Ticket id lari oldindan ajratiladi (bog'liq qatorlar uchun RETURNING
+        kerak emas), oxirida PostgreSQL sequence lari to'g'rilanadi.
+        """
+        regions = [region for region in regions if self.user_ids.get(region.id)]
+        inserters = {
+            'tickets': BulkInserter(Ticket, self.batch_size, include_pk=True),
+            'messages': BulkInserter(TicketMessage, self.batch_size),
+            'history': BulkInserter(TicketHistory, self.batch_size),
+            'notifications': BulkInserter(Notification, self.batch_size),
+        }
+        next_id = max(
+            Ticket.objects.aggregate(value=models.Max('id'))['value'] or 0,
+            ArchivedTicket.objects.aggregate(value=models.Max('id'))['value'] or 0,
+        ) + 1
+        started = time.monotonic()
+
+        created = 0
+        while created < count:
+            chunk = min(self.batch_size, count - created)
+            with transaction.atomic():
+                for ticket_id in range(next_id + created, next_id + created + chunk):
+                    ticket = self._plan_ticket(ticket_id, systems, regions)
+                    # Faoliyat avval - first_response_at birinchi xabardan olinadi
+                    self._plan_activity(ticket, inserters)
+                    inserters['tickets'].add(**ticket)
+                for inserter in inserters.values():
+                    inserter.flush()
+
+            created += chunk
+            rate = created / max(time.monotonic() - started, 0.001)
+            self.stdout.write(f'  ... {created}/{count} murojaat ({rate:.0f}/s)')
+
+        with connection.cursor() as cursor:
+            for sql in connection.ops.sequence_reset_sql(no_style(), [Ticket]):
+                cursor.execute(sql)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"✓ Murojaatlar: {inserters['tickets'].total}, xabarlar: {inserters['messages'].total}, "
+            f"tarix: {inserters['history'].total}, bildirishnomalar: {inserters['notifications'].total}"
+        ))
+
+    def _plan_ticket(self, ticket_id, systems, regions):
+        rng = self.rng
+        system = rng.choice(systems)
+        region = rng.choice(regions)
+        created_at = self._random_created_at()
+        age_hours = (self.now - created_at).total_seconds() / 3600
+
+        status = _weighted(rng, FRESH_STATUS_WEIGHTS if age_hours < 24 else STATUS_WEIGHTS)
+        priority = _weighted(rng, PRIORITY_WEIGHTS)
+
+        assigned_to_id = None
+        assigned_at = None
+        if status != 'new':
+            techs = self.technicians.get((system.id, region.id)) or self.technicians[(system.id, None)]
+            assigned_to_id = rng.choice(techs)
+            # Biriktirish - o'rtacha 40 daqiqada (hozirgi vaqtdan oshmaydi)
+            assigned_at = created_at + timedelta(minutes=min(rng.expovariate(1 / 40), age_hours * 30))
+
+        solved_at = None
+        if status in ('resolved', 'pending_approval', 'rejected', 'reopened'):
+            hours = rng.lognormvariate(RESOLUTION_MU, RESOLUTION_SIGMA) * PRIORITY_SPEED[priority]
+            solved_at = min(assigned_at + timedelta(hours=hours), self.now)
+
+        rating = None
+        if status == 'resolved' and rng.random() < 0.7:
+            rating = _weighted(rng, RATING_WEIGHTS)
+        resolved_at = solved_at if status != 'reopened' else None
+
+        return {
+            'id': ticket_id,
+            'user_id': rng.choice(self.user_ids[region.id]),
+            'system_id': system.id,
+            'region_id': region.id,
+            'priority': priority,
+            'status': status,
+            'description': rng.choice(PROBLEMS),
+            'assigned_to_id': assigned_to_id,
+            'assignment_type': _weighted(rng, ASSIGNMENT_WEIGHTS) if assigned_to_id else 'auto',
+            'rating': rating,
+            'created_at': created_at,
+            'updated_at': solved_at or assigned_at or created_at,
+            'resolved_at': resolved_at,
+            # SLA ustunlari (first_response_at - _plan_activity da)
+            'first_assigned_at': assigned_at,
+            'first_response_at': None,
+            'resolution_seconds': resolution_seconds(status, created_at, resolved_at),
+            'queue_key': queue_key(priority, created_at),
+            # Faqat rejalashtirish uchun (jadvalda ustun yo'q)
+            'assigned_at': assigned_at,
+            'solved_at': solved_at,
+        }
+
+    def _plan_activity(self, ticket, inserters):
+        """Chat xabarlari, tarix va bildirishnomalar (vaqt bo'yicha izchil)"""
+        rng = self.rng
+        history = inserters['history'].add
+        notify = inserters['notifications'].add
+        ticket_id = ticket['id']
+        user_id = ticket['user_id']
+        tech_id = ticket['assigned_to_id']
+        assigned_at = ticket['assigned_at']
+        solved_at = ticket['solved_at']
+        url = f'/tickets/{ticket_id}/'
+        read_before = self.now - timedelta(days=7)
+
+        history(ticket_id=ticket_id, changed_by_id=user_id, action_type='created',
+                new_value='new', timestamp=ticket['created_at'])
+        notify(user_id=tech_id or self.system_admins[ticket['system_id']], notification_type='new_ticket',
+               title='Yangi murojaat', text=ticket['description'], url=url,
+               is_read=ticket['created_at'] < read_before, created_at=ticket['created_at'])
+
+        if tech_id:
+            history(ticket_id=ticket_id, changed_by_id=tech_id, action_type='assigned',
+                    new_value=str(tech_id), timestamp=assigned_at)
+            history(ticket_id=ticket_id, changed_by_id=tech_id, action_type='status_changed',
+                    old_value='new', new_value='in_progress', timestamp=assigned_at)
+
+            # Xabarlar soni - geometrik taqsimot
+            mean = self.options['messages_per_ticket']
+            count = int(rng.expovariate(1 / mean)) if mean > 0 else 0
+            span = ((solved_at or self.now) - assigned_at).total_seconds()
+            times = sorted(assigned_at + timedelta(seconds=rng.random() * span) for _ in range(count))
+            # Juft xabarlar texnikdan - birinchisi javob hisoblanadi
+            ticket['first_response_at'] = times[0] if times else None
+            # O'qilmagan xabar bildirishnomalari qabul qiluvchi bo'yicha bitta qatorga
+            # birlashadi (Notification.objects.coalesce kabi)
+            unread = {}
+            for i, sent_at in enumerate(times):
+                from_tech = i % 2 == 0
+                text = rng.choice(REPLIES)
+                recipient_id = user_id if from_tech else tech_id
+                inserters['messages'].add(ticket_id=ticket_id, sender_id=tech_id if from_tech else user_id,
+                                          message=text, created_at=sent_at)
+                if sent_at < read_before:
+                    notify(user_id=recipient_id, notification_type='new_message',
+                           title='Yangi xabar', text=text, url=url, is_read=True, created_at=sent_at)
+                elif recipient_id in unread:
+                    unread[recipient_id].update(text=text, created_at=sent_at,
+                                                count=unread[recipient_id]['count'] + 1)
+                else:
+                    unread[recipient_id] = dict(user_id=recipient_id, notification_type='new_message',
+                                                title='Yangi xabar', text=text, url=url, is_read=False,
+                                                created_at=sent_at, count=1)
+            for values in unread.values():
+                notify(**values)
+
+        if solved_at:
+            final_status = 'rejected' if ticket['status'] == 'rejected' else 'pending_approval'
+            history(ticket_id=ticket_id, changed_by_id=tech_id, action_type='status_changed',
+                    old_value='in_progress', new_value=final_status, timestamp=solved_at)
+            notify(user_id=user_id, notification_type='status_changed', title='Holat o\'zgartirildi',
+                   text=final_status, url=url, is_read=solved_at < read_before, created_at=solved_at)
+
+        if solved_at and ticket['status'] in ('resolved', 'reopened'):
+            closed_at = min(solved_at + timedelta(hours=rng.expovariate(1 / 12)), self.now)
+            if ticket['status'] == 'resolved':
+                history(ticket_id=ticket_id, changed_by_id=user_id, action_type='status_changed',
+                        old_value='pending_approval', new_value='resolved', timestamp=closed_at)
+                if ticket['rating']:
+                    history(ticket_id=ticket_id, changed_by_id=user_id, action_type='rated',
+                            new_value=str(ticket['rating']), timestamp=closed_at)
+            else:
+                history(ticket_id=ticket_id, changed_by_id=user_id, action_type='reopened',
+                        old_value='pending_approval', new_value='reopened', timestamp=closed_at)
@@ -0,0 +1,58 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from tickets.previews import claim_pending, enqueue_missing, render_preview
+
+
+class Command(BaseCommand):
+    help = 'Rasm va PDF biriktirmalar uchun preview yaratish (navbat worker)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--scan',
+            action='store_true',
+            help='Avval preview yozuvi yo\'q eski biriktirmalarni navbatga qo\'shish',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=50,
+            help='Bir marta olinadigan yozuvlar soni',
+        )
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='To\'xtovsiz ishlash (navbat bo\'sh bo\'lsa kutish)',
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=5.0,
+            help='--loop rejimida navbat bo\'sh bo\'lganda kutish (soniya)',
+        )
+
+    def handle(self, *args, **options):
+        if options['scan']:
+            added = enqueue_missing()
+            self.stdout.write(self.style.SUCCESS(f'✓ Navbatga qo\'shildi: {added}'))
+
+        totals = {}
+        while True:
+            items = claim_pending(options['batch_size'])
+            for item in items:
+                status = render_preview(item)
+                totals[status] = totals.get(status, 0) + 1
+                if status == 'ready':
+                    self.stdout.write(self.style.SUCCESS(f'✓ {item.source}'))
+                else:
+                    self.stdout.write(self.style.WARNING(f'○ {item.source}: {status}'))
+
+            if items:
+                continue
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
+
+        summary = ', '.join(f'{status}: {count}' for status, count in sorted(totals.items())) or '0'
+        self.stdout.write(self.style.SUCCESS(f'\nJami: {summary}'))
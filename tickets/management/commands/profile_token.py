@@ -0,0 +1,24 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from tickets.profiling import PROFILE_HEADER, make_profile_token
+
+
+class Command(BaseCommand):
+    help = 'So\'rovni cProfile bilan profillash uchun imzolangan X-Profile-Token yaratish'
+
+    def handle(self, *args, **options):
+        if not getattr(settings, 'REQUEST_PROFILING_ENABLED', False):
+            self.stdout.write(self.style.WARNING(
+                '○ REQUEST_PROFILING o\'chiq - token serverda qabul qilinmaydi (REQUEST_PROFILING=1)'
+            ))
+
+        token = make_profile_token()
+        max_age = getattr(settings, 'REQUEST_PROFILING_TOKEN_MAX_AGE', 3600)
+        self.stdout.write(self.style.SUCCESS(f'✓ Token ({max_age} soniya amal qiladi):'))
+        self.stdout.write(token)
+        self.stdout.write(f"\ncurl -H '{PROFILE_HEADER}: {token}' -b 'sessionid=...' https://.../tickets/")
+        self.stdout.write(
+            f'Natija: {settings.REQUEST_PROFILING_DIR}/<X-Profile-File> '
+            '(python -m pstats yoki snakeviz bilan ochiladi)'
+        )
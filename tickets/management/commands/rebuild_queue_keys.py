@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from tickets.queue import rebuild_queue_keys
+
+
+class Command(BaseCommand):
+    help = (
+        'Murojaatlarning navbat kalitini (queue_key) TICKET_QUEUE_PRIORITY_BOOST_HOURS '
+        'bo\'yicha qayta hisoblash - sozlama o\'zgargandan keyin'
+    )
+
+    def handle(self, *args, **options):
+        updated = rebuild_queue_keys()
+        self.stdout.write(self.style.SUCCESS(f"✓ Navbat kaliti yangilandi: {updated} ta murojaat"))
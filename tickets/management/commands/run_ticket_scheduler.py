@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from tickets.scheduler import DEFAULT_BATCH_SIZE, run_scheduler
+
+
+class Command(BaseCommand):
+    help = (
+        'Baholanmagan murojaatlarni avtomatik yopish, biriktirilmaganlarni adminlarga '
+        'eskalatsiya qilish va eslatmalar yuborish (davriy ishga tushiriladi)'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help='Bitta tranzaksiyadagi murojaatlar soni',
+        )
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size kamida 1 bo\'lishi kerak')
+
+        stats = run_scheduler(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f"✓ Avtomatik yopildi: {stats['auto_resolved']}"))
+        self.stdout.write(self.style.SUCCESS(f"✓ Eskalatsiya qilindi: {stats['escalated']}"))
+        self.stdout.write(self.style.SUCCESS(f"✓ Eslatma yuborildi: {stats['reminded']}"))
@@ -0,0 +1,226 @@
+# tickets/media.py - MEDIA FAYLLARNI BERISH (X-Accel-Redirect / X-Sendfile / FileResponse)
+
+import mimetypes
+import os
+import posixpath
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, Http404, HttpResponse
+from django.utils._os import safe_join
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+from .previews import PREVIEW_PREFIX
+from .storage import BLOB_PREFIX
+
+
+# Ochiq (faqat login talab qilinadi) kataloglar
+PUBLIC_MEDIA_PREFIXES = ('avatars/',)
+
+# Ticket fayllari - ruxsat ticket bo'yicha tekshiriladi
+TICKET_MEDIA_PREFIXES = ('tickets/attachments/', 'tickets/chat_attachments/', BLOB_PREFIX)
+
+# O'zgarmas (kontent xeshi nomli) fayllar
+IMMUTABLE_MEDIA_PREFIXES = (BLOB_PREFIX, f'{PREVIEW_PREFIX}{BLOB_PREFIX}')
+
+# Hech qachon berilmaydi (yuklanayotgan vaqtinchalik fayllar)
+HIDDEN_MEDIA_PREFIXES = (f'{BLOB_PREFIX}tmp/',)
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+FILE_BLOCK_SIZE = 64 * 1024
+
+
+def get_accel_mode():
+    """'nginx' (X-Accel-Redirect), 'sendfile' (X-Sendfile) yoki '' (Django o'zi beradi)"""
+    return getattr(settings, 'MEDIA_ACCEL_MODE', '')
+
+
+def normalize_media_path(path):
+    """URL dagi yo'lni tekshirish: '..' va absolyut yo'llar -> 404"""
+    name = posixpath.normpath(path).lstrip('/')
+    if name in ('', '.') or name.startswith('..') or name.startswith(HIDDEN_MEDIA_PREFIXES):
+        raise Http404
+    try:
+        full_path = safe_join(settings.MEDIA_ROOT, name)
+    except SuspiciousFileOperation:
+        raise Http404
+    return name, full_path
+
+
+def media_ticket_querysets(name):
+    """
+    Shu fayl biriktirilgan ticketlar querysetlari (aktiv va arxiv, ticket va xabar)
+
+    Bir xil blob istalgancha ticketda ishlatilishi mumkin - ruxsat har bir
+    queryset uchun bitta EXISTS so'rovi bilan tekshiriladi (ro'yxat yuklanmaydi).
+    Preview uchun uning asl fayli olinadi.
+    """
+    from .models import Ticket, ArchivedTicket, AttachmentPreview
+
+    if name.startswith(PREVIEW_PREFIX):
+        name = AttachmentPreview.objects.filter(preview=name).values_list('source', flat=True).first()
+        if name is None:
+            return
+
+    for model in (Ticket, ArchivedTicket):
+        yield model.objects.filter(attachment=name)
+        yield model.objects.filter(messages__attachment=name)
+
+
+# ============================================
+# JAVOB (RESPONSE)
+# ============================================
+
+def _etag(stat):
+    return f'"{stat.st_size:x}-{stat.st_mtime_ns:x}"'
+
+
+def _content_type(name):
+    content_type, encoding = mimetypes.guess_type(name)
+    if encoding:
+        # .gz va shu kabilar - brauzer ochmasligi uchun
+        return 'application/octet-stream'
+    return content_type or 'application/octet-stream'
+
+
+def _cache_control(name):
+    # Blob nomi kontent xeshi - hech qachon o'zgarmaydi
+    if name.startswith(IMMUTABLE_MEDIA_PREFIXES):
+        return 'private, max-age=31536000, immutable'
+    return 'private, no-cache'
+
+
+def parse_range(header, size):
+    """
+    Bitta oraliqli Range sarlavhasi -> (start, end) yoki None
+
+    Bir nechta oraliq (multipart/byteranges) qo'llab-quvvatlanmaydi -
+    bunday so'rovga butun fayl qaytariladi (RFC 9110 ruxsat beradi).
+
+    Raises:
+        ValueError: oraliq fayl hajmidan tashqarida (416)
+    """
+    match = RANGE_RE.match(header.strip())
+    if not match:
+        return None
+
+    start, end = match.groups()
+    if not start and not end:
+        return None
+
+    if not start:
+        # bytes=-500 -> oxirgi 500 bayt
+        length = int(end)
+        if length == 0:
+            raise ValueError
+        return max(size - length, 0), size - 1
+
+    start = int(start)
+    end = int(end) if end else size - 1
+    if start >= size or end < start:
+        raise ValueError
+    return start, min(end, size - 1)
+
+
+class RangeFile:
+    """
+    Faylning [start, start+length) qismi
+
+    fileno() saqlanadi - gunicorn wsgi.file_wrapper joriy pozitsiyadan
+    Content-Length bayt os.sendfile() bilan yuboradi; boshqa serverlarda
+    read() chegarani o'zi kuzatadi.
+    """
+
+    def __init__(self, file, start, length):
+        self.file = file
+        self.file.seek(start)
+        self.remaining = length
+
+    def read(self, size=-1):
+        if self.remaining <= 0:
+            return b''
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def fileno(self):
+        return self.file.fileno()
+
+    def close(self):
+        self.file.close()
+
+
+def _accel_response(name, full_path, content_type):
+    response = HttpResponse(content_type=content_type)
+    if get_accel_mode() == 'nginx':
+        prefix = getattr(settings, 'MEDIA_ACCEL_PREFIX', '/protected-media/')
+        response['X-Accel-Redirect'] = prefix.rstrip('/') + '/' + quote(name)
+    else:
+        response['X-Sendfile'] = full_path
+    return response
+
+
+def media_file_response(request, name, full_path):
+    """
+    Faylni berish
+
+    - Proxy sozlangan bo'lsa - faqat sarlavha, faylni nginx/apache yuboradi
+      (Range, ETag va hokazolarni ham proxy o'zi bajaradi)
+    - Aks holda FileResponse: ETag/Last-Modified (304), Range (206/416)
+    """
+    try:
+        stat = os.stat(full_path)
+    except (FileNotFoundError, NotADirectoryError):
+        raise Http404
+    if not os.path.isfile(full_path):
+        raise Http404
+
+    content_type = _content_type(name)
+
+    if get_accel_mode():
+        response = _accel_response(name, full_path, content_type)
+        response['Cache-Control'] = _cache_control(name)
+        return response
+
+    etag = _etag(stat)
+    last_modified = int(stat.st_mtime)
+
+    conditional = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if conditional is not None:
+        conditional['Cache-Control'] = _cache_control(name)
+        return conditional
+
+    size = stat.st_size
+    byte_range = None
+    range_header = request.headers.get('Range')
+    if_range = request.headers.get('If-Range')
+    if range_header and request.method == 'GET' and (not if_range or if_range == etag):
+        try:
+            byte_range = parse_range(range_header, size)
+        except ValueError:
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{size}'
+            return response
+
+    file = open(full_path, 'rb')
+    if byte_range:
+        start, end = byte_range
+        length = end - start + 1
+        response = FileResponse(RangeFile(file, start, length), status=206, content_type=content_type)
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+    else:
+        length = size
+        response = FileResponse(file, content_type=content_type)
+
+    response.block_size = FILE_BLOCK_SIZE
+    response['Content-Length'] = str(length)
+    response['Accept-Ranges'] = 'bytes'
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(last_modified)
+    response['Cache-Control'] = _cache_control(name)
+    return response
@@ -0,0 +1,283 @@
+# tickets/metrics.py - PROMETHEUS METRIKALARI (GUNICORN WORKERLARI BO'YICHA YIG'ILADI)
+
+import atexit
+import glob
+import json
+import logging
+import os
+import threading
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+
+from .query_budget import count_queries
+
+logger = logging.getLogger(__name__)
+
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500)
+FANOUT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+REPORT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+# nom -> (turi, tavsif, bucketlar)
+METRICS = {
+    'http_requests_total': ('counter', 'So\'rovlar soni', None),
+    'http_request_duration_seconds': ('histogram', 'So\'rov davomiyligi', LATENCY_BUCKETS),
+    'http_request_db_queries': ('histogram', 'Bitta so\'rovdagi SQL soni', QUERY_BUCKETS),
+    'tickets_created_total': ('counter', 'Yaratilgan murojaatlar', None),
+    'tickets_resolved_total': ('counter', 'Hal qilingan murojaatlar', None),
+    'notification_fanout_recipients': ('histogram', 'Bitta hodisa uchun bildirishnoma oluvchilar', FANOUT_BUCKETS),
+    'report_generation_seconds': ('histogram', 'Hisobot yaratish vaqti', REPORT_BUCKETS),
+}
+
+
+def _labels_key(labels):
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+class MetricsRegistry:
+    """
+    Jarayon ichidagi hisoblagichlar va histogrammalar
+
+    METRICS_DIR berilgan bo'lsa har bir worker o'z holatini
+    <dir>/<pid>-<start>.json fayliga vaqti-vaqti bilan yozadi (atomik replace),
+    /metrics esa barcha fayllarni qo'shib beradi. Fayl nomida ishga tushgan vaqt
+    bor - pid qayta ishlatilsa ham eski worker hisoblari yo'qolmaydi.
+    Katalog deploy paytida tozalanishi kerak (masalan /tmp ichida).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._values = {}
+        self._last_flush = 0.0
+        self._file_name = f'{os.getpid()}-{int(time.time() * 1000)}.json'
+
+    def inc(self, name, value=1, **labels):
+        key = (name, _labels_key(labels))
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + value
+
+    def observe(self, name, value, **labels):
+        buckets = METRICS[name][2]
+        key = (name, _labels_key(labels))
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                # [bucket1, ..., +Inf, yig'indi]
+                entry = self._values[key] = [0] * (len(buckets) + 1) + [0.0]
+            for i, bound in enumerate(buckets):
+                if value <= bound:
+                    entry[i] += 1
+                    break
+            else:
+                entry[len(buckets)] += 1
+            entry[-1] += value
+
+    # ============================================
+    # FAYLLAR (MULTIPROCESS)
+    # ============================================
+
+    def _directory(self):
+        return getattr(settings, 'METRICS_DIR', '')
+
+    def _serialize(self):
+        with self._lock:
+            return [[name, list(labels), value] for (name, labels), value in self._values.items()]
+
+    def flush(self, force=False):
+        """Holatni faylga yozish (METRICS_FLUSH_SECONDS da bir martadan ko'p emas)"""
+        directory = self._directory()
+        if not directory:
+            return
+        now = time.monotonic()
+        if not force and now - self._last_flush < getattr(settings, 'METRICS_FLUSH_SECONDS', 5):
+            return
+        self._last_flush = now
+
+        try:
+            os.makedirs(directory, exist_ok=True)
+            path = os.path.join(directory, self._file_name)
+            tmp_path = f'{path}.tmp'
+            with open(tmp_path, 'w') as file:
+                json.dump(self._serialize(), file)
+            os.replace(tmp_path, path)
+        except OSError:
+            logger.warning("Metrikalar yozilmadi: %s", directory, exc_info=True)
+
+    def collect(self):
+        """Barcha workerlar yig'indisi: {(nom, labels): qiymat}"""
+        directory = self._directory()
+        if not directory:
+            return {key: _copy(value) for key, value in self._local_items()}
+
+        self.flush(force=True)
+        merged = {}
+        for path in glob.glob(os.path.join(directory, '*.json')):
+            try:
+                with open(path) as file:
+                    items = json.load(file)
+            except (OSError, ValueError):
+                continue
+            for name, labels, value in items:
+                if name not in METRICS:
+                    continue
+                key = (name, tuple(tuple(pair) for pair in labels))
+                merged[key] = _merge(merged.get(key), value)
+        return merged
+
+    def _local_items(self):
+        with self._lock:
+            return list(self._values.items())
+
+    def reset(self):
+        with self._lock:
+            self._values.clear()
+
+
+def _copy(value):
+    return list(value) if isinstance(value, list) else value
+
+
+def _merge(current, value):
+    if current is None:
+        return _copy(value)
+    if isinstance(value, list):
+        return [a + b for a, b in zip(current, value)]
+    return current + value
+
+
+registry = MetricsRegistry()
+atexit.register(registry.flush, force=True)
+
+
+def enabled():
+    """
+    METRICS_ENABLED - o'chiq bo'lsa inc/observe hech narsa yozmaydi
+
+    Label qiymati qo'shimcha so'rov talab qilsa (masalan ticket.system.name)
+    chaqiruvchi avval shuni tekshiradi.
+    """
+    return getattr(settings, 'METRICS_ENABLED', False)
+
+
+def inc(name, value=1, **labels):
+    if enabled():
+        registry.inc(name, value, **labels)
+
+
+def observe(name, value, **labels):
+    if enabled():
+        registry.observe(name, value, **labels)
+
+
+# ============================================
+# PROMETHEUS MATN FORMATI
+# ============================================
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(labels, extra=()):
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{key}="{_escape(value)}"' for key, value in pairs) + '}'
+
+
+def _format_number(value):
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+def render_metrics(values, gauges=None):
+    """
+    Prometheus text exposition (0.0.4) formati
+
+    Args:
+        values: collect() natijasi
+        gauges: {nom: (tavsif, [(labels dict, qiymat), ...])} - so'rov paytida hisoblanadiganlar
+    """
+    by_name = {}
+    for (name, labels), value in values.items():
+        by_name.setdefault(name, []).append((labels, value))
+
+    lines = []
+    for name, (kind, help_text, buckets) in METRICS.items():
+        samples = by_name.get(name)
+        if not samples:
+            continue
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} {kind}')
+        for labels, value in sorted(samples):
+            if kind == 'counter':
+                lines.append(f'{name}{_format_labels(labels)} {_format_number(value)}')
+                continue
+            cumulative = 0
+            for bound, count in zip(buckets + ('+Inf',), value[:-1]):
+                cumulative += count
+                le = bound if bound == '+Inf' else _format_number(float(bound))
+                lines.append(f'{name}_bucket{_format_labels(labels, [("le", le)])} {cumulative}')
+            lines.append(f'{name}_sum{_format_labels(labels)} {_format_number(value[-1])}')
+            lines.append(f'{name}_count{_format_labels(labels)} {cumulative}')
+
+    for name, (help_text, samples) in (gauges or {}).items():
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} gauge')
+        for labels, value in samples:
+            lines.append(f'{name}{_format_labels(sorted(labels.items()))} {_format_number(value)}')
+
+    return '\n'.join(lines) + '\n'
+
+
+# ============================================
+# MIDDLEWARE
+# ============================================
+
+class MetricsMiddleware:
+    """
+    Har bir so'rov: soni, davomiyligi va SQL soni (URL nomi bo'yicha)
+
+    METRICS_ENABLED=False bo'lsa zanjirdan chiqariladi (MiddlewareNotUsed).
+    Label sifatida URL nomi ishlatiladi (yo'l emas) - qatorlar soni cheklangan.
+    Sync va async (ASGI) rejimda ishlaydi.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'METRICS_ENABLED', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        started = time.perf_counter()
+        with count_queries() as counter:
+            response = self.get_response(request)
+        self._record(request, response, time.perf_counter() - started, counter.count)
+        return response
+
+    async def __acall__(self, request):
+        started = time.perf_counter()
+        with count_queries() as counter:
+            response = await self.get_response(request)
+        self._record(request, response, time.perf_counter() - started, counter.count)
+        return response
+
+    def _record(self, request, response, duration, queries):
+        match = getattr(request, 'resolver_match', None)
+        view = match.view_name if match and match.view_name else 'unresolved'
+        inc('http_requests_total', view=view, method=request.method, status=response.status_code)
+        observe('http_request_duration_seconds', duration, view=view)
+        observe('http_request_db_queries', queries, view=view)
+        registry.flush()
@@ -0,0 +1,31 @@
+# Generated by Django 5.0 on 2026-10-19 10:29
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tickets', '0002_ticket_assignment_type'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='tickethistory',
+            index=models.Index(fields=['-timestamp', '-id'], name='history_ts_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tickethistory',
+            index=models.Index(fields=['action_type', '-timestamp'], name='history_action_ts_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tickethistory',
+            index=models.Index(fields=['changed_by', '-timestamp'], name='history_user_ts_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tickethistory',
+            index=models.Index(fields=['ticket', '-timestamp'], name='history_ticket_ts_idx'),
+        ),
+    ]
@@ -0,0 +1,126 @@
+# Generated by Django 5.0 on 2026-10-19 10:32
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_user_search_name'),
+        ('systems', '0001_initial'),
+        ('tickets', '0003_history_audit_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedTicket',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('priority', models.CharField(choices=[('low', 'Oddiy'), ('medium', "O'rtacha"), ('high', 'Yuqori')], max_length=10, verbose_name='Ustuvorlik')),
+                ('status', models.CharField(choices=[('new', 'Yangi'), ('in_progress', 'Jarayonda'), ('pending_approval', 'Hal qilindi (kutilmoqda)'), ('resolved', 'Hal qilindi'), ('rejected', 'Rad etildi'), ('reopened', 'Qayta ochildi')], max_length=20, verbose_name='Holat')),
+                ('description', models.TextField(verbose_name="Muammo ta'rifi")),
+                ('attachment', models.FileField(blank=True, null=True, upload_to='tickets/attachments/', verbose_name='Fayl biriktirma')),
+                ('rating', models.IntegerField(blank=True, choices=[(1, '1'), (2, '2'), (3, '3'), (4, '4'), (5, '5')], null=True, verbose_name='Baholash')),
+                ('rating_comment', models.TextField(blank=True, verbose_name='Baholash izohi')),
+                ('assignment_type', models.CharField(blank=True, max_length=20, verbose_name='Biriktirilish turi')),
+                ('created_at', models.DateTimeField(verbose_name='Yaratilgan')),
+                ('updated_at', models.DateTimeField(verbose_name="O'zgartirilgan")),
+                ('resolved_at', models.DateTimeField(blank=True, null=True, verbose_name='Hal qilingan vaqt')),
+                ('archived_at', models.DateTimeField(auto_now_add=True, verbose_name='Arxivlangan')),
+            ],
+            options={
+                'verbose_name': 'Arxiv murojaat',
+                'verbose_name_plural': 'Arxiv murojaatlar',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='ArchivedTicketHistory',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('action_type', models.CharField(choices=[('created', 'Yaratildi'), ('status_changed', "Holat o'zgartirildi"), ('assigned', "Mas'ul biriktirildi"), ('reassigned', "Mas'ul o'zgartirildi"), ('comment', "Izoh qo'shildi"), ('reopened', 'Qayta ochildi'), ('rated', 'Baholandi'), ('file_attached', 'Fayl biriktirildi')], max_length=20, verbose_name='Harakat turi')),
+                ('old_value', models.CharField(blank=True, max_length=200, verbose_name='Eski qiymat')),
+                ('new_value', models.CharField(blank=True, max_length=200, verbose_name='Yangi qiymat')),
+                ('message', models.TextField(blank=True, verbose_name='Izoh')),
+                ('timestamp', models.DateTimeField(verbose_name='Vaqt')),
+            ],
+            options={
+                'verbose_name': 'Arxiv murojaat tarixi',
+                'verbose_name_plural': 'Arxiv murojaat tarixlari',
+                'ordering': ['timestamp'],
+            },
+        ),
+        migrations.CreateModel(
+            name='ArchivedTicketMessage',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('message', models.TextField(verbose_name='Xabar')),
+                ('attachment', models.FileField(blank=True, null=True, upload_to='tickets/chat_attachments/', verbose_name='Fayl')),
+                ('created_at', models.DateTimeField(verbose_name='Yuborilgan vaqt')),
+            ],
+            options={
+                'verbose_name': 'Arxiv chat xabari',
+                'verbose_name_plural': 'Arxiv chat xabarlari',
+                'ordering': ['created_at'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='ticket',
+            index=models.Index(fields=['status', 'updated_at'], name='ticket_status_updated_idx'),
+        ),
+        migrations.AddField(
+            model_name='archivedticket',
+            name='assigned_to',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='archived_assigned_tickets', to=settings.AUTH_USER_MODEL, verbose_name="Mas'ul xodim"),
+        ),
+        migrations.AddField(
+            model_name='archivedticket',
+            name='region',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_tickets', to='accounts.region', verbose_name='Viloyat'),
+        ),
+        migrations.AddField(
+            model_name='archivedticket',
+            name='system',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_tickets', to='systems.system', verbose_name='Tizim'),
+        ),
+        migrations.AddField(
+            model_name='archivedticket',
+            name='user',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_tickets', to=settings.AUTH_USER_MODEL, verbose_name='Foydalanuvchi'),
+        ),
+        migrations.AddField(
+            model_name='archivedtickethistory',
+            name='changed_by',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='archived_ticket_changes', to=settings.AUTH_USER_MODEL, verbose_name='Kim tomonidan'),
+        ),
+        migrations.AddField(
+            model_name='archivedtickethistory',
+            name='ticket',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='history', to='tickets.archivedticket', verbose_name='Murojaat'),
+        ),
+        migrations.AddField(
+            model_name='archivedticketmessage',
+            name='sender',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_ticket_messages', to=settings.AUTH_USER_MODEL, verbose_name='Yuboruvchi'),
+        ),
+        migrations.AddField(
+            model_name='archivedticketmessage',
+            name='ticket',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='messages', to='tickets.archivedticket', verbose_name='Murojaat'),
+        ),
+        migrations.AddIndex(
+            model_name='archivedticket',
+            index=models.Index(fields=['-created_at'], name='archticket_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='archivedticket',
+            index=models.Index(fields=['user', '-created_at'], name='archticket_user_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='archivedticket',
+            index=models.Index(fields=['system', 'region', '-created_at'], name='archticket_sys_reg_idx'),
+        ),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 5.0 on 2026-10-19 10:34
+
+import django.utils.timezone
+import tickets.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tickets', '0004_ticket_archive'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StoredBlob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255, unique=True, verbose_name="Fayl yo'li")),
+                ('sha256', models.CharField(db_index=True, max_length=64, verbose_name='SHA-256')),
+                ('size', models.BigIntegerField(default=0, verbose_name='Hajmi (bayt)')),
+                ('ref_count', models.PositiveIntegerField(default=0, verbose_name='Havolalar soni')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Yaratilgan')),
+                ('last_referenced_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Oxirgi havola')),
+            ],
+            options={
+                'verbose_name': 'Fayl bloki',
+                'verbose_name_plural': 'Fayl bloklari',
+            },
+        ),
+        migrations.AlterField(
+            model_name='archivedticket',
+            name='attachment',
+            field=models.FileField(blank=True, null=True, storage=tickets.storage.attachment_storage, upload_to='tickets/attachments/', verbose_name='Fayl biriktirma'),
+        ),
+        migrations.AlterField(
+            model_name='archivedticketmessage',
+            name='attachment',
+            field=models.FileField(blank=True, null=True, storage=tickets.storage.attachment_storage, upload_to='tickets/chat_attachments/', verbose_name='Fayl'),
+        ),
+        migrations.AlterField(
+            model_name='ticket',
+            name='attachment',
+            field=models.FileField(blank=True, null=True, storage=tickets.storage.attachment_storage, upload_to='tickets/attachments/', verbose_name='Fayl biriktirma'),
+        ),
+        migrations.AlterField(
+            model_name='ticketmessage',
+            name='attachment',
+            field=models.FileField(blank=True, null=True, storage=tickets.storage.attachment_storage, upload_to='tickets/chat_attachments/', verbose_name='Fayl'),
+        ),
+    ]
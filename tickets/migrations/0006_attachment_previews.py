@@ -0,0 +1,32 @@
+# Generated by Django 5.0 on 2026-10-19 10:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tickets', '0005_attachment_blob_storage'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AttachmentPreview',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source', models.CharField(max_length=255, unique=True, verbose_name='Asl fayl')),
+                ('preview', models.CharField(blank=True, max_length=255, verbose_name='Preview fayl')),
+                ('status', models.CharField(choices=[('pending', 'Navbatda'), ('ready', 'Tayyor'), ('unsupported', "Qo'llab-quvvatlanmaydi"), ('failed', 'Xatolik')], default='pending', max_length=20, verbose_name='Holat')),
+                ('width', models.PositiveIntegerField(blank=True, null=True, verbose_name='Eni')),
+                ('height', models.PositiveIntegerField(blank=True, null=True, verbose_name="Bo'yi")),
+                ('attempts', models.PositiveSmallIntegerField(default=0, verbose_name='Urinishlar')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Yaratilgan')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name="O'zgartirilgan")),
+            ],
+            options={
+                'verbose_name': 'Biriktirma preview',
+                'verbose_name_plural': 'Biriktirma previewlari',
+                'indexes': [models.Index(fields=['status', 'id'], name='preview_status_idx'), models.Index(fields=['preview'], name='preview_name_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.0 on 2026-10-19 11:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tickets', '0006_attachment_previews'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='archivedticket',
+            name='first_assigned_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Birinchi biriktirilgan vaqt'),
+        ),
+        migrations.AddField(
+            model_name='archivedticket',
+            name='first_response_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Birinchi javob vaqti'),
+        ),
+        migrations.AddField(
+            model_name='archivedticket',
+            name='resolution_seconds',
+            field=models.PositiveIntegerField(blank=True, null=True, verbose_name='Hal qilish vaqti (soniya)'),
+        ),
+        migrations.AddField(
+            model_name='ticket',
+            name='first_assigned_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Birinchi biriktirilgan vaqt'),
+        ),
+        migrations.AddField(
+            model_name='ticket',
+            name='first_response_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Birinchi javob vaqti'),
+        ),
+        migrations.AddField(
+            model_name='ticket',
+            name='resolution_seconds',
+            field=models.PositiveIntegerField(blank=True, null=True, verbose_name='Hal qilish vaqti (soniya)'),
+        ),
+    ]
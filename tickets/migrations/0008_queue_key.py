@@ -0,0 +1,44 @@
+# Generated by Django 5.0 on 2026-10-19 11:40
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def fill_queue_key(apps, schema_editor):
+    from tickets.models import queue_priority_boosts
+
+    Ticket = apps.get_model('tickets', 'Ticket')
+    boosts = queue_priority_boosts()
+    for priority in ('low', 'medium', 'high'):
+        Ticket.objects.filter(priority=priority).update(
+            queue_key=models.F('created_at') - timedelta(hours=boosts.get(priority, 0))
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_user_search_name'),
+        ('systems', '0002_assignment_mode'),
+        ('tickets', '0007_sla_metrics'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='ticket',
+            name='queue_key',
+            field=models.DateTimeField(blank=True, editable=False, null=True, verbose_name='Navbat kaliti'),
+        ),
+        migrations.AddIndex(
+            model_name='ticket',
+            index=models.Index(condition=models.Q(('assigned_to__isnull', True), ('status', 'new')), fields=['queue_key', 'id'], name='ticket_queue_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='ticket',
+            index=models.Index(fields=['assigned_to', 'queue_key'], name='ticket_assignee_queue_idx'),
+        ),
+        migrations.RunPython(fill_queue_key, migrations.RunPython.noop),
+    ]
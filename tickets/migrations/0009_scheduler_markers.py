@@ -0,0 +1,33 @@
+# Generated by Django 5.0 on 2026-10-19 11:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tickets', '0008_queue_key'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='ticket',
+            name='escalated_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True, verbose_name='Eskalatsiya vaqti'),
+        ),
+        migrations.AddField(
+            model_name='ticket',
+            name='reminded_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True, verbose_name='Oxirgi eslatma vaqti'),
+        ),
+        migrations.AlterField(
+            model_name='archivedtickethistory',
+            name='action_type',
+            field=models.CharField(choices=[('created', 'Yaratildi'), ('status_changed', "Holat o'zgartirildi"), ('assigned', "Mas'ul biriktirildi"), ('reassigned', "Mas'ul o'zgartirildi"), ('comment', "Izoh qo'shildi"), ('reopened', 'Qayta ochildi'), ('rated', 'Baholandi'), ('file_attached', 'Fayl biriktirildi'), ('escalated', 'Eskalatsiya qilindi')], max_length=20, verbose_name='Harakat turi'),
+        ),
+        migrations.AlterField(
+            model_name='tickethistory',
+            name='action_type',
+            field=models.CharField(choices=[('created', 'Yaratildi'), ('status_changed', "Holat o'zgartirildi"), ('assigned', "Mas'ul biriktirildi"), ('reassigned', "Mas'ul o'zgartirildi"), ('comment', "Izoh qo'shildi"), ('reopened', 'Qayta ochildi'), ('rated', 'Baholandi'), ('file_attached', 'Fayl biriktirildi'), ('escalated', 'Eskalatsiya qilindi')], max_length=20, verbose_name='Harakat turi'),
+        ),
+    ]
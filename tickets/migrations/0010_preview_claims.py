@@ -0,0 +1,23 @@
+# Generated by Django 5.0 on 2026-10-19 12:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tickets', '0009_scheduler_markers'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='attachmentpreview',
+            name='claimed_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Worker olgan vaqt'),
+        ),
+        migrations.AlterField(
+            model_name='attachmentpreview',
+            name='status',
+            field=models.CharField(choices=[('pending', 'Navbatda'), ('processing', 'Ishlanmoqda'), ('ready', 'Tayyor'), ('unsupported', "Qo'llab-quvvatlanmaydi"), ('failed', 'Xatolik')], default='pending', max_length=20, verbose_name='Holat'),
+        ),
+    ]
@@ -1,8 +1,37 @@
+from datetime import timedelta
+
+from django.conf import settings
 from django.db import models
 from django.utils.translation import gettext_lazy as _
 from django.utils import timezone
 from accounts.models import User, Region
 from systems.models import System
+from .storage import attachment_storage
+
+
+def resolution_seconds(status, created_at, resolved_at):
+    """Hal qilingan murojaat uchun yaratilgandan hal qilingungacha soniyalar (aks holda None)"""
+    if status != 'resolved' or resolved_at is None:
+        return None
+    return max(0, int((resolved_at - (created_at or timezone.now())).total_seconds()))
+
+
+DEFAULT_QUEUE_PRIORITY_BOOST_HOURS = {'high': 48, 'medium': 12, 'low': 0}
+
+
+def queue_priority_boosts():
+    """Ustuvorlik -> navbatda "oldindan kutgan" soatlar (TICKET_QUEUE_PRIORITY_BOOST_HOURS)"""
+    return getattr(settings, 'TICKET_QUEUE_PRIORITY_BOOST_HOURS', DEFAULT_QUEUE_PRIORITY_BOOST_HOURS)
+
+
+def queue_key(priority, created_at):
+    """
+    Navbat tartibi kaliti: created_at - ustuvorlik bonusi
+
+    Ball = kutish vaqti + bonus; o'sish tartibida saralash eng yuqori ballni
+    birinchi beradi. Kalit vaqtga bog'liq emas - saqlanadi va indekslanadi.
+    """
+    return (created_at or timezone.now()) - timedelta(hours=queue_priority_boosts().get(priority, 0))
 
 
 class Ticket(models.Model):
@@ -59,6 +88,7 @@ class Ticket(models.Model):
     description = models.TextField(verbose_name=_("Muammo ta'rifi"))
     attachment = models.FileField(
         upload_to='tickets/attachments/',
+        storage=attachment_storage,
         blank=True,
         null=True,
         verbose_name=_("Fayl biriktirma")
@@ -102,10 +132,36 @@ class Ticket(models.Model):
     updated_at = models.DateTimeField(auto_now=True, verbose_name=_("O'zgartirilgan"))
     resolved_at = models.DateTimeField(null=True, blank=True, verbose_name=_("Hal qilingan vaqt"))
     
+    # SLA ko'rsatkichlari (denormalizatsiya - hisobotlar tarix/xabarlarni skanerlamaydi)
+    # first_response_at - egasidan boshqa kishining birinchi xabari: biriktirilgan texnik
+    # yoki admin (ikkalasi ham foydalanuvchiga javob); oldingi texnikning javobi ham sanaladi
+    first_assigned_at = models.DateTimeField(null=True, blank=True, verbose_name=_("Birinchi biriktirilgan vaqt"))
+    first_response_at = models.DateTimeField(null=True, blank=True, verbose_name=_("Birinchi javob vaqti"))
+    resolution_seconds = models.PositiveIntegerField(null=True, blank=True, verbose_name=_("Hal qilish vaqti (soniya)"))
+    
+    # Texnik navbati: ustuvorlik va kutish vaqti bo'yicha tartib (queue_key())
+    queue_key = models.DateTimeField(null=True, blank=True, editable=False, verbose_name=_("Navbat kaliti"))
+    
+    # Rejalashtiruvchi (run_ticket_scheduler) belgilari - takroriy eskalatsiya/eslatma yo'q
+    escalated_at = models.DateTimeField(null=True, blank=True, editable=False, verbose_name=_("Eskalatsiya vaqti"))
+    reminded_at = models.DateTimeField(null=True, blank=True, editable=False, verbose_name=_("Oxirgi eslatma vaqti"))
+    
     class Meta:
         verbose_name = _("Murojaat")
         verbose_name_plural = _("Murojaatlar")
         ordering = ['-created_at']
+        indexes = [
+            # Arxivlash: eski hal qilingan/rad etilgan murojaatlarni topish
+            models.Index(fields=['status', 'updated_at'], name='ticket_status_updated_idx'),
+            # Yangi (biriktirilmagan) murojaatlar navbati - tartiblangan diapazon
+            models.Index(
+                fields=['queue_key', 'id'],
+                condition=models.Q(status='new', assigned_to__isnull=True),
+                name='ticket_queue_idx',
+            ),
+            # Texnikning o'z murojaatlari navbat tartibida
+            models.Index(fields=['assigned_to', 'queue_key'], name='ticket_assignee_queue_idx'),
+        ]
     
     def __str__(self):
         return f"#{self.pk:04d} - {self.system.name} - {self.user.get_full_name()}"
@@ -141,9 +197,32 @@ class Ticket(models.Model):
     
     def save(self, *args, **kwargs):
         # Agar status "Hal qilindi" ga o'zgarsa, vaqtni yozish
-        if self.status == 'resolved' and not self.resolved_at:
+        resolving = self.status == 'resolved' and not self.resolved_at
+        if resolving:
             self.resolved_at = timezone.now()
+        
+        # SLA: birinchi biriktirish va yakuniy hal qilish davomiyligi
+        if self.assigned_to_id and self.first_assigned_at is None:
+            self.first_assigned_at = timezone.now()
+        self.resolution_seconds = resolution_seconds(self.status, self.created_at, self.resolved_at)
+        self.queue_key = queue_key(self.priority, self.created_at)
+        
+        # Yangi yuklangan fayl - preview navbatiga
+        attachment_uploaded = bool(self.attachment) and not self.attachment._committed
+        creating = self._state.adding
         super().save(*args, **kwargs)
+        
+        from . import metrics
+        # Metrikalar o'chiq bo'lsa self.system yuklanmaydi (qo'shimcha SELECT yo'q)
+        if (creating or resolving) and metrics.enabled():
+            if creating:
+                metrics.inc('tickets_created_total', system=self.system.name)
+            if resolving:
+                metrics.inc('tickets_resolved_total', system=self.system.name)
+        
+        if attachment_uploaded:
+            from .previews import enqueue_preview
+            enqueue_preview(self.attachment.name)
 
 
 class TicketMessage(models.Model):
@@ -163,6 +242,7 @@ class TicketMessage(models.Model):
     message = models.TextField(verbose_name=_("Xabar"))
     attachment = models.FileField(
         upload_to='tickets/chat_attachments/',
+        storage=attachment_storage,
         blank=True,
         null=True,
         verbose_name=_("Fayl")
@@ -176,6 +256,35 @@ class TicketMessage(models.Model):
     
     def __str__(self):
         return f"{self.ticket.get_ticket_number()} - {self.sender.get_full_name()}"
+    
+    def save(self, *args, **kwargs):
+        attachment_uploaded = bool(self.attachment) and not self.attachment._committed
+        creating = self._state.adding
+        super().save(*args, **kwargs)
+        
+        if creating:
+            self._record_first_response()
+        
+        if attachment_uploaded:
+            from .previews import enqueue_preview
+            enqueue_preview(self.attachment.name)
+    
+    def _record_first_response(self):
+        """
+        Murojaat egasidan boshqa xodimning birinchi xabari - first_response_at
+
+        Faqat joriy texnik emas: admin yoki keyin qayta biriktirilgan texnikning
+        xabari ham javob hisoblanadi (xabarni faqat murojaatni ko'ra oladiganlar
+        yozadi). tickets.sla backfill ham xuddi shu ta'rifdan foydalanadi.
+        """
+        ticket = self.ticket
+        if ticket.first_response_at is not None or self.sender_id == ticket.user_id:
+            return
+        ticket.first_response_at = self.created_at
+        # save() emas - updated_at va boshqa ustunlar o'zgarmaydi
+        Ticket.objects.filter(pk=ticket.pk, first_response_at__isnull=True).update(
+            first_response_at=self.created_at
+        )
 
 
 class TicketHistory(models.Model):
@@ -190,6 +299,7 @@ class TicketHistory(models.Model):
         ('reopened', _('Qayta ochildi')),
         ('rated', _('Baholandi')),
         ('file_attached', _('Fayl biriktirildi')),
+        ('escalated', _('Eskalatsiya qilindi')),
     ]
     
     ticket = models.ForeignKey(
@@ -219,6 +329,233 @@ class TicketHistory(models.Model):
         verbose_name = _("Murojaat tarixi")
         verbose_name_plural = _("Murojaat tarixlari")
         ordering = ['timestamp']
+        indexes = [
+            # Audit log: (-timestamp, -id) keyset sahifalash va sana oralig'i
+            models.Index(fields=['-timestamp', '-id'], name='history_ts_id_idx'),
+            models.Index(fields=['action_type', '-timestamp'], name='history_action_ts_idx'),
+            models.Index(fields=['changed_by', '-timestamp'], name='history_user_ts_idx'),
+            models.Index(fields=['ticket', '-timestamp'], name='history_ticket_ts_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.ticket.get_ticket_number()} - {self.get_action_type_display()}"
+
+# ============================================
+# ARXIV (COLD) JADVALLARI
+# ============================================
+
+class ArchivedTicket(models.Model):
+    """Arxivlangan murojaatlar (hal qilingan/rad etilgan, eski)"""
+    
+    # Asl ID saqlanadi - /tickets/<id>/ havolalari o'zgarmaydi
+    id = models.BigIntegerField(primary_key=True)
+    
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='archived_tickets',
+        verbose_name=_("Foydalanuvchi")
+    )
+    system = models.ForeignKey(
+        System,
+        on_delete=models.CASCADE,
+        related_name='archived_tickets',
+        verbose_name=_("Tizim")
+    )
+    region = models.ForeignKey(
+        Region,
+        on_delete=models.CASCADE,
+        related_name='archived_tickets',
+        verbose_name=_("Viloyat")
+    )
+    priority = models.CharField(
+        max_length=10,
+        choices=Ticket.PRIORITY_CHOICES,
+        verbose_name=_("Ustuvorlik")
+    )
+    status = models.CharField(
+        max_length=20,
+        choices=Ticket.STATUS_CHOICES,
+        verbose_name=_("Holat")
+    )
+    description = models.TextField(verbose_name=_("Muammo ta'rifi"))
+    attachment = models.FileField(
+        upload_to='tickets/attachments/',
+        storage=attachment_storage,
+        blank=True,
+        null=True,
+        verbose_name=_("Fayl biriktirma")
+    )
+    assigned_to = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='archived_assigned_tickets',
+        verbose_name=_("Mas'ul xodim")
+    )
+    rating = models.IntegerField(
+        null=True,
+        blank=True,
+        choices=[(i, str(i)) for i in range(1, 6)],
+        verbose_name=_("Baholash")
+    )
+    rating_comment = models.TextField(blank=True, verbose_name=_("Baholash izohi"))
+    assignment_type = models.CharField(max_length=20, blank=True, verbose_name=_("Biriktirilish turi"))
+    
+    # Asl vaqtlar ko'chiriladi (auto_now ishlatilmaydi)
+    created_at = models.DateTimeField(verbose_name=_("Yaratilgan"))
+    updated_at = models.DateTimeField(verbose_name=_("O'zgartirilgan"))
+    resolved_at = models.DateTimeField(null=True, blank=True, verbose_name=_("Hal qilingan vaqt"))
+    first_assigned_at = models.DateTimeField(null=True, blank=True, verbose_name=_("Birinchi biriktirilgan vaqt"))
+    first_response_at = models.DateTimeField(null=True, blank=True, verbose_name=_("Birinchi javob vaqti"))
+    resolution_seconds = models.PositiveIntegerField(null=True, blank=True, verbose_name=_("Hal qilish vaqti (soniya)"))
+    archived_at = models.DateTimeField(auto_now_add=True, verbose_name=_("Arxivlangan"))
+    
+    class Meta:
+        verbose_name = _("Arxiv murojaat")
+        verbose_name_plural = _("Arxiv murojaatlar")
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at'], name='archticket_created_idx'),
+            models.Index(fields=['user', '-created_at'], name='archticket_user_idx'),
+            models.Index(fields=['system', 'region', '-created_at'], name='archticket_sys_reg_idx'),
+        ]
+    
+    def __str__(self):
+        return f"#{self.pk:04d} - {self.system.name} - {self.user.get_full_name()}"
+    
+    # Arxivdagi murojaatni qayta ochib bo'lmaydi
+    can_reopen = False
+    is_archived = True
+    
+    @property
+    def days_since_resolved(self):
+        """Hal qilinganidan keyin necha kun o'tdi"""
+        if not self.resolved_at:
+            return None
+        return (timezone.now() - self.resolved_at).days
+    
+    def get_ticket_number(self):
+        """Ticket raqami: #2025-0001"""
+        return f"#{self.created_at.year}-{self.pk:04d}"
+
+
+class ArchivedTicketMessage(models.Model):
+    """Arxivlangan chat xabarlari"""
+    id = models.BigIntegerField(primary_key=True)
+    ticket = models.ForeignKey(
+        ArchivedTicket,
+        on_delete=models.CASCADE,
+        related_name='messages',
+        verbose_name=_("Murojaat")
+    )
+    sender = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='archived_ticket_messages',
+        verbose_name=_("Yuboruvchi")
+    )
+    message = models.TextField(verbose_name=_("Xabar"))
+    attachment = models.FileField(
+        upload_to='tickets/chat_attachments/',
+        storage=attachment_storage,
+        blank=True,
+        null=True,
+        verbose_name=_("Fayl")
+    )
+    created_at = models.DateTimeField(verbose_name=_("Yuborilgan vaqt"))
+    
+    class Meta:
+        verbose_name = _("Arxiv chat xabari")
+        verbose_name_plural = _("Arxiv chat xabarlari")
+        ordering = ['created_at']
+    
+    def __str__(self):
+        return f"{self.ticket.get_ticket_number()} - {self.sender.get_full_name()}"
+
+
+class ArchivedTicketHistory(models.Model):
+    """Arxivlangan audit log"""
+    id = models.BigIntegerField(primary_key=True)
+    ticket = models.ForeignKey(
+        ArchivedTicket,
+        on_delete=models.CASCADE,
+        related_name='history',
+        verbose_name=_("Murojaat")
+    )
+    changed_by = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name='archived_ticket_changes',
+        verbose_name=_("Kim tomonidan")
+    )
+    action_type = models.CharField(
+        max_length=20,
+        choices=TicketHistory.ACTION_CHOICES,
+        verbose_name=_("Harakat turi")
+    )
+    old_value = models.CharField(max_length=200, blank=True, verbose_name=_("Eski qiymat"))
+    new_value = models.CharField(max_length=200, blank=True, verbose_name=_("Yangi qiymat"))
+    message = models.TextField(blank=True, verbose_name=_("Izoh"))
+    timestamp = models.DateTimeField(verbose_name=_("Vaqt"))
+    
+    class Meta:
+        verbose_name = _("Arxiv murojaat tarixi")
+        verbose_name_plural = _("Arxiv murojaat tarixlari")
+        ordering = ['timestamp']
+    
+    def __str__(self):
+        return f"{self.ticket.get_ticket_number()} - {self.get_action_type_display()}"
+
+
+
+class StoredBlob(models.Model):
+    """Content-addressed biriktirma fayllari (SHA-256 bo'yicha bir marta saqlanadi)"""
+    name = models.CharField(max_length=255, unique=True, verbose_name=_("Fayl yo'li"))
+    sha256 = models.CharField(max_length=64, db_index=True, verbose_name=_("SHA-256"))
+    size = models.BigIntegerField(default=0, verbose_name=_("Hajmi (bayt)"))
+    ref_count = models.PositiveIntegerField(default=0, verbose_name=_("Havolalar soni"))
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name=_("Yaratilgan"))
+    last_referenced_at = models.DateTimeField(default=timezone.now, verbose_name=_("Oxirgi havola"))
+    
+    class Meta:
+        verbose_name = _("Fayl bloki")
+        verbose_name_plural = _("Fayl bloklari")
+    
+    def __str__(self):
+        return f"{self.name} ({self.ref_count})"
+
+
+class AttachmentPreview(models.Model):
+    """Biriktirmalarning kichraytirilgan nusxalari (generate_previews worker yaratadi)"""
+    
+    STATUS_CHOICES = [
+        ('pending', _('Navbatda')),
+        ('processing', _('Ishlanmoqda')),
+        ('ready', _('Tayyor')),
+        ('unsupported', _('Qo\'llab-quvvatlanmaydi')),
+        ('failed', _('Xatolik')),
+    ]
+    
+    source = models.CharField(max_length=255, unique=True, verbose_name=_("Asl fayl"))
+    preview = models.CharField(max_length=255, blank=True, verbose_name=_("Preview fayl"))
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending', verbose_name=_("Holat"))
+    width = models.PositiveIntegerField(null=True, blank=True, verbose_name=_("Eni"))
+    height = models.PositiveIntegerField(null=True, blank=True, verbose_name=_("Bo'yi"))
+    attempts = models.PositiveSmallIntegerField(default=0, verbose_name=_("Urinishlar"))
+    claimed_at = models.DateTimeField(null=True, blank=True, verbose_name=_("Worker olgan vaqt"))
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name=_("Yaratilgan"))
+    updated_at = models.DateTimeField(auto_now=True, verbose_name=_("O'zgartirilgan"))
+    
+    class Meta:
+        verbose_name = _("Biriktirma preview")
+        verbose_name_plural = _("Biriktirma previewlari")
+        indexes = [
+            models.Index(fields=['status', 'id'], name='preview_status_idx'),
+            models.Index(fields=['preview'], name='preview_name_idx'),
+        ]
     
     def __str__(self):
-        return f"{self.ticket.get_ticket_number()} - {self.get_action_type_display()}"
\ No newline at end of file
+        return f"{self.source} ({self.status})"
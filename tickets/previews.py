@@ -0,0 +1,241 @@
+# tickets/previews.py - BIRIKTIRMA PREVIEWLARI (RASMLAR VA PDF 1-SAHIFA)
+
+import logging
+import os
+import posixpath
+import shutil
+import subprocess
+import tempfile
+from datetime import timedelta
+from io import BytesIO
+
+from django.apps import apps
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .storage import attachment_storage_instance
+
+logger = logging.getLogger(__name__)
+
+
+PREVIEW_MAX_SIZE = 480
+PREVIEW_QUALITY = 80
+PREVIEW_PREFIX = 'previews/'
+MAX_ATTEMPTS = 3
+# processing holatida shundan uzoq qolgan yozuv (worker qulagan) navbatga qaytariladi
+CLAIM_LEASE_SECONDS = 10 * 60
+PDF_TIMEOUT_SECONDS = 30
+
+IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.gif', '.webp', '.bmp', '.tif', '.tiff'}
+PDF_EXTENSIONS = {'.pdf'}
+
+
+def preview_name(source):
+    """
+    blobs/ab/cd/<sha>.jpg -> previews/blobs/ab/cd/<sha>.480.webp
+
+    Asl fayl nomi kontent xeshi bo'lgani uchun preview nomi ham o'zgarmaydi
+    (uzoq muddat keshlanadi).
+    """
+    stem = posixpath.splitext(source)[0]
+    return f"{PREVIEW_PREFIX}{stem}.{PREVIEW_MAX_SIZE}.webp"
+
+
+def _extension(name):
+    return posixpath.splitext(name)[1].lower()
+
+
+# ============================================
+# NAVBAT
+# ============================================
+
+def enqueue_preview(source):
+    """Faylni navbatga qo'yish (mavjud bo'lsa hech narsa qilinmaydi)"""
+    AttachmentPreview = apps.get_model('tickets', 'AttachmentPreview')
+    if source and _extension(source) in IMAGE_EXTENSIONS | PDF_EXTENSIONS:
+        AttachmentPreview.objects.get_or_create(source=source)
+
+
+def _attachment_models():
+    for model_name in ('Ticket', 'TicketMessage', 'ArchivedTicket', 'ArchivedTicketMessage'):
+        yield apps.get_model('tickets', model_name)
+
+
+def enqueue_missing(batch_size=1000):
+    """
+    Preview yozuvi yo'q barcha biriktirmalarni navbatga qo'yish
+    (eski fayllar uchun bir martalik to'ldirish)
+
+    Returns:
+        int: navbatga qo'shilganlar soni
+    """
+    AttachmentPreview = apps.get_model('tickets', 'AttachmentPreview')
+    known = AttachmentPreview.objects.values('source')
+    extension_filter = Q()
+    for extension in IMAGE_EXTENSIONS | PDF_EXTENSIONS:
+        extension_filter |= Q(attachment__iendswith=extension)
+
+    added = 0
+    for model in _attachment_models():
+        names = (
+            model.objects
+            .filter(extension_filter)
+            .exclude(attachment__in=known)
+            .values_list('attachment', flat=True)
+            .distinct()
+        )
+        batch = []
+        for name in names.iterator(chunk_size=batch_size):
+            batch.append(AttachmentPreview(source=name))
+            if len(batch) >= batch_size:
+                added += len(AttachmentPreview.objects.bulk_create(batch, ignore_conflicts=True))
+                batch = []
+        if batch:
+            added += len(AttachmentPreview.objects.bulk_create(batch, ignore_conflicts=True))
+    return added
+
+
+def requeue_stale_claims(lease_seconds=CLAIM_LEASE_SECONDS):
+    """
+    Muddati o'tgan processing yozuvlarni navbatga qaytarish
+
+    Urinishlar tugagan bo'lsa - failed (qulatadigan fayl cheksiz takrorlanmaydi).
+
+    Returns:
+        int: qaytarilgan yoki failed qilingan yozuvlar soni
+    """
+    AttachmentPreview = apps.get_model('tickets', 'AttachmentPreview')
+    stale = AttachmentPreview.objects.filter(
+        status='processing', claimed_at__lt=timezone.now() - timedelta(seconds=lease_seconds)
+    )
+    failed = stale.filter(attempts__gte=MAX_ATTEMPTS).update(status='failed', claimed_at=None)
+    return failed + stale.update(status='pending', claimed_at=None)
+
+
+def claim_pending(limit):
+    """
+    Navbatdan yozuvlarni olish
+
+    Olingan yozuvlar processing holatiga o'tadi (claimed_at bilan) - qulf
+    tranzaksiya tugashi bilan bo'shasa ham boshqa worker ularni olmaydi.
+    PostgreSQL da SKIP LOCKED - bir nechta worker bir vaqtda ishlashi mumkin.
+    attempts oshiriladi, shuning uchun worker qulasa ham yozuv cheksiz takrorlanmaydi.
+    """
+    AttachmentPreview = apps.get_model('tickets', 'AttachmentPreview')
+    requeue_stale_claims()
+    pending = AttachmentPreview.objects.filter(status='pending').order_by('id')
+
+    with transaction.atomic():
+        if connection.features.has_select_for_update_skip_locked:
+            pending = pending.select_for_update(skip_locked=True)
+        items = list(pending[:limit])
+        now = timezone.now()
+        for item in items:
+            item.attempts += 1
+            item.status = 'processing'
+            item.claimed_at = now
+        AttachmentPreview.objects.bulk_update(items, ['attempts', 'status', 'claimed_at'])
+    return items
+
+
+# ============================================
+# YARATISH
+# ============================================
+
+def _render_image(file):
+    from PIL import Image, ImageOps
+
+    image = Image.open(file)
+    image.draft('RGB', (PREVIEW_MAX_SIZE * 2, PREVIEW_MAX_SIZE * 2))
+    image = ImageOps.exif_transpose(image)
+    if image.mode not in ('RGB', 'RGBA'):
+        image = image.convert('RGBA' if 'A' in image.getbands() or 'transparency' in image.info else 'RGB')
+    image.thumbnail((PREVIEW_MAX_SIZE, PREVIEW_MAX_SIZE), Image.LANCZOS)
+    return image
+
+
+def _render_pdf(path):
+    """PDF birinchi sahifasi - poppler pdftoppm orqali (o'rnatilmagan bo'lsa None)"""
+    binary = shutil.which('pdftoppm')
+    if binary is None:
+        return None
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        output = os.path.join(tmp_dir, 'page')
+        subprocess.run(
+            [binary, '-f', '1', '-l', '1', '-singlefile', '-png',
+             '-scale-to', str(PREVIEW_MAX_SIZE * 2), path, output],
+            check=True,
+            capture_output=True,
+            timeout=PDF_TIMEOUT_SECONDS,
+        )
+        with open(f'{output}.png', 'rb') as file:
+            return _render_image(file)
+
+
+def render_preview(item, storage=attachment_storage_instance, preview_storage=default_storage):
+    """
+    Bitta yozuv uchun preview yaratish va holatini saqlash
+
+    Preview oddiy storage ga yoziladi (blob hisoblagichlariga kirmaydi).
+
+    Returns:
+        str: yangi holat (ready / unsupported / failed / pending - qayta urinish)
+    """
+    from PIL import Image, UnidentifiedImageError
+
+    extension = _extension(item.source)
+    try:
+        if extension in IMAGE_EXTENSIONS:
+            with storage.open(item.source, 'rb') as file:
+                image = _render_image(file)
+        elif extension in PDF_EXTENSIONS:
+            image = _render_pdf(storage.path(item.source))
+        else:
+            image = None
+    except FileNotFoundError:
+        image, item.status = None, 'failed'
+    except (OSError, UnidentifiedImageError, Image.DecompressionBombError,
+            subprocess.SubprocessError, ValueError):
+        logger.warning("Preview yaratilmadi: %s", item.source, exc_info=True)
+        image = None
+        item.status = 'failed' if item.attempts >= MAX_ATTEMPTS else 'pending'
+    else:
+        if image is None:
+            item.status = 'unsupported'
+
+    if image is not None:
+        buffer = BytesIO()
+        image.save(buffer, 'WEBP', quality=PREVIEW_QUALITY, method=4)
+        name = preview_name(item.source)
+        if preview_storage.exists(name):
+            preview_storage.delete(name)
+        item.preview = preview_storage.save(name, ContentFile(buffer.getvalue()))
+        item.width, item.height = image.size
+        item.status = 'ready'
+
+    item.claimed_at = None
+    item.save(update_fields=['preview', 'width', 'height', 'status', 'claimed_at', 'updated_at'])
+    return item.status
+
+
+def delete_previews(sources, storage=default_storage):
+    """Asl fayllari o'chirilgan previewlarni o'chirish (GC chaqiradi)"""
+    AttachmentPreview = apps.get_model('tickets', 'AttachmentPreview')
+    previews = AttachmentPreview.objects.filter(source__in=sources)
+    for name in previews.exclude(preview='').values_list('preview', flat=True):
+        storage.delete(name)
+    previews.delete()
+
+
+def get_preview_urls(sources, storage=default_storage):
+    """{asl fayl nomi: preview URL} - faqat tayyorlari (bitta so'rov)"""
+    AttachmentPreview = apps.get_model('tickets', 'AttachmentPreview')
+    sources = [source for source in sources if source]
+    if not sources:
+        return {}
+    ready = AttachmentPreview.objects.filter(source__in=sources, status='ready')
+    return {source: storage.url(preview) for source, preview in ready.values_list('source', 'preview')}
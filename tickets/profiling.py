@@ -0,0 +1,370 @@
+# tickets/profiling.py - SO'ROVLARNI PROFILLASH (Server-Timing, HISTOGRAMMA, SEKIN SO'ROVLAR LOGI)
+
+import cProfile
+import heapq
+import json
+import logging
+import os
+import random
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+from contextlib import ExitStack
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core import signing
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.utils import timezone
+from django.utils.crypto import get_random_string
+
+logger = logging.getLogger(__name__)
+
+
+PROFILE_HEADER = 'X-Profile-Token'
+PROFILE_TOKEN_SALT = 'tickets.profiling'
+# Javob vaqti chegaralari (ms), oxirgisidan kattalari +Inf ga tushadi
+HISTOGRAM_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+HISTOGRAM_WINDOW_SECONDS = 60
+HISTOGRAM_WINDOWS = 15
+
+_current_profile = ContextVar('request_profile', default=None)
+
+
+# ============================================
+# BITTA SO'ROV O'LCHOVLARI
+# ============================================
+
+class RequestProfile:
+    """
+    So'rov davomidagi DB va shablon vaqti
+
+    connection.execute_wrapper sifatida ishlatiladi - har bir SQL vaqti
+    o'lchanadi, eng sekin top_n tasi saqlanadi (min-heap).
+    """
+
+    def __init__(self, top_n=5):
+        self.db_time = 0.0
+        self.queries = 0
+        self.template_time = 0.0
+        self.top_n = top_n
+        self._slowest = []
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = time.perf_counter() - start
+            self.db_time += duration
+            self.queries += 1
+            item = (duration, self.queries, sql)
+            if len(self._slowest) < self.top_n:
+                heapq.heappush(self._slowest, item)
+            else:
+                heapq.heappushpop(self._slowest, item)
+
+    def slowest_queries(self):
+        return [
+            {'ms': round(duration * 1000, 2), 'sql': sql[:1000]}
+            for duration, _n, sql in sorted(self._slowest, reverse=True)
+        ]
+
+
+_template_timer_lock = threading.Lock()
+_template_timer_installed = False
+
+
+def install_template_timer():
+    """
+    Django shablon backendi render() ini o'rash (bir marta)
+
+    Faqat profillanayotgan so'rovda vaqt yoziladi, qolganlarida qo'shimcha
+    xarajat - bitta ContextVar.get(). Ichki {% include %} lar backend
+    render() idan o'tmaydi, shuning uchun vaqt ikki marta sanalmaydi.
+    """
+    global _template_timer_installed
+    with _template_timer_lock:
+        if _template_timer_installed:
+            return
+        from django.template.backends.django import Template
+
+        original = Template.render
+
+        def render(self, context=None, request=None):
+            profile = _current_profile.get()
+            if profile is None:
+                return original(self, context, request)
+            start = time.perf_counter()
+            try:
+                return original(self, context, request)
+            finally:
+                profile.template_time += time.perf_counter() - start
+
+        Template.render = render
+        _template_timer_installed = True
+
+
+# ============================================
+# HISTOGRAMMA (URL NOMI BO'YICHA)
+# ============================================
+
+class RollingHistogram:
+    """
+    URL nomi bo'yicha javob vaqtlari - oxirgi windows * window_seconds soniya
+
+    Har bir oyna: {nom: [bucket1, ..., +Inf, yig'indi_ms]}. Eski oynalar
+    deque dan o'zi tushib ketadi - xotira URL lar soniga bog'liq, trafikka emas.
+    Jarayon (worker) ichida - har bir gunicorn worker o'z histogrammasiga ega
+    va uni davriy ravishda logga yozadi (RequestProfilingMiddleware).
+    """
+
+    def __init__(self, buckets=HISTOGRAM_BUCKETS_MS, window_seconds=HISTOGRAM_WINDOW_SECONDS,
+                 windows=HISTOGRAM_WINDOWS):
+        self.buckets = tuple(buckets)
+        self.window_seconds = window_seconds
+        self._windows = deque(maxlen=windows)
+        self._lock = threading.Lock()
+
+    @property
+    def span_seconds(self):
+        """Histogramma qamraydigan vaqt (barcha oynalar)"""
+        return self.window_seconds * self._windows.maxlen
+
+    def observe(self, name, ms):
+        now = time.monotonic()
+        index = bisect_left(self.buckets, ms)
+        with self._lock:
+            if not self._windows or now - self._windows[-1][0] >= self.window_seconds:
+                self._windows.append((now, {}))
+            data = self._windows[-1][1]
+            entry = data.get(name)
+            if entry is None:
+                entry = data[name] = [0] * (len(self.buckets) + 1) + [0.0]
+            entry[index] += 1
+            entry[-1] += ms
+
+    def snapshot(self):
+        """
+        {nom: {'count', 'sum_ms', 'buckets': [(chegara, soni), ...], 'p50_ms', 'p95_ms'}}
+
+        Persentillar bucket yuqori chegarasi bo'yicha (taxminiy).
+        """
+        cutoff = time.monotonic() - self.span_seconds
+        merged = {}
+        with self._lock:
+            for started, data in self._windows:
+                if started < cutoff:
+                    continue
+                for name, entry in data.items():
+                    total = merged.setdefault(name, [0] * len(entry[:-1]) + [0.0])
+                    for i, value in enumerate(entry):
+                        total[i] += value
+
+        bounds = self.buckets + (float('inf'),)
+        result = {}
+        for name, entry in merged.items():
+            counts = entry[:-1]
+            count = sum(counts)
+            result[name] = {
+                'count': count,
+                'sum_ms': round(entry[-1], 2),
+                'buckets': list(zip(bounds, counts)),
+                'p50_ms': _bucket_percentile(bounds, counts, count, 0.50),
+                'p95_ms': _bucket_percentile(bounds, counts, count, 0.95),
+            }
+        return result
+
+    def clear(self):
+        with self._lock:
+            self._windows.clear()
+
+
+def _bucket_percentile(bounds, counts, total, fraction):
+    seen = 0
+    for bound, count in zip(bounds, counts):
+        seen += count
+        if total and seen >= total * fraction:
+            return bound
+    return None
+
+
+request_histogram = RollingHistogram()
+
+
+def histogram_report(histogram=request_histogram):
+    """Log yozuvi: URL nomi bo'yicha soni, o'rtacha, p50, p95 (+Inf -> null)"""
+    def bound(value):
+        return None if value == float('inf') else value
+
+    snapshot = histogram.snapshot()
+    return {
+        'event': 'request_histogram',
+        'pid': os.getpid(),
+        'window_seconds': histogram.span_seconds,
+        'views': {
+            name: {
+                'count': data['count'],
+                'mean_ms': round(data['sum_ms'] / data['count'], 1),
+                'p50_ms': bound(data['p50_ms']),
+                'p95_ms': bound(data['p95_ms']),
+            }
+            for name, data in sorted(snapshot.items())
+        },
+    }
+
+
+# ============================================
+# IMZOLANGAN PROFIL TOKENI
+# ============================================
+
+def make_profile_token():
+    """X-Profile-Token sarlavhasi uchun qiymat (SECRET_KEY bilan imzolangan)"""
+    return signing.TimestampSigner(salt=PROFILE_TOKEN_SALT).sign(get_random_string(12))
+
+
+def is_valid_profile_token(token):
+    max_age = getattr(settings, 'REQUEST_PROFILING_TOKEN_MAX_AGE', 3600)
+    try:
+        signing.TimestampSigner(salt=PROFILE_TOKEN_SALT).unsign(token, max_age=max_age)
+    except signing.BadSignature:
+        return False
+    return True
+
+
+# ============================================
+# MIDDLEWARE
+# ============================================
+
+class RequestProfilingMiddleware:
+    """
+    So'rovlarni profillash (REQUEST_PROFILING_ENABLED=True bo'lganda)
+
+    - Har bir so'rov: umumiy vaqt -> URL nomi bo'yicha histogramma;
+      REQUEST_PROFILING_HISTOGRAM_LOG_SECONDS da bir marta uning xulosasi
+      (worker pid bilan) JSON log bo'lib yoziladi
+    - Tanlangan so'rovlar (REQUEST_PROFILING_SAMPLE_RATE): DB vaqti, SQL soni,
+      shablon vaqti -> Server-Timing sarlavhasi
+    - Sekin so'rovlar (REQUEST_PROFILING_SLOW_MS): JSON log, tanlangan
+      bo'lsa eng sekin SQL lar bilan
+    - Imzolangan X-Profile-Token bilan kelgan so'rov: har doim tanlanadi
+      va cProfile natijasi REQUEST_PROFILING_DIR ga yoziladi
+
+    O'chirilgan bo'lsa MiddlewareNotUsed - zanjirdan butunlay chiqariladi.
+    Streaming javob tanasi view qaytgandan keyin yuboriladi va o'lchanmaydi.
+    Faqat sync: ASGI da yoqilsa Django uni threadda ishga tushiradi
+    (async viewlar ham shu threadga bog'lanadi) - diagnostika uchun yetarli.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'REQUEST_PROFILING_ENABLED', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.sample_rate = getattr(settings, 'REQUEST_PROFILING_SAMPLE_RATE', 0.1)
+        self.slow_ms = getattr(settings, 'REQUEST_PROFILING_SLOW_MS', 1000)
+        self.top_n = getattr(settings, 'REQUEST_PROFILING_TOP_SQL', 5)
+        self.server_timing = getattr(settings, 'REQUEST_PROFILING_SERVER_TIMING', True)
+        self.profile_dir = getattr(settings, 'REQUEST_PROFILING_DIR', None)
+        self.histogram_log_seconds = getattr(settings, 'REQUEST_PROFILING_HISTOGRAM_LOG_SECONDS', 300)
+        self._histogram_logged_at = time.monotonic()
+        self._histogram_lock = threading.Lock()
+        install_template_timer()
+
+    def __call__(self, request):
+        started = time.perf_counter()
+        token = request.headers.get(PROFILE_HEADER)
+        capture = bool(token and self.profile_dir and is_valid_profile_token(token))
+
+        if not capture and random.random() >= self.sample_rate:
+            response = self.get_response(request)
+            self._finish(request, response, started, None)
+            return response
+
+        profile = RequestProfile(self.top_n)
+        profiler = cProfile.Profile() if capture else None
+        context_token = _current_profile.set(profile)
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(profile))
+                if profiler is not None:
+                    try:
+                        profiler.enable()
+                    except ValueError:
+                        # Boshqa profiler (debugger, coverage) allaqachon faol
+                        profiler = None
+                try:
+                    response = self.get_response(request)
+                finally:
+                    if profiler is not None:
+                        profiler.disable()
+        finally:
+            _current_profile.reset(context_token)
+
+        self._finish(request, response, started, profile)
+        if profiler is not None:
+            response['X-Profile-File'] = self._save_profile(profiler, request)
+        return response
+
+    def _view_name(self, request):
+        match = getattr(request, 'resolver_match', None)
+        return match.view_name if match and match.view_name else 'unresolved'
+
+    def _save_profile(self, profiler, request):
+        os.makedirs(self.profile_dir, exist_ok=True)
+        name = '{}-{}-{}.prof'.format(
+            timezone.now().strftime('%Y%m%d-%H%M%S'),
+            self._view_name(request).replace(':', '_'),
+            get_random_string(6),
+        )
+        profiler.dump_stats(os.path.join(self.profile_dir, name))
+        return name
+
+    def _log_histogram(self):
+        """Davriy xulosa - slow_request bilan bir kanalda (default logging da ko'rinadi)"""
+        if not self.histogram_log_seconds:
+            return
+        now = time.monotonic()
+        with self._histogram_lock:
+            if now - self._histogram_logged_at < self.histogram_log_seconds:
+                return
+            self._histogram_logged_at = now
+        logger.warning(json.dumps(histogram_report(), ensure_ascii=False))
+
+    def _finish(self, request, response, started, profile):
+        total_ms = (time.perf_counter() - started) * 1000
+        view_name = self._view_name(request)
+        request_histogram.observe(view_name, total_ms)
+        self._log_histogram()
+
+        if self.server_timing:
+            metrics = []
+            if profile is not None:
+                metrics.append(f'db;dur={profile.db_time * 1000:.1f};desc="{profile.queries} SQL"')
+                metrics.append(f'tpl;dur={profile.template_time * 1000:.1f}')
+            metrics.append(f'total;dur={total_ms:.1f}')
+            existing = response.get('Server-Timing')
+            response['Server-Timing'] = ', '.join(([existing] if existing else []) + metrics)
+
+        if total_ms >= self.slow_ms:
+            user = getattr(request, 'user', None)
+            record = {
+                'event': 'slow_request',
+                'method': request.method,
+                'path': request.path,
+                'view': view_name,
+                'status': response.status_code,
+                'total_ms': round(total_ms, 1),
+                'user_id': user.pk if user is not None and user.is_authenticated else None,
+                'sampled': profile is not None,
+            }
+            if profile is not None:
+                record.update(
+                    db_ms=round(profile.db_time * 1000, 1),
+                    queries=profile.queries,
+                    template_ms=round(profile.template_time * 1000, 1),
+                    slowest_sql=profile.slowest_queries(),
+                )
+            logger.warning(json.dumps(record, ensure_ascii=False))
@@ -0,0 +1,209 @@
+# tickets/query_budget.py - SQL SO'ROVLAR BYUDJETI (DECORATOR, MIDDLEWARE, TEST YORDAMCHISI)
+
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+logger = logging.getLogger(__name__)
+
+# Joriy kontekstdagi (so'rov / test bloki) faol hisoblagichlar
+_active_counters = ContextVar('query_counters', default=())
+
+
+class QueryBudgetExceeded(AssertionError):
+    """So'rovlar soni e'lon qilingan byudjetdan oshdi"""
+
+
+def query_budget(max_queries):
+    """
+    View uchun so'rovlar byudjetini e'lon qilish
+
+    Byudjet sahifadagi qatorlar soniga bog'liq bo'lmasligi kerak -
+    N+1 paydo bo'lsa katta ma'lumotda darhol oshib ketadi.
+
+        @query_budget(15)
+        @login_required
+        def my_view(request): ...
+
+    Eng tashqi decorator bo'lishi kerak - require_admin kabi wrapperlar
+    functools.wraps ishlatmaydi va ichkaridagi atributni yo'qotadi.
+    """
+    def decorator(view_func):
+        view_func.query_budget = max_queries
+        return view_func
+    return decorator
+
+
+def get_view_budget(view_func):
+    """View byudjeti, e'lon qilinmagan bo'lsa QUERY_BUDGET_DEFAULT (None - tekshirilmaydi)"""
+    return getattr(view_func, 'query_budget', getattr(settings, 'QUERY_BUDGET_DEFAULT', None))
+
+
+def get_budget_mode():
+    """'raise' (dev/test), 'log' yoki 'off'"""
+    return getattr(settings, 'QUERY_BUDGET_MODE', 'off')
+
+
+class QueryCounter:
+    """Kontekstdagi barcha ulanishlardagi so'rovlar soni va birinchi 50 tasi"""
+
+    def __init__(self):
+        self.count = 0
+        self.statements = []
+
+    def record(self, sql):
+        self.count += 1
+        if len(self.statements) < 50:
+            self.statements.append(sql)
+
+
+def _count_queries_wrapper(execute, sql, params, many, context):
+    for counter in _active_counters.get():
+        counter.record(sql)
+    return execute(sql, params, many, context)
+
+
+def install_query_counter(connection, **kwargs):
+    """
+    Ulanishga doimiy execute_wrapper o'rnatish (connection_created signali)
+
+    Async viewlarda ORM so'rovlari sync_to_async threadlarida, boshqa
+    ulanish obyektida bajariladi - shu ulanishga vaqtinchalik wrapper qo'yib
+    bo'lmaydi. Doimiy wrapper esa hisoblagichni ContextVar dan oladi, u
+    sync_to_async threadlariga ham o'tadi. Ro'yxat boshiga qo'yiladi -
+    connection.execute_wrapper() chiqishda oxirgisini olib tashlaydi.
+    """
+    if _count_queries_wrapper not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, _count_queries_wrapper)
+
+
+connection_created.connect(install_query_counter)
+
+
+@contextmanager
+def count_queries():
+    """
+    with count_queries() as counter: ...  ->  counter.count
+
+    DEBUG=False da ham ishlaydi (CaptureQueriesContext dan farqli),
+    async viewlarning sync_to_async orqali bajarilgan so'rovlari ham sanaladi.
+    """
+    for connection in connections.all(initialized_only=True):
+        install_query_counter(connection)
+
+    counter = QueryCounter()
+    token = _active_counters.set(_active_counters.get() + (counter,))
+    try:
+        yield counter
+    finally:
+        _active_counters.reset(token)
+
+
+def _budget_message(label, count, budget, statements):
+    lines = [f'{label}: {count} ta SQL so\'rov (byudjet: {budget})']
+    lines += [f'  {sql[:200]}' for sql in statements[:10]]
+    return '\n'.join(lines)
+
+
+@contextmanager
+def assert_max_queries(budget, label='Blok'):
+    """
+    Test yordamchisi: blok ichida budget dan ko'p so'rov bo'lsa QueryBudgetExceeded
+
+        with assert_max_queries(12):
+            client.get(url)
+    """
+    with count_queries() as counter:
+        yield counter
+    if counter.count > budget:
+        raise QueryBudgetExceeded(_budget_message(label, counter.count, budget, counter.statements))
+
+
+class QueryBudgetTestMixin:
+    """
+    TestCase uchun: URL ni chaqirib view e'lon qilgan byudjetni tekshirish
+
+        class BudgetTests(QueryBudgetTestMixin, TestCase):
+            def test_users_list(self):
+                self.client.force_login(superadmin)
+                self.assertWithinQueryBudget(reverse('tickets:superadmin_users_list'))
+
+    Byudjet katta ma'lumotda tekshirilishi kerak (generate_load_dataset) -
+    bo'sh bazada N+1 ko'rinmaydi.
+    """
+
+    def assertWithinQueryBudget(self, url, budget=None, **extra):
+        from django.urls import resolve
+
+        if budget is None:
+            budget = get_view_budget(resolve(url.split('?')[0]).func)
+        if budget is None:
+            self.fail(f'{url}: view uchun query_budget e\'lon qilinmagan')
+
+        with assert_max_queries(budget, label=url):
+            response = self.client.get(url, **extra)
+        return response
+
+
+class QueryBudgetMiddleware:
+    """
+    Har bir so'rovdagi SQL sonini sanash va byudjet bilan solishtirish
+
+    QUERY_BUDGET_MODE:
+    - 'raise' - dev/test: QueryBudgetExceeded (CI da yiqiladi)
+    - 'log'   - production: ogohlantirish logga yoziladi
+    - 'off'   - sanalmaydi
+
+    DEBUG rejimida javobga X-Query-Count sarlavhasi qo'shiladi.
+    Streaming javob (eksport) tanasidagi so'rovlar view qaytgandan keyin
+    bajariladi va bu yerda sanalmaydi. Sync va async (ASGI) rejimda ishlaydi.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        mode = get_budget_mode()
+        if mode == 'off':
+            return self.get_response(request)
+
+        with count_queries() as counter:
+            response = self.get_response(request)
+        return self._check(request, response, counter, mode)
+
+    async def __acall__(self, request):
+        mode = get_budget_mode()
+        if mode == 'off':
+            return await self.get_response(request)
+
+        with count_queries() as counter:
+            response = await self.get_response(request)
+        return self._check(request, response, counter, mode)
+
+    def _check(self, request, response, counter, mode):
+        if settings.DEBUG:
+            response['X-Query-Count'] = str(counter.count)
+
+        # resolver_match.func - process_view ga beriladigan view bilan bir xil
+        match = getattr(request, 'resolver_match', None)
+        budget = get_view_budget(match.func) if match else None
+        if budget is not None and counter.count > budget:
+            message = _budget_message(request.path, counter.count, budget, counter.statements)
+            if mode == 'raise':
+                raise QueryBudgetExceeded(message)
+            logger.warning(message)
+
+        return response
@@ -0,0 +1,105 @@
+# tickets/queue.py - TEXNIK NAVBATI: USTUVORLIK VA KUTISH VAQTI BO'YICHA TARTIB
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from systems.models import SystemResponsible
+
+from .models import Ticket, queue_priority_boosts
+
+
+QUEUE_ORDERINGS = {
+    # Ustuvorlik + kutish vaqti (queue_key - ticket_queue_idx indeksi)
+    'priority': ('queue_key', 'id'),
+    # Eng yangilari birinchi (oldingi tartib)
+    'newest': ('-created_at',),
+}
+CLAIM_ATTEMPTS = 5
+
+
+def queue_ordering(mode=None):
+    """Navbat rejimi -> order_by maydonlari (bo'sh bo'lsa TICKET_QUEUE_ORDERING)"""
+    mode = mode or getattr(settings, 'TICKET_QUEUE_ORDERING', 'priority')
+    return QUEUE_ORDERINGS.get(mode, QUEUE_ORDERINGS['priority'])
+
+
+def available_tickets(user):
+    """
+    Texnik olishi mumkin bo'lgan yangi (biriktirilmagan) murojaatlar
+
+    Mas'ul tizimlar bo'yicha; default (respublika) texnik bo'lmasa - faqat
+    mas'ul viloyatlar (new_tickets_list bilan bir xil qoida).
+    """
+    responsibilities = SystemResponsible.objects.filter(user=user, role_in_system='technician')
+    tickets = Ticket.objects.filter(
+        assigned_to__isnull=True,
+        status='new',
+        system_id__in=responsibilities.values('system_id'),
+    )
+    if not responsibilities.filter(is_default=True).exists():
+        region_ids = list(
+            responsibilities.filter(region__isnull=False).values_list('region_id', flat=True).distinct()
+        )
+        if region_ids:
+            tickets = tickets.filter(region_id__in=region_ids)
+    return tickets
+
+
+def claim_next_ticket(user):
+    """
+    Eng yuqori balli murojaatni atomik ravishda texnikka biriktirish
+
+    Nomzod PostgreSQL da SELECT ... FOR UPDATE SKIP LOCKED bilan olinadi -
+    bir vaqtda bosgan texniklar bir-birini kutmaydi va turli murojaatlarni
+    oladi. Biriktirish shartli UPDATE (assigned_to IS NULL) - boshqa texnik
+    ulgurgan bo'lsa (SQLite) keyingi nomzod olinadi.
+
+    Returns:
+        Ticket yoki None (navbat bo'sh)
+    """
+    queue = available_tickets(user).order_by(*QUEUE_ORDERINGS['priority'])
+    if connection.features.has_select_for_update_skip_locked:
+        queue = queue.select_for_update(skip_locked=True, of=('self',))
+
+    for _attempt in range(CLAIM_ATTEMPTS):
+        with transaction.atomic():
+            candidate_id = queue.values_list('id', flat=True).first()
+            if candidate_id is None:
+                return None
+            now = timezone.now()
+            claimed = Ticket.objects.filter(
+                pk=candidate_id, assigned_to__isnull=True, status='new',
+            ).update(
+                assigned_to=user,
+                status='in_progress',
+                assignment_type='self',
+                first_assigned_at=Coalesce(F('first_assigned_at'), now),
+                updated_at=now,
+            )
+        if claimed:
+            return Ticket.objects.select_related('system').get(pk=candidate_id)
+    return None
+
+
+def rebuild_queue_keys():
+    """
+    queue_key ni TICKET_QUEUE_PRIORITY_BOOST_HOURS bo'yicha qayta hisoblash
+
+    Sozlama o'zgarganda (va migratsiyada) - har bir ustuvorlik uchun bitta
+    UPDATE, bazada hisoblanadi. updated_at o'zgarmaydi.
+
+    Returns:
+        int: yangilangan murojaatlar soni
+    """
+    boosts = queue_priority_boosts()
+    updated = 0
+    for priority, _label in Ticket.PRIORITY_CHOICES:
+        updated += Ticket.objects.filter(priority=priority).update(
+            queue_key=F('created_at') - timedelta(hours=boosts.get(priority, 0))
+        )
+    return updated
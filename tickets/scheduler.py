@@ -0,0 +1,260 @@
+# tickets/scheduler.py - REJALASHTIRUVCHI: AVTO-YOPISH, ESKALATSIYA VA ESLATMALAR
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+
+from notifications.cache import bump_notification_version
+from notifications.models import Notification
+from systems.models import SystemResponsible
+
+from . import metrics
+from .models import Ticket, TicketHistory, resolution_seconds
+
+
+DEFAULT_BATCH_SIZE = 200
+DEFAULT_AUTO_RESOLVE_DAYS = 7
+DEFAULT_RATING_REMINDER_DAYS = 2
+DEFAULT_ESCALATE_AFTER_HOURS = 4
+DEFAULT_REMINDER_AFTER_HOURS = 24
+
+WORKING_STATUSES = ('in_progress', 'reopened')
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def _lock(queryset):
+    """
+    Guruhni qulflash: boshqa node qulflagan qatorlar o'tkazib yuboriladi
+
+    PostgreSQL: SELECT ... FOR UPDATE SKIP LOCKED - bir nechta node bir vaqtda
+    ishlasa ham har bir murojaat faqat bittasida qayta ishlanadi. SQLite da
+    yozuvlar baribir ketma-ket, shart tranzaksiya ichida qayta tekshiriladi.
+    """
+    if connection.features.has_select_for_update_skip_locked:
+        return queryset.select_for_update(skip_locked=True, of=('self',))
+    return queryset.select_for_update()
+
+
+def _run_in_batches(candidates, process, batch_size):
+    """
+    Keyset (id > oxirgi id) bo'yicha guruhlab qayta ishlash
+
+    Har bir guruh alohida tranzaksiyada: nomzodlar qayta filtrlanadi va
+    qulflanadi (shu orada holati o'zgargan bo'lishi mumkin).
+    """
+    processed = 0
+    last_id = 0
+    while True:
+        ids = list(
+            candidates.filter(id__gt=last_id).order_by('id').values_list('id', flat=True)[:batch_size]
+        )
+        if not ids:
+            break
+        with transaction.atomic():
+            tickets = list(_lock(candidates.filter(id__in=ids)).order_by('id'))
+            if tickets:
+                processed += process(tickets)
+        last_id = ids[-1]
+    return processed
+
+
+def _notify(items):
+    """(user_id, turi, sarlavha, matn, ticket) ro'yxati - bitta bulk_create"""
+    if not items:
+        return
+    Notification.objects.bulk_create([
+        Notification(
+            user_id=user_id,
+            notification_type=notification_type,
+            title=title,
+            text=text,
+            url=f'/tickets/{ticket.id}/',
+        )
+        for user_id, notification_type, title, text, ticket in items
+    ])
+    # bulk_create Notification.save ni chaqirmaydi
+    bump_notification_version(*[item[0] for item in items])
+
+
+# ============================================
+# AVTO-YOPISH (baholanmagan pending_approval)
+# ============================================
+
+def auto_resolve_candidates(now):
+    cutoff = now - timedelta(days=_setting('TICKET_AUTO_RESOLVE_DAYS', DEFAULT_AUTO_RESOLVE_DAYS))
+    return Ticket.objects.filter(status='pending_approval', updated_at__lt=cutoff)
+
+
+def _auto_resolve(tickets, now):
+    for ticket in tickets:
+        ticket.status = 'resolved'
+        ticket.resolved_at = now
+        ticket.updated_at = now
+        ticket.resolution_seconds = resolution_seconds(ticket.status, ticket.created_at, now)
+    Ticket.objects.bulk_update(tickets, ['status', 'resolved_at', 'updated_at', 'resolution_seconds'])
+
+    TicketHistory.objects.bulk_create([
+        TicketHistory(
+            ticket=ticket,
+            changed_by=None,
+            action_type='status_changed',
+            old_value='pending_approval',
+            new_value='resolved',
+            message=_('Baholanmagani uchun avtomatik yopildi'),
+        )
+        for ticket in tickets
+    ])
+
+    items = []
+    for ticket in tickets:
+        metrics.inc('tickets_resolved_total', system=ticket.system.name)
+        text = _('Murojaat {} baholanmagani uchun avtomatik yopildi').format(ticket.get_ticket_number())
+        items.append((ticket.user_id, 'status_changed', _('Murojaat yopildi'), text, ticket))
+        if ticket.assigned_to_id:
+            items.append((ticket.assigned_to_id, 'status_changed', _('Murojaat yopildi'), text, ticket))
+    _notify(items)
+    return len(tickets)
+
+
+# ============================================
+# ESKALATSIYA (uzoq vaqt biriktirilmagan yangi murojaatlar)
+# ============================================
+
+def escalation_candidates(now):
+    cutoff = now - timedelta(hours=_setting('TICKET_ESCALATE_AFTER_HOURS', DEFAULT_ESCALATE_AFTER_HOURS))
+    return Ticket.objects.filter(
+        status='new',
+        assigned_to__isnull=True,
+        escalated_at__isnull=True,
+        created_at__lt=cutoff,
+    )
+
+
+def _escalation_admins(tickets):
+    """
+    (tizim, viloyat) -> admin user id lari: viloyat admini, bo'lmasa respublika admini
+
+    Butun guruh uchun bitta so'rov.
+    """
+    rows = SystemResponsible.objects.filter(
+        Q(region_id__in={ticket.region_id for ticket in tickets}) | Q(region__isnull=True),
+        system_id__in={ticket.system_id for ticket in tickets},
+        role_in_system='admin',
+        user__is_active=True,
+    ).values_list('system_id', 'region_id', 'user_id')
+
+    admins = {}
+    for system_id, region_id, user_id in rows:
+        admins.setdefault((system_id, region_id), set()).add(user_id)
+    return {
+        (ticket.system_id, ticket.region_id): (
+            admins.get((ticket.system_id, ticket.region_id))
+            or admins.get((ticket.system_id, None))
+            or set()
+        )
+        for ticket in tickets
+    }
+
+
+def _escalate(tickets, now):
+    admins = _escalation_admins(tickets)
+    # update() - updated_at (arxivlash, ETag) o'zgarmaydi
+    Ticket.objects.filter(id__in=[ticket.id for ticket in tickets]).update(escalated_at=now)
+
+    TicketHistory.objects.bulk_create([
+        TicketHistory(
+            ticket=ticket,
+            changed_by=None,
+            action_type='escalated',
+            message=_('Murojaat uzoq vaqt biriktirilmadi - adminlarga eskalatsiya qilindi'),
+        )
+        for ticket in tickets
+    ])
+
+    items = []
+    for ticket in tickets:
+        text = _('Murojaat {} hali hech kimga biriktirilmagan: {}').format(
+            ticket.get_ticket_number(), ticket.system.name
+        )
+        for user_id in admins[(ticket.system_id, ticket.region_id)]:
+            items.append((user_id, 'ticket_escalated', _('Murojaat eskalatsiya qilindi'), text, ticket))
+    _notify(items)
+    return len(tickets)
+
+
+# ============================================
+# ESLATMALAR (harakatsiz texnik, baholanmagan murojaat)
+# ============================================
+
+def reminder_candidates(now):
+    stale = now - timedelta(hours=_setting('TICKET_REMINDER_AFTER_HOURS', DEFAULT_REMINDER_AFTER_HOURS))
+    rating_due = now - timedelta(days=_setting('TICKET_RATING_REMINDER_DAYS', DEFAULT_RATING_REMINDER_DAYS))
+    return Ticket.objects.filter(
+        # Texnik: ishlayotgan murojaat uzoq vaqt o'zgarmagan (eslatma har stale oralig'ida bittadan)
+        Q(status__in=WORKING_STATUSES, assigned_to__isnull=False, updated_at__lt=stale)
+        & (Q(reminded_at__isnull=True) | Q(reminded_at__lt=stale))
+        # Foydalanuvchi: baholash so'rovi (pending_approval ga o'tgandan keyin bir marta)
+        | Q(status='pending_approval', updated_at__lt=rating_due)
+        & (Q(reminded_at__isnull=True) | Q(reminded_at__lt=F('updated_at')))
+    )
+
+
+def _remind(tickets, now):
+    Ticket.objects.filter(id__in=[ticket.id for ticket in tickets]).update(reminded_at=now)
+
+    items = []
+    for ticket in tickets:
+        if ticket.status == 'pending_approval':
+            items.append((
+                ticket.user_id, 'rating_request', _('Murojaatni baholang'),
+                _('Murojaat {} hal qilindi - iltimos, baho bering').format(ticket.get_ticket_number()),
+                ticket,
+            ))
+        else:
+            items.append((
+                ticket.assigned_to_id, 'reminder', _('Eslatma'),
+                _('Murojaat {} uzoq vaqtdan beri yangilanmagan').format(ticket.get_ticket_number()),
+                ticket,
+            ))
+    _notify(items)
+    return len(tickets)
+
+
+def run_scheduler(batch_size=DEFAULT_BATCH_SIZE, now=None):
+    """
+    Muddati o'tgan murojaatlarni qayta ishlash (davriy, cron/systemd timer)
+
+    1. auto_resolved - TICKET_AUTO_RESOLVE_DAYS kun baholanmagan pending_approval
+    2. escalated - TICKET_ESCALATE_AFTER_HOURS soat biriktirilmagan yangi murojaat
+       (viloyat admini, bo'lmasa respublika admini)
+    3. reminded - harakatsiz texnik va baholash so'rovi
+
+    Har bir guruh alohida tranzaksiyada: bulk update, bulk tarix, bulk
+    bildirishnoma. Bir nechta node parallel ishga tushirishi mumkin.
+
+    Returns:
+        dict: {'auto_resolved', 'escalated', 'reminded'}
+    """
+    now = now or timezone.now()
+    return {
+        'auto_resolved': _run_in_batches(
+            auto_resolve_candidates(now).select_related('system'),
+            lambda tickets: _auto_resolve(tickets, now),
+            batch_size,
+        ),
+        'escalated': _run_in_batches(
+            escalation_candidates(now).select_related('system'),
+            lambda tickets: _escalate(tickets, now),
+            batch_size,
+        ),
+        'reminded': _run_in_batches(
+            reminder_candidates(now), lambda tickets: _remind(tickets, now), batch_size
+        ),
+    }
@@ -0,0 +1,95 @@
+# tickets/sla.py - SLA USTUNLARINI TARIXDAN TIKLASH (BACKFILL)
+
+from django.db import transaction
+from django.db.models import Exists, OuterRef, Subquery
+
+from .models import (
+    ArchivedTicket,
+    ArchivedTicketHistory,
+    ArchivedTicketMessage,
+    Ticket,
+    TicketHistory,
+    TicketMessage,
+    resolution_seconds,
+)
+
+
+DEFAULT_BATCH_SIZE = 2000
+ASSIGN_ACTIONS = ('assigned', 'reassigned')
+
+# (murojaat, xabarlar, tarix) - hot va arxiv jadvallari
+SOURCES = (
+    (Ticket, TicketMessage, TicketHistory),
+    (ArchivedTicket, ArchivedTicketMessage, ArchivedTicketHistory),
+)
+
+
+def _first_assignment(history_model):
+    return history_model.objects.filter(
+        ticket=OuterRef('pk'), action_type__in=ASSIGN_ACTIONS,
+    ).order_by('timestamp').values('timestamp')[:1]
+
+
+def _first_response(message_model):
+    # Murojaat egasidan boshqa kishining birinchi xabari
+    return message_model.objects.filter(
+        ticket=OuterRef('pk'),
+    ).exclude(sender=OuterRef('user')).order_by('created_at').values('created_at')[:1]
+
+
+def _backfill_batch(model, message_model, history_model, ids, force):
+    stats = {'assigned': 0, 'responded': 0, 'resolved': 0}
+    tickets = model.objects.filter(id__in=ids)
+
+    with transaction.atomic():
+        assignment = _first_assignment(history_model)
+        targets = tickets if force else tickets.filter(first_assigned_at__isnull=True)
+        stats['assigned'] = targets.filter(Exists(assignment)).update(first_assigned_at=Subquery(assignment))
+
+        response = _first_response(message_model)
+        targets = tickets if force else tickets.filter(first_response_at__isnull=True)
+        stats['responded'] = targets.filter(Exists(response)).update(first_response_at=Subquery(response))
+
+        changed = []
+        for ticket in tickets.only('id', 'status', 'created_at', 'resolved_at', 'resolution_seconds'):
+            value = resolution_seconds(ticket.status, ticket.created_at, ticket.resolved_at)
+            if value != ticket.resolution_seconds:
+                ticket.resolution_seconds = value
+                changed.append(ticket)
+        model.objects.bulk_update(changed, ['resolution_seconds'])
+        stats['resolved'] = len(changed)
+
+    return stats
+
+
+def backfill_sla_metrics(batch_size=DEFAULT_BATCH_SIZE, force=False, archived=True):
+    """
+    first_assigned_at, first_response_at va resolution_seconds ni to'ldirish
+
+    Mavjud murojaatlar (ustunlar qo'shilishidan oldingilar) uchun bir martalik:
+    birinchi biriktirish - TicketHistory (assigned/reassigned), birinchi javob -
+    egasidan boshqa kishining birinchi xabari. Har bir guruh (id bo'yicha)
+    alohida tranzaksiyada, UPDATE ... = (SELECT ...) bilan bazada hisoblanadi.
+    update() ishlatiladi - updated_at (arxivlash, ETag) o'zgarmaydi.
+
+    force=False - faqat bo'sh ustunlar to'ldiriladi.
+
+    Returns:
+        dict: {'tickets', 'assigned', 'responded', 'resolved'} - o'zgargan qatorlar
+    """
+    totals = {'tickets': 0, 'assigned': 0, 'responded': 0, 'resolved': 0}
+    for model, message_model, history_model in SOURCES if archived else SOURCES[:1]:
+        last_id = 0
+        while True:
+            ids = list(
+                model.objects.filter(id__gt=last_id)
+                .order_by('id').values_list('id', flat=True)[:batch_size]
+            )
+            if not ids:
+                break
+            stats = _backfill_batch(model, message_model, history_model, ids, force)
+            for key, value in stats.items():
+                totals[key] += value
+            totals['tickets'] += len(ids)
+            last_id = ids[-1]
+    return totals
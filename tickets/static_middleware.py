@@ -0,0 +1,37 @@
+# tickets/static_middleware.py - WHITENOISE (SYNC VA ASYNC REJIM)
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from whitenoise.middleware import WhiteNoiseMiddleware
+
+
+class AsyncWhiteNoiseMiddleware(WhiteNoiseMiddleware):
+    """
+    WhiteNoiseMiddleware ning ASGI da ham ishlaydigan varianti
+
+    Asl middleware faqat sync - zanjir boshida turgani uchun ASGI da har
+    bir so'rov (async viewlar ham) alohida threadga o'tkazilardi. Bu yerda
+    statik bo'lmagan so'rovlar to'g'ridan-to'g'ri keyingi async handlerga
+    uzatiladi, faqat fayl ochish threadda bajariladi. WSGI da o'zgarish yo'q.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response=None, *args, **kwargs):
+        super().__init__(get_response, *args, **kwargs)
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return super().__call__(request)
+
+    async def __acall__(self, request):
+        if self.autorefresh:
+            static_file = await sync_to_async(self.find_file, thread_sensitive=False)(request.path_info)
+        else:
+            static_file = self.files.get(request.path_info)
+        if static_file is not None:
+            return await sync_to_async(self.serve, thread_sensitive=False)(static_file, request)
+        return await self.get_response(request)
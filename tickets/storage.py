@@ -0,0 +1,230 @@
+# tickets/storage.py - CONTENT-ADDRESSED (SHA-256) BIRIKTIRMALAR OMBORI
+
+import hashlib
+import os
+import tempfile
+from collections import Counter
+from datetime import timedelta
+
+from django.apps import apps
+from django.core.files.storage import FileSystemStorage
+from django.db import transaction
+from django.db.models import F, FileField
+from django.utils import timezone
+from django.utils.deconstruct import deconstructible
+
+
+BLOB_PREFIX = 'blobs/'
+HASH_CHUNK_SIZE = 64 * 1024
+
+
+def _blob_name(sha256, extension):
+    """blobs/ab/cd/abcd...ef.png - katalog boshiga 65536 dan ko'p fayl tushmaydi"""
+    return f"{BLOB_PREFIX}{sha256[:2]}/{sha256[2:4]}/{sha256}{extension}"
+
+
+@deconstructible
+class DeduplicatedStorage(FileSystemStorage):
+    """
+    Bir xil fayllar diskda bir marta saqlanadi
+
+    - Yuklash diskka oqim sifatida yoziladi va shu vaqtning o'zida SHA-256 hisoblanadi
+    - Blob allaqachon mavjud bo'lsa - vaqtinchalik fayl o'chiriladi,
+      faqat StoredBlob.ref_count oshiriladi (metadata-only write)
+    - delete() faylni o'chirmaydi, faqat ref_count ni kamaytiradi;
+      hech kim ishlatmaydigan bloblarni gc_attachment_blobs o'chiradi
+
+    Eski (blobs/ dan tashqari) fayllar avvalgidek o'qiladi va o'chiriladi.
+    """
+
+    def get_available_name(self, name, max_length=None):
+        # Yakuniy nom _save() da kontent xeshidan olinadi
+        return name
+
+    def _save(self, name, content):
+        extension = os.path.splitext(name)[1].lower()[:16]
+        tmp_dir = self.path(f'{BLOB_PREFIX}tmp')
+        os.makedirs(tmp_dir, exist_ok=True)
+
+        digest = hashlib.sha256()
+        size = 0
+        fd, tmp_path = tempfile.mkstemp(dir=tmp_dir)
+        try:
+            with os.fdopen(fd, 'wb') as tmp_file:
+                for chunk in content.chunks(HASH_CHUNK_SIZE):
+                    if isinstance(chunk, str):
+                        chunk = chunk.encode()
+                    digest.update(chunk)
+                    size += len(chunk)
+                    tmp_file.write(chunk)
+
+            sha256 = digest.hexdigest()
+            blob_name = _blob_name(sha256, extension)
+            full_path = self.path(blob_name)
+
+            # Avval havola yoziladi - parallel GC bu blobni o'chirmasligi uchun
+            self._add_reference(blob_name, sha256, size)
+
+            if os.path.exists(full_path):
+                # Dublikat - diskka qayta yozilmaydi
+                os.remove(tmp_path)
+            else:
+                os.makedirs(os.path.dirname(full_path), exist_ok=True)
+                if self.file_permissions_mode is not None:
+                    os.chmod(tmp_path, self.file_permissions_mode)
+                os.replace(tmp_path, full_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        return blob_name
+
+    def _add_reference(self, name, sha256, size):
+        """
+        Blob yozuvini yaratish yoki ref_count ni oshirish
+
+        GC yozuvni qulflab o'chirayotgan bo'lsa UPDATE uning tranzaksiyasi
+        tugashini kutadi va 0 qator yangilaydi - unda yozuv (va fayl, _save da)
+        qaytadan yaratiladi. Shu tufayli qaytganda fayl GC tomonidan
+        o'chirilmaydi: yo allaqachon o'chirilgan, yo yangi havola ko'rinadi.
+        """
+        StoredBlob = apps.get_model('tickets', 'StoredBlob')
+        while True:
+            blob, created = StoredBlob.objects.get_or_create(
+                name=name,
+                defaults={'sha256': sha256, 'size': size, 'ref_count': 1},
+            )
+            if created:
+                return
+            updated = StoredBlob.objects.filter(pk=blob.pk).update(
+                ref_count=F('ref_count') + 1,
+                last_referenced_at=timezone.now(),
+            )
+            if updated:
+                return
+
+    def delete(self, name):
+        if not name.startswith(BLOB_PREFIX):
+            return super().delete(name)
+
+        # Blobni boshqa yozuvlar ham ishlatishi mumkin - faqat hisoblagich
+        StoredBlob = apps.get_model('tickets', 'StoredBlob')
+        StoredBlob.objects.filter(name=name, ref_count__gt=0).update(
+            ref_count=F('ref_count') - 1
+        )
+
+
+attachment_storage_instance = DeduplicatedStorage()
+
+
+def attachment_storage():
+    """FileField(storage=...) uchun callable (migratsiyalarda havola sifatida saqlanadi)"""
+    return attachment_storage_instance
+
+
+# ============================================
+# GARBAGE COLLECTION
+# ============================================
+
+def iter_blob_fields():
+    """DeduplicatedStorage ishlatadigan barcha (model, maydon) juftliklari"""
+    for model in apps.get_models():
+        for field in model._meta.concrete_fields:
+            if isinstance(field, FileField) and isinstance(field.storage, DeduplicatedStorage):
+                yield model, field
+
+
+def count_references():
+    """Har bir blob nechta yozuvda ishlatilishini hisoblash"""
+    references = Counter()
+    for model, field in iter_blob_fields():
+        names = (
+            model._default_manager
+            .filter(**{f'{field.name}__startswith': BLOB_PREFIX})
+            .values_list(field.name, flat=True)
+        )
+        references.update(names.iterator(chunk_size=5000))
+    return references
+
+
+def _delete_blob(storage, blob):
+    """
+    Yozuv va faylni bitta tranzaksiyada o'chirish (yozuv qulflangan holda)
+
+    Shu orada yangi havola paydo bo'lgan bo'lsa (last_referenced_at o'zgargan)
+    tegilmaydi. Fayl COMMIT dan oldin o'chiriladi: parallel yuklashning
+    _add_reference i qulf bo'shashini kutadi va undan keyin faylni yo'q deb
+    ko'rib qayta yozadi - yangi havola o'chirilgan faylga qolmaydi.
+    """
+    StoredBlob = apps.get_model('tickets', 'StoredBlob')
+    with transaction.atomic():
+        locked = (
+            StoredBlob.objects.select_for_update()
+            .filter(pk=blob.pk, last_referenced_at=blob.last_referenced_at)
+            .first()
+        )
+        if locked is None:
+            return False
+        locked.delete()
+        FileSystemStorage.delete(storage, blob.name)
+    return True
+
+
+def collect_garbage(grace_hours=24, dry_run=False):
+    """
+    ref_count larni haqiqiy havolalar bo'yicha qayta hisoblash va
+    hech kim ishlatmaydigan bloblarni o'chirish
+
+    grace_hours: yaqinda yuklangan (hali modelga saqlanmagan bo'lishi mumkin)
+    bloblarga tegmaslik uchun kutish vaqti
+
+    Returns:
+        dict: {'recounted', 'deleted', 'freed_bytes', 'orphan_files'}
+    """
+    from .previews import delete_previews
+
+    StoredBlob = apps.get_model('tickets', 'StoredBlob')
+    storage = attachment_storage_instance
+    references = count_references()
+    cutoff = timezone.now() - timedelta(hours=grace_hours)
+    stats = {'recounted': 0, 'deleted': 0, 'freed_bytes': 0, 'orphan_files': 0}
+
+    known_names = set()
+    for blob in StoredBlob.objects.iterator(chunk_size=2000):
+        known_names.add(blob.name)
+        actual = references.get(blob.name, 0)
+
+        if actual == 0 and blob.last_referenced_at < cutoff:
+            stats['deleted'] += 1
+            stats['freed_bytes'] += blob.size
+            if not dry_run and _delete_blob(storage, blob):
+                delete_previews([blob.name])
+            continue
+
+        if actual != blob.ref_count:
+            stats['recounted'] += 1
+            if not dry_run:
+                StoredBlob.objects.filter(pk=blob.pk).update(ref_count=actual)
+
+    # StoredBlob yozuvi yo'q fayllar (masalan, to'xtatilgan yuklashlar)
+    blob_root = storage.path(BLOB_PREFIX)
+    cutoff_ts = cutoff.timestamp()
+    for dirpath, _dirs, filenames in os.walk(blob_root):
+        for filename in filenames:
+            full_path = os.path.join(dirpath, filename)
+            name = os.path.relpath(full_path, storage.location).replace(os.sep, '/')
+            if name in known_names or references.get(name):
+                continue
+            try:
+                stat = os.stat(full_path)
+            except FileNotFoundError:
+                continue
+            if stat.st_mtime >= cutoff_ts:
+                continue
+            stats['orphan_files'] += 1
+            stats['freed_bytes'] += stat.st_size
+            if not dry_run:
+                os.remove(full_path)
+
+    return stats
@@ -23,6 +23,7 @@ urlpatterns = [
     path('technician/', views.technician_tickets, name='technician_tickets'),
     path('<int:pk>/change-status/', views.change_ticket_status, name='change_ticket_status'),
     path('<int:pk>/take/', views.take_ticket, name='take_ticket'),
+    path('take-next/', views.take_next_ticket, name='take_next_ticket'),
     path('new/', views.new_tickets_list, name='new_tickets_list'),
     
     # ============================================
@@ -0,0 +1,14 @@
+from django.urls import path
+from . import views_api
+
+app_name = 'api'
+
+urlpatterns = [
+    # ============================================
+    # JSON API v1 (sessiya bo'yicha autentifikatsiya)
+    # ============================================
+    path('tickets/', views_api.tickets_list, name='tickets'),
+    path('tickets/<int:pk>/', views_api.ticket_detail, name='ticket_detail'),
+    path('tickets/<int:pk>/messages/', views_api.ticket_messages, name='ticket_messages'),
+    path('notifications/', views_api.notifications_list, name='notifications'),
+]
@@ -4,12 +4,23 @@ from django.contrib import messages
 from django.utils.translation import gettext_lazy as _
 from django.db.models import Q, Count, Avg
 from django.utils import timezone
+from django.utils.text import Truncator
+from django.views.decorators.http import require_POST
 from datetime import timedelta
-from .models import Ticket, TicketMessage, TicketHistory
+from .models import Ticket, TicketMessage, TicketHistory, ArchivedTicket
+from .archive import get_ticket_or_archived, ticket_source
+from .assignment import auto_assign
+from .queue import claim_next_ticket, queue_ordering
+from .conditional import conditional_view, ticket_page_state
+from .previews import get_preview_urls
+from . import metrics
+from .query_budget import query_budget
+from .db_router import replica_reads
 from .forms import TicketCreateForm, TicketMessageForm, TicketRatingForm, TicketFilterForm
 from systems.models import SystemResponsible, System
 from notifications.models import Notification
 from accounts.models import User
+from accounts.search import search_users
 from accounts.utils import (
     get_admin_systems, 
     get_admin_regions, 
@@ -46,6 +57,7 @@ def require_admin(view_func):
 # USER VIEWS
 # ============================================
 
+@query_budget(18)
 @login_required
 def dashboard(request):
     """Foydalanuvchi dashboard"""
@@ -72,6 +84,9 @@ def dashboard(request):
     
     # Filtrlash
     if filter_form.is_valid():
+        # Arxivdan qidirish (so'ralganda)
+        if filter_form.cleaned_data.get('archived'):
+            tickets = ticket_source(archived=True).filter(user=user)
         if filter_form.cleaned_data.get('system'):
             tickets = tickets.filter(system=filter_form.cleaned_data['system'])
         if filter_form.cleaned_data.get('status'):
@@ -83,7 +98,7 @@ def dashboard(request):
         if filter_form.cleaned_data.get('date_to'):
             tickets = tickets.filter(created_at__date__lte=filter_form.cleaned_data['date_to'])
     
-    tickets = tickets.order_by('-created_at')[:50]
+    tickets = tickets.select_related('system', 'assigned_to').order_by('-created_at')[:50]
     
     # Tizimlar ro'yxati (modal uchun)
     all_systems = System.objects.filter(is_active=True).order_by('name')
@@ -116,8 +131,8 @@ def create_ticket(request):
             ticket.region = request.user.region
             ticket.status = 'new'
             
-            # ❌ OLIB TASHLANDI: Avtomatik texnikka biriktirish
-            # ✅ YANGI: Hech kimga biriktirilmaydi - texniklar o'zlari oladi
+            # Hech kimga biriktirilmaydi - texniklar o'zlari oladi
+            # (tizimda auto/hybrid rejim bo'lsa pastda auto_assign biriktiradi)
             ticket.assigned_to = None
             ticket.assignment_type = ''  # Bo'sh qoldirish
             
@@ -131,6 +146,9 @@ def create_ticket(request):
                 message=_('Murojaat yaratildi')
             )
             
+            # Tizim sozlamasiga ko'ra eng kam yuklangan texnikka biriktirish
+            auto_assign(ticket)
+            
             # ✅ YANGILANGAN: Notifikatsiyalar
             # Faqat adminlarga yuboriladi, texniklarga EMAS
             recipients = []
@@ -155,7 +173,11 @@ def create_ticket(request):
             
             # ❌ OLIB TASHLANDI: Default texnikka notifikatsiya
             
+            # Xulosa rejimidagi adminlar - send_notification_digests davriy xabar beradi
+            recipients = [recipient for recipient in recipients if not recipient.new_ticket_digest]
+            
             # Notifikatsiya yuborish
+            metrics.observe('notification_fanout_recipients', len(recipients), type='new_ticket')
             for recipient in recipients:
                 Notification.objects.create(
                     user=recipient,
@@ -176,10 +198,13 @@ def create_ticket(request):
     return render(request, 'tickets/create_ticket.html', {'form': form})
 
 
+@query_budget(24)
 @login_required
+@conditional_view(ticket_page_state)
 def ticket_detail(request, pk):
-    """Murojaat tafsilotlari - ADMIN RUXSATLARI BILAN"""
-    ticket = get_object_or_404(Ticket, pk=pk)
+    """Murojaat tafsilotlari - ADMIN RUXSATLARI BILAN (arxivdagilar ham)"""
+    ticket = get_ticket_or_archived(pk)
+    is_archived = isinstance(ticket, ArchivedTicket)
     
     # ============================================
     # RUXSAT TEKSHIRISH
@@ -210,12 +235,20 @@ def ticket_detail(request, pk):
     # ============================================
     # CHAT XABARLARI
     # ============================================
-    messages_list = ticket.messages.all().order_by('created_at')
+    messages_list = list(ticket.messages.select_related('sender').order_by('created_at'))
+    
+    # Rasm/PDF previewlari (bitta so'rov) - asl fayl faqat bosilganda yuklanadi
+    preview_urls = get_preview_urls(
+        [ticket.attachment.name] + [msg.attachment.name for msg in messages_list]
+    )
+    ticket.preview_url = preview_urls.get(ticket.attachment.name)
+    for msg in messages_list:
+        msg.preview_url = preview_urls.get(msg.attachment.name)
     
     # ============================================
     # TARIX (AUDIT LOG)
     # ============================================
-    history = ticket.history.all().order_by('timestamp')
+    history = ticket.history.select_related('changed_by').order_by('timestamp')
     
     # ============================================
     # YANGI XABAR FORMASI
@@ -226,7 +259,7 @@ def ticket_detail(request, pk):
     # BAHOLASH FORMASI
     # ============================================
     rating_form = None
-    if ticket.status == 'pending_approval' and request.user == ticket.user:
+    if not is_archived and ticket.status == 'pending_approval' and request.user == ticket.user:
         rating_form = TicketRatingForm(instance=ticket)
     
     # ============================================
@@ -234,7 +267,7 @@ def ticket_detail(request, pk):
     # ============================================
     available_technicians = None
     
-    if request.user.is_admin():
+    if request.user.is_admin() and not is_archived:
         # SuperAdmin uchun - barcha texniklar
         if request.user.is_superadmin():
             available_technicians = User.objects.filter(
@@ -286,6 +319,7 @@ def ticket_detail(request, pk):
         'message_form': message_form,
         'rating_form': rating_form,
         'available_technicians': available_technicians,
+        'is_archived': is_archived,
     }
     
     return render(request, 'tickets/ticket_detail.html', context)
@@ -318,14 +352,17 @@ def send_message(request, pk):
                 message=_('Yangi xabar qo\'shildi')
             )
             
-            # Notification (qabul qiluvchiga)
+            # Notification (qabul qiluvchiga) - o'qilmagani bo'lsa shu qator yangilanadi
             recipient = ticket.user if request.user == ticket.assigned_to else ticket.assigned_to
             if recipient:
-                Notification.objects.create(
+                Notification.objects.coalesce(
                     user=recipient,
                     notification_type='new_message',
                     title=_('Yangi xabar'),
-                    text=_('Murojaat bo\'yicha yangi xabar: {}').format(ticket.get_ticket_number()),
+                    text=_('Murojaat {}: {}').format(
+                        ticket.get_ticket_number(),
+                        Truncator(ticket_message.message).chars(100)
+                    ),
                     url=f'/tickets/{ticket.id}/'
                 )
             
@@ -391,6 +428,7 @@ def rate_ticket(request, pk):
             recipients.extend(resp_admins)
             
             # Notifikatsiya yuborish
+            metrics.observe('notification_fanout_recipients', len(recipients), type='ticket_rated')
             for recipient in recipients:
                 if rating >= 4:
                     notif_text = _('Murojaat {} {}⭐ bilan baholandi (Yaxshi!)').format(
@@ -474,6 +512,7 @@ def reopen_ticket(request, pk):
     return redirect('tickets:ticket_detail', pk=pk)
 
 
+@query_budget(18)
 @login_required
 def system_responsibles_view(request):
     """Tizimlar bo'yicha mas'ullar ro'yxati"""
@@ -482,43 +521,37 @@ def system_responsibles_view(request):
     # Foydalanuvchi viloyati bo'yicha mas'ullar
     systems = System.objects.filter(is_active=True)
     
+    # Viloyat va respublika (default) mas'ullari - bitta so'rov, tizimlar bo'yicha guruhlanadi
+    responsibles = SystemResponsible.objects.filter(
+        system__is_active=True
+    ).filter(
+        Q(region=user_region) | Q(region__isnull=True, is_default=True)
+    ).select_related('user', 'region')
+    
+    by_system = {}
+    for resp in responsibles:
+        by_system.setdefault(resp.system_id, []).append(resp)
+    
+    user_region_id = user_region.id if user_region else None
     responsibles_data = []
     for system in systems:
-        # Region bo'yicha mas'ul admin
-        admin = SystemResponsible.objects.filter(
-            system=system,
-            region=user_region,
-            role_in_system='admin'
-        ).first()
+        items = by_system.get(system.id, [])
+        regional = [r for r in items if r.region_id == user_region_id]
+        default = [r for r in items if r.region_id is None and r.is_default]
         
-        # Agar topilmasa - respublika admini
-        if not admin:
-            admin = SystemResponsible.objects.filter(
-                system=system,
-                region__isnull=True,
-                is_default=True,
-                role_in_system='admin'
-            ).first()
+        # Region bo'yicha mas'ul admin, topilmasa - respublika admini
+        admins = [r for r in regional if r.role_in_system == 'admin']
+        if not admins:
+            admins = [r for r in default if r.role_in_system == 'admin']
         
-        # Region bo'yicha mas'ul texniklar
-        technicians = SystemResponsible.objects.filter(
-            system=system,
-            region=user_region,
-            role_in_system='technician'
-        )
-        
-        # Agar topilmasa - respublika texniklari
-        if not technicians.exists():
-            technicians = SystemResponsible.objects.filter(
-                system=system,
-                region__isnull=True,
-                is_default=True,
-                role_in_system='technician'
-            )
+        # Region bo'yicha mas'ul texniklar, topilmasa - respublika texniklari
+        technicians = [r for r in regional if r.role_in_system == 'technician']
+        if not technicians:
+            technicians = [r for r in default if r.role_in_system == 'technician']
         
         responsibles_data.append({
             'system': system,
-            'admin': admin,
+            'admin': admins[0] if admins else None,
             'technicians': technicians,
         })
     
@@ -554,6 +587,7 @@ def system_responsibles_modal_view(request, system_id):
 
 # tickets/views.py - technician_tickets TO'G'RILASH
 
+@query_budget(25)
 @login_required
 @require_technician
 def technician_tickets(request):
@@ -597,7 +631,11 @@ def technician_tickets(request):
             new_tickets_query = new_tickets_query.filter(region_id__in=responsible_region_ids)
     # Agar default texnik bo'lsa - barcha viloyatlar
     
-    new_tickets = new_tickets_query.order_by('-created_at')[:20]
+    # Navbat tartibi: ustuvorlik + kutish vaqti yoki eng yangilari (?order=)
+    filter_form = TicketFilterForm(request.GET)
+    ordering = queue_ordering(filter_form.cleaned_data.get('order') if filter_form.is_valid() else None)
+    
+    new_tickets = new_tickets_query.select_related('user', 'system', 'region').order_by(*ordering)[:20]
     
     # Mening murojaatlarim
     my_tickets = Ticket.objects.filter(assigned_to=request.user)
@@ -615,7 +653,6 @@ def technician_tickets(request):
     }
     
     # Filter
-    filter_form = TicketFilterForm(request.GET)
     if filter_form.is_valid():
         if filter_form.cleaned_data.get('status'):
             my_tickets = my_tickets.filter(status=filter_form.cleaned_data['status'])
@@ -624,7 +661,7 @@ def technician_tickets(request):
         if filter_form.cleaned_data.get('system'):
             my_tickets = my_tickets.filter(system=filter_form.cleaned_data['system'])
     
-    my_tickets = my_tickets.order_by('-created_at')[:50]
+    my_tickets = my_tickets.select_related('user', 'system', 'region').order_by(*ordering)[:50]
     
     context = {
         'stats': stats,
@@ -708,8 +745,45 @@ def take_ticket(request, pk):
     messages.success(request, _('Murojaat muvaffaqiyatli qabul qilindi!'))
     return redirect('tickets:ticket_detail', pk=pk)
 
+
+@login_required
+@require_technician
+@require_POST
+def take_next_ticket(request):
+    """Navbatdagi eng yuqori balli murojaatni olish (ustuvorlik + kutish vaqti)"""
+    
+    ticket = claim_next_ticket(request.user)
+    if ticket is None:
+        messages.info(request, _('Navbatda olish mumkin bo\'lgan murojaat yo\'q.'))
+        return redirect('tickets:new_tickets_list')
+    
+    # Audit log
+    TicketHistory.objects.create(
+        ticket=ticket,
+        changed_by=request.user,
+        action_type='assigned',
+        new_value=request.user.get_full_name(),
+        message=_("{} navbatdagi murojaatni oldi").format(request.user.get_full_name())
+    )
+    
+    # Notifikatsiya (foydalanuvchiga)
+    Notification.objects.create(
+        user_id=ticket.user_id,
+        notification_type='ticket_assigned',
+        title=_('Murojaatingiz qabul qilindi'),
+        text=_('Murojaat {} texnik tomonidan qabul qilindi: {}').format(
+            ticket.get_ticket_number(),
+            request.user.get_full_name()
+        ),
+        url=f'/tickets/{ticket.id}/'
+    )
+    
+    messages.success(request, _('Murojaat {} sizga biriktirildi.').format(ticket.get_ticket_number()))
+    return redirect('tickets:ticket_detail', pk=ticket.pk)
+
 # tickets/views.py - new_tickets_list TO'G'RILASH
 
+@query_budget(25)
 @login_required
 @require_technician
 def new_tickets_list(request):
@@ -760,8 +834,11 @@ def new_tickets_list(request):
     
     # FILTRLASH
     filter_form = TicketFilterForm(request.GET)
+    ordering = queue_ordering()
     
     if filter_form.is_valid():
+        ordering = queue_ordering(filter_form.cleaned_data.get('order'))
+        
         if filter_form.cleaned_data.get('system'):
             new_tickets_query = new_tickets_query.filter(system=filter_form.cleaned_data['system'])
         
@@ -774,7 +851,7 @@ def new_tickets_list(request):
         if filter_form.cleaned_data.get('date_to'):
             new_tickets_query = new_tickets_query.filter(created_at__date__lte=filter_form.cleaned_data['date_to'])
     
-    new_tickets = new_tickets_query.order_by('-created_at')
+    new_tickets = new_tickets_query.select_related('user', 'system', 'region').order_by(*ordering)
     
     # Statistika
     stats = {
@@ -836,8 +913,8 @@ def change_ticket_status(request, pk):
                 )
             )
             
-            # Notification (foydalanuvchiga)
-            Notification.objects.create(
+            # Notification (foydalanuvchiga) - o'qilmagani bo'lsa shu qator yangilanadi
+            Notification.objects.coalesce(
                 user=ticket.user,
                 notification_type='status_changed',
                 title=_('Murojaat holati o\'zgartirildi'),
@@ -860,8 +937,10 @@ def change_ticket_status(request, pk):
 # ============================================
 
 
+@query_budget(22)
 @login_required
 @require_admin
+@replica_reads
 def admin_dashboard(request):
     """Admin dashboard - TIZIM VA VILOYAT BO'YICHA FILTRLANGAN"""
     
@@ -878,16 +957,17 @@ def admin_dashboard(request):
     tickets = Ticket.objects.all()
     tickets = filter_tickets_for_admin(tickets, request.user)
     
-    # Umumiy statistika
-    stats = {
-        'total': tickets.count(),
-        'today': tickets.filter(created_at__date=today).count(),
-        'in_progress': tickets.filter(status='in_progress').count(),
-        'resolved': tickets.filter(status='resolved').count(),
-        'rejected': tickets.filter(status='rejected').count(),
-        'reopened': tickets.filter(status='reopened').count(),
-        'avg_rating': tickets.filter(rating__isnull=False).aggregate(Avg('rating'))['rating__avg'] or 0,
-    }
+    # Umumiy statistika - bitta so'rov (Avg NULL baholarni o'zi tashlab ketadi)
+    stats = tickets.aggregate(
+        total=Count('id'),
+        today=Count('id', filter=Q(created_at__date=today)),
+        in_progress=Count('id', filter=Q(status='in_progress')),
+        resolved=Count('id', filter=Q(status='resolved')),
+        rejected=Count('id', filter=Q(status='rejected')),
+        reopened=Count('id', filter=Q(status='reopened')),
+        avg_rating=Avg('rating'),
+    )
+    stats['avg_rating'] = stats['avg_rating'] or 0
     
     # Tizimlar bo'yicha
     by_system = tickets.values('system__name').annotate(
@@ -931,6 +1011,10 @@ def admin_dashboard(request):
     filtered_tickets = tickets
     
     if filter_form.is_valid():
+        # Arxivdan qidirish (so'ralganda)
+        if filter_form.cleaned_data.get('archived'):
+            filtered_tickets = filter_tickets_for_admin(ticket_source(archived=True), request.user)
+        
         if filter_form.cleaned_data.get('system'):
             filtered_tickets = filtered_tickets.filter(system=filter_form.cleaned_data['system'])
         
@@ -954,7 +1038,9 @@ def admin_dashboard(request):
             filtered_tickets = filtered_tickets.filter(created_at__date__lte=filter_form.cleaned_data['date_to'])
     
     # ✅ Pagination (optional)
-    filtered_tickets = filtered_tickets.order_by('-created_at')[:100]
+    filtered_tickets = filtered_tickets.select_related(
+        'user', 'system', 'region', 'assigned_to'
+    ).order_by('-created_at')[:100]
     
     # ✅ All regions for template
     from accounts.models import Region
@@ -1021,11 +1107,12 @@ def assign_ticket(request, pk):
     return redirect('tickets:ticket_detail', pk=pk)
 
 
+@query_budget(15)
 @login_required
 @require_admin
 def users_list(request):
     """Foydalanuvchilar ro'yxati"""
-    users = User.objects.all().order_by('-date_joined')
+    users = User.objects.select_related('region').order_by('-date_joined')
     
     # Filter
     role = request.GET.get('role')
@@ -1038,11 +1125,7 @@ def users_list(request):
     
     search = request.GET.get('search')
     if search:
-        users = users.filter(
-            Q(first_name__icontains=search) |
-            Q(last_name__icontains=search) |
-            Q(username__icontains=search)
-        )
+        users = search_users(users, search)
     
     from accounts.models import Region
     all_regions = Region.objects.filter(is_active=True).order_by('name')
@@ -0,0 +1,283 @@
+import base64
+import binascii
+from functools import wraps
+
+from django.conf import settings
+from django.http import JsonResponse
+from django.views.decorators.http import require_safe
+
+from accounts.utils import filter_tickets_for_user
+from notifications.models import Notification
+from .conditional import conditional_view, notifications_state, ticket_api_state
+from .models import ArchivedTicket, ArchivedTicketMessage, Ticket, TicketMessage
+from .query_budget import query_budget
+
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 200
+
+
+class ApiError(Exception):
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.message = message
+        self.status = status
+
+
+def api_response(data, status=200):
+    """Ixcham JSON (bo'shliqsiz, UTF-8 matn escape qilinmaydi)"""
+    return JsonResponse(
+        data, status=status,
+        json_dumps_params={'separators': (',', ':'), 'ensure_ascii': False},
+    )
+
+
+def api_view(view_func):
+    """
+    API view: faqat GET/HEAD, sessiya bo'yicha autentifikatsiya
+
+    Tizimga kirmagan bo'lsa login sahifasiga redirect emas, 401 JSON.
+    """
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        if not request.user.is_authenticated:
+            return api_response({'error': 'authentication_required'}, status=401)
+        try:
+            return view_func(request, *args, **kwargs)
+        except ApiError as error:
+            return api_response({'error': error.message}, status=error.status)
+    return require_safe(wrapper)
+
+
+# ============================================
+# MAYDONLAR (?fields=) -> values()
+# ============================================
+
+def _datetime(column):
+    def serialize(row):
+        value = row[column]
+        return value.isoformat() if value else None
+    return (column,), serialize
+
+
+def _plain(column):
+    return (column,), lambda row: row[column]
+
+
+def _file(column):
+    def serialize(row):
+        return settings.MEDIA_URL + row[column] if row[column] else None
+    return (column,), serialize
+
+
+def _person(field):
+    columns = (f'{field}_id', f'{field}__last_name', f'{field}__first_name', f'{field}__middle_name')
+
+    def serialize(row):
+        if row[columns[0]] is None:
+            return None
+        # User.get_full_name bilan bir xil tartib
+        name = ' '.join(part for part in (row[columns[1]], row[columns[2]], row[columns[3]]) if part)
+        return {'id': row[columns[0]], 'name': name}
+    return columns, serialize
+
+
+def _named(field):
+    columns = (f'{field}_id', f'{field}__name')
+
+    def serialize(row):
+        if row[columns[0]] is None:
+            return None
+        return {'id': row[columns[0]], 'name': row[columns[1]]}
+    return columns, serialize
+
+
+def _ticket_number():
+    # Ticket.get_ticket_number bilan bir xil
+    return ('id', 'created_at'), lambda row: f"#{row['created_at'].year}-{row['id']:04d}"
+
+
+# API maydoni -> (values() ustunlari, qatorni serializatsiya qilish)
+TICKET_FIELDS = {
+    'id': _plain('id'),
+    'number': _ticket_number(),
+    'status': _plain('status'),
+    'priority': _plain('priority'),
+    'system': _named('system'),
+    'region': _named('region'),
+    'user': _person('user'),
+    'assigned_to': _person('assigned_to'),
+    'description': _plain('description'),
+    'attachment': _file('attachment'),
+    'rating': _plain('rating'),
+    'rating_comment': _plain('rating_comment'),
+    'assignment_type': _plain('assignment_type'),
+    'created_at': _datetime('created_at'),
+    'updated_at': _datetime('updated_at'),
+    'resolved_at': _datetime('resolved_at'),
+}
+TICKET_DEFAULT_FIELDS = (
+    'id', 'number', 'status', 'priority', 'system', 'region', 'assigned_to', 'created_at', 'updated_at',
+)
+
+MESSAGE_FIELDS = {
+    'id': _plain('id'),
+    'sender': _person('sender'),
+    'message': _plain('message'),
+    'attachment': _file('attachment'),
+    'created_at': _datetime('created_at'),
+}
+MESSAGE_DEFAULT_FIELDS = tuple(MESSAGE_FIELDS)
+
+NOTIFICATION_FIELDS = {
+    'id': _plain('id'),
+    'type': _plain('notification_type'),
+    'title': _plain('title'),
+    'text': _plain('text'),
+    'url': _plain('url'),
+    'count': _plain('count'),
+    # is_read yoki User.notifications_read_until (Notification.objects.with_read_state)
+    'is_read': (('read',), lambda row: row['read']),
+    'created_at': _datetime('created_at'),
+}
+NOTIFICATION_DEFAULT_FIELDS = tuple(NOTIFICATION_FIELDS)
+
+
+def parse_fields(request, available, default):
+    """?fields=id,status,system -> [(nom, serializer)], values() ustunlari"""
+    raw = request.GET.get('fields')
+    names = [name.strip() for name in raw.split(',') if name.strip()] if raw else list(default)
+    unknown = [name for name in names if name not in available]
+    if unknown:
+        raise ApiError(f"unknown_fields: {','.join(unknown)}; available: {','.join(available)}")
+
+    columns = {'id'}
+    for name in names:
+        columns.update(available[name][0])
+    return [(name, available[name][1]) for name in dict.fromkeys(names)], sorted(columns)
+
+
+def serialize_rows(rows, fields):
+    return [{name: serialize(row) for name, serialize in fields} for row in rows]
+
+
+# ============================================
+# KEYSET KURSOR
+# ============================================
+
+def encode_cursor(pk):
+    return base64.urlsafe_b64encode(str(pk).encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    try:
+        return int(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode())
+    except (ValueError, binascii.Error, UnicodeDecodeError):
+        raise ApiError('invalid_cursor')
+
+
+def parse_limit(request):
+    try:
+        limit = int(request.GET.get('limit', DEFAULT_LIMIT))
+    except ValueError:
+        raise ApiError('invalid_limit')
+    return max(1, min(limit, MAX_LIMIT))
+
+
+def keyset_page(request, queryset, fields, columns, descending=True):
+    """
+    id bo'yicha keyset sahifalash: OFFSET yo'q, sahifa qanchalik chuqur
+    bo'lmasin so'rov bir xil tez (pk indeksi bo'yicha)
+
+    Javob: {'results': [...], 'next_cursor': '...' | None}
+    """
+    limit = parse_limit(request)
+    cursor = request.GET.get('cursor')
+    if cursor:
+        after = decode_cursor(cursor)
+        queryset = queryset.filter(id__lt=after) if descending else queryset.filter(id__gt=after)
+
+    ordered = queryset.order_by('-id' if descending else 'id')
+    rows = list(ordered.values(*columns)[:limit + 1])
+    next_cursor = encode_cursor(rows[limit - 1]['id']) if len(rows) > limit else None
+    return {'results': serialize_rows(rows[:limit], fields), 'next_cursor': next_cursor}
+
+
+def _int_param(request, name):
+    value = request.GET.get(name)
+    if not value:
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        raise ApiError(f'invalid_{name}')
+
+
+def _message_model(user, pk):
+    """Ticket xabarlari modeli (hot yoki arxiv) - ticketni ko'rish ruxsati bo'lsa"""
+    for model, message_model in ((Ticket, TicketMessage), (ArchivedTicket, ArchivedTicketMessage)):
+        if filter_tickets_for_user(model.objects.filter(pk=pk), user).exists():
+            return message_model
+    raise ApiError('not_found', status=404)
+
+
+# ============================================
+# ENDPOINTLAR
+# ============================================
+
+@query_budget(12)
+@api_view
+def tickets_list(request):
+    """
+    GET /api/v1/tickets/?fields=&status=&priority=&system=&region=&archived=1&cursor=&limit=
+
+    Foydalanuvchi ko'ra oladigan murojaatlar (ticket_detail qoidalari bilan bir xil).
+    """
+    fields, columns = parse_fields(request, TICKET_FIELDS, TICKET_DEFAULT_FIELDS)
+    model = ArchivedTicket if request.GET.get('archived') == '1' else Ticket
+    tickets = filter_tickets_for_user(model.objects.all(), request.user)
+
+    for param in ('status', 'priority'):
+        if request.GET.get(param):
+            tickets = tickets.filter(**{param: request.GET[param]})
+    for param in ('system', 'region'):
+        value = _int_param(request, param)
+        if value is not None:
+            tickets = tickets.filter(**{f'{param}_id': value})
+
+    return api_response(keyset_page(request, tickets, fields, columns))
+
+
+@query_budget(16)
+@api_view
+@conditional_view(ticket_api_state)
+def ticket_detail(request, pk):
+    """GET /api/v1/tickets/<id>/?fields= (arxivdagisi ham)"""
+    fields, columns = parse_fields(request, TICKET_FIELDS, tuple(TICKET_FIELDS))
+    for model in (Ticket, ArchivedTicket):
+        row = filter_tickets_for_user(model.objects.filter(pk=pk), request.user).values(*columns).first()
+        if row is not None:
+            return api_response(serialize_rows([row], fields)[0])
+    raise ApiError('not_found', status=404)
+
+
+@query_budget(18)
+@api_view
+@conditional_view(ticket_api_state)
+def ticket_messages(request, pk):
+    """GET /api/v1/tickets/<id>/messages/?fields=&cursor=&limit= (eskisidan yangisiga)"""
+    fields, columns = parse_fields(request, MESSAGE_FIELDS, MESSAGE_DEFAULT_FIELDS)
+    messages = _message_model(request.user, pk).objects.filter(ticket_id=pk)
+    return api_response(keyset_page(request, messages, fields, columns, descending=False))
+
+
+@query_budget(10)
+@api_view
+@conditional_view(notifications_state)
+def notifications_list(request):
+    """GET /api/v1/notifications/?fields=&unread=1&cursor=&limit= (yangisidan eskisiga)"""
+    fields, columns = parse_fields(request, NOTIFICATION_FIELDS, NOTIFICATION_DEFAULT_FIELDS)
+    notifications = Notification.objects.filter(user=request.user).with_read_state(request.user)
+    if request.GET.get('unread') == '1':
+        notifications = notifications.unread_for(request.user)
+    return api_response(keyset_page(request, notifications, fields, columns))
@@ -0,0 +1,57 @@
+from django.contrib.auth.decorators import login_required
+from django.http import Http404
+from django.views.decorators.http import require_safe
+
+from accounts.utils import filter_tickets_for_user
+from .media import (
+    PUBLIC_MEDIA_PREFIXES,
+    TICKET_MEDIA_PREFIXES,
+    PREVIEW_PREFIX,
+    normalize_media_path,
+    media_ticket_querysets,
+    media_file_response,
+)
+
+
+# ============================================
+# MEDIA FAYLLAR (RUXSAT TEKSHIRUVI BILAN)
+# ============================================
+
+def can_view_media(user, name):
+    """
+    Foydalanuvchi bu media faylni ko'ra oladimi?
+
+    - avatars/ - har qanday tizimga kirgan foydalanuvchi
+    - ticket fayllari va ularning previewlari - fayl biriktirilgan ticketni ko'ra olsa
+    - boshqa kataloglar - faqat superadmin
+    """
+    if user.is_superadmin():
+        return True
+
+    if name.startswith(PUBLIC_MEDIA_PREFIXES):
+        return True
+
+    if name.startswith(TICKET_MEDIA_PREFIXES + (PREVIEW_PREFIX,)):
+        return any(
+            filter_tickets_for_user(queryset, user).exists()
+            for queryset in media_ticket_querysets(name)
+        )
+
+    return False
+
+
+@login_required
+@require_safe
+def serve_media(request, path):
+    """
+    /media/<path> - ruxsat tekshiriladi, so'ng fayl proxy (X-Accel-Redirect /
+    X-Sendfile) yoki FileResponse orqali beriladi
+
+    Ruxsat yo'q bo'lsa 404 - fayl mavjudligi oshkor qilinmaydi.
+    """
+    name, full_path = normalize_media_path(path)
+
+    if not can_view_media(request.user, name):
+        raise Http404
+
+    return media_file_response(request, name, full_path)
@@ -0,0 +1,65 @@
+from django.conf import settings
+from django.db.models import Count
+from django.http import Http404, HttpResponse
+from django.utils.crypto import constant_time_compare
+from django.views.decorators.cache import never_cache
+from django.views.decorators.http import require_safe
+
+from . import metrics
+from .models import Ticket
+
+
+# ============================================
+# PROMETHEUS /metrics
+# ============================================
+
+def can_scrape_metrics(request):
+    """
+    Prometheus (METRICS_TOKEN yoki METRICS_ALLOWED_IPS) yoki tizimga kirgan superadmin
+
+    Token: Authorization: Bearer <METRICS_TOKEN> (Prometheus bearer_token).
+    METRICS_ALLOWED_IPS xom REMOTE_ADDR bilan solishtiriladi - nginx orqali
+    kelgan so'rovlarda bu proxy manzili, shuning uchun faqat Prometheus
+    ilovaga to'g'ridan-to'g'ri (proxysiz) murojaat qilganda ishlatiladi.
+    """
+    token = getattr(settings, 'METRICS_TOKEN', '')
+    if token:
+        scheme, _, credentials = request.headers.get('Authorization', '').partition(' ')
+        if scheme.lower() == 'bearer' and constant_time_compare(credentials.strip(), token):
+            return True
+    if request.META.get('REMOTE_ADDR') in getattr(settings, 'METRICS_ALLOWED_IPS', ()):
+        return True
+    user = getattr(request, 'user', None)
+    return bool(user and user.is_authenticated and user.is_superadmin())
+
+
+def queue_depth_samples():
+    """Tayinlanmagan yangi murojaatlar - tizim va viloyat bo'yicha (bitta GROUP BY)"""
+    rows = (
+        Ticket.objects.filter(status='new', assigned_to__isnull=True)
+        .values('system__name', 'region__name')
+        .annotate(total=Count('id'))
+        .order_by()
+    )
+    return [
+        ({'system': row['system__name'], 'region': row['region__name'] or ''}, row['total'])
+        for row in rows
+    ]
+
+
+@never_cache
+@require_safe
+def metrics_view(request):
+    """
+    Prometheus text formatidagi metrikalar
+
+    Ruxsat bo'lmasa 404 - endpoint borligi oshkor qilinmaydi.
+    """
+    if not getattr(settings, 'METRICS_ENABLED', False) or not can_scrape_metrics(request):
+        raise Http404
+
+    gauges = {
+        'tickets_queue_depth': ('Tayinlanmagan yangi murojaatlar', queue_depth_samples()),
+    }
+    body = metrics.render_metrics(metrics.registry.collect(), gauges)
+    return HttpResponse(body, content_type='text/plain; version=0.0.4; charset=utf-8')
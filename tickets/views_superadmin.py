@@ -11,7 +11,18 @@ import random
 import string
 
 from accounts.models import User, Region, Department
+from accounts.search import search_users
+from accounts.decorators import alogin_required, arole_required
 from .models import Ticket, TicketHistory, TicketMessage
+from .query_budget import query_budget
+from .db_router import replica_reads
+from .audit import (
+    get_audit_filters,
+    filter_audit_logs,
+    paginate_audit_logs,
+    stream_audit_csv,
+    stream_audit_ndjson,
+)
 from systems.models import System, SystemResponsible
 from notifications.models import Notification
 
@@ -20,11 +31,14 @@ from notifications.models import Notification
 # DECORATORS
 # ============================================
 
+SUPERADMIN_ONLY_MESSAGE = _('Sizda bu sahifaga kirish huquqi yo\'q. Faqat bosh adminlar kirishi mumkin.')
+
+
 def require_superadmin(view_func):
     """Bosh admin bo'lishini talab qiluvchi decorator"""
     def wrapper(request, *args, **kwargs):
         if not request.user.is_superadmin():
-            messages.error(request, _('Sizda bu sahifaga kirish huquqi yo\'q. Faqat bosh adminlar kirishi mumkin.'))
+            messages.error(request, SUPERADMIN_ONLY_MESSAGE)
             return redirect('tickets:dashboard')
         return view_func(request, *args, **kwargs)
     return wrapper
@@ -34,8 +48,10 @@ def require_superadmin(view_func):
 # SUPERADMIN DASHBOARD
 # ============================================
 
+@query_budget(50)
 @login_required
 @require_superadmin
+@replica_reads
 def superadmin_dashboard(request):
     """Bosh admin - to'liq nazorat paneli"""
     
@@ -154,6 +170,7 @@ def superadmin_dashboard(request):
 # USER MANAGEMENT (SUPERADMIN)
 # ============================================
 
+@query_budget(15)
 @login_required
 @require_superadmin
 def superadmin_users_list(request):
@@ -180,28 +197,30 @@ def superadmin_users_list(request):
     # Search
     search = request.GET.get('search', '')
     if search:
-        users = users.filter(
-            Q(first_name__icontains=search) |
-            Q(last_name__icontains=search) |
-            Q(username__icontains=search) |
-            Q(middle_name__icontains=search)
-        )
+        users = search_users(users, search)
+    
+    # Har bir user uchun statistika - sahifadagi barcha userlar uchun 2 ta so'rov
+    users = list(users[:100])  # Pagination kerak bo'lsa
+    user_ids = [user.id for user in users]
+    created_counts = dict(
+        Ticket.objects.filter(user_id__in=user_ids)
+        .values('user_id').annotate(count=Count('id'))
+        .values_list('user_id', 'count')
+    )
+    assigned_stats = {
+        row['assigned_to_id']: row
+        for row in Ticket.objects.filter(assigned_to_id__in=user_ids)
+        .values('assigned_to_id').annotate(count=Count('id'), avg_rating=Avg('rating'))
+    }
     
-    # Har bir user uchun statistika
     users_data = []
-    for user in users[:100]:  # Pagination kerak bo'lsa
-        tickets_created = Ticket.objects.filter(user=user).count()
-        tickets_assigned = Ticket.objects.filter(assigned_to=user).count()
-        avg_rating = Ticket.objects.filter(
-            assigned_to=user,
-            rating__isnull=False
-        ).aggregate(Avg('rating'))['rating__avg'] or 0
-        
+    for user in users:
+        assigned = assigned_stats.get(user.id, {})
         users_data.append({
             'user': user,
-            'tickets_created': tickets_created,
-            'tickets_assigned': tickets_assigned,
-            'avg_rating': round(avg_rating, 2),
+            'tickets_created': created_counts.get(user.id, 0),
+            'tickets_assigned': assigned.get('count', 0),
+            'avg_rating': round(assigned.get('avg_rating') or 0, 2),
         })
     
     all_regions = Region.objects.filter(is_active=True).order_by('name')
@@ -523,36 +542,49 @@ def superadmin_system_settings(request):
 
 @login_required
 @require_superadmin
+@replica_reads
 def superadmin_audit_logs(request):
-    """Barcha audit loglar"""
-    logs = TicketHistory.objects.select_related(
-        'ticket', 'changed_by'
-    ).order_by('-timestamp')
-    
-    # Filter by action type
-    action_type = request.GET.get('action_type')
-    if action_type:
-        logs = logs.filter(action_type=action_type)
-    
-    # Filter by user
-    user_id = request.GET.get('user_id')
+    """Barcha audit loglar - kursor sahifalash va stream export bilan"""
+    filters = get_audit_filters(request.GET)
+    logs = filter_audit_logs(TicketHistory.objects.all(), filters)
+    
+    # Export (CSV / NDJSON) - filtrlangan butun log oqim sifatida
+    export_format = request.GET.get('export')
+    if export_format == 'csv':
+        return stream_audit_csv(logs)
+    if export_format == 'ndjson':
+        return stream_audit_ndjson(logs)
+    
+    logs = logs.select_related(
+        'changed_by', 'ticket', 'ticket__system', 'ticket__region', 'ticket__assigned_to'
+    )
+    logs, next_cursor = paginate_audit_logs(logs, request.GET.get('cursor'))
+    
+    # Tanlangan foydalanuvchi nomi
     selected_user_name = ''
-    if user_id:
-        try:
-            user_obj = User.objects.get(pk=user_id)
+    if filters['user_id']:
+        user_obj = User.objects.filter(pk=filters['user_id']).first()
+        if user_obj:
             selected_user_name = user_obj.get_full_name()
-            logs = logs.filter(changed_by_id=user_id)
-        except User.DoesNotExist:
-            pass
     
-    # Apply slice at the end
-    logs = logs[:200]
+    # Sahifa havolalari uchun filtr parametrlari (kursorsiz)
+    query_params = request.GET.copy()
+    query_params.pop('cursor', None)
+    query_params.pop('export', None)
     
     context = {
         'logs': logs,
-        'action_type': action_type,
-        'user_id': user_id,
+        'next_cursor': next_cursor,
+        'is_first_page': not request.GET.get('cursor'),
+        'query_string': query_params.urlencode(),
+        'action_type': filters['action_type'],
+        'user_id': filters['user_id'] or '',
         'selected_user_name': selected_user_name,  # ✅ QO'SHILDI
+        'ticket_query': request.GET.get('ticket', ''),
+        'system_id': filters['system_id'],
+        'date_from': filters['date_from'],
+        'date_to': filters['date_to'],
+        'all_systems': System.objects.order_by('name'),
     }
     
     return render(request, 'tickets/superadmin/audit_logs.html', context)
@@ -568,11 +600,7 @@ def superadmin_users_search_ajax(request):
     """AJAX - foydalanuvchilarni qidirish"""
     search = request.GET.get('q', '')
     
-    users = User.objects.filter(
-        Q(first_name__icontains=search) |
-        Q(last_name__icontains=search) |
-        Q(username__icontains=search)
-    )[:20]
+    users = search_users(User.objects.all(), search)[:20]
     
     results = []
     for user in users:
@@ -591,10 +619,10 @@ def superadmin_users_search_ajax(request):
 
 
 
-@login_required
-@require_superadmin
-def api_users_search(request):
-    """AJAX - foydalanuvchilarni qidirish (audit logs uchun)"""
+@alogin_required
+@arole_required(lambda user: user.is_superadmin(), SUPERADMIN_ONLY_MESSAGE)
+async def api_users_search(request):
+    """AJAX - foydalanuvchilarni qidirish (audit logs uchun, async)"""
     query = request.GET.get('q', '').strip()
     
     if len(query) < 2:
@@ -603,16 +631,11 @@ def api_users_search(request):
             'message': 'Kamida 2 ta belgi kiriting'
         })
     
-    # Qidiruv
-    users = User.objects.filter(
-        Q(first_name__icontains=query) |
-        Q(last_name__icontains=query) |
-        Q(middle_name__icontains=query) |
-        Q(username__icontains=query)
-    ).order_by('first_name', 'last_name')[:20]
+    # Qidiruv (indeksli search_name bo'yicha)
+    users = search_users(User.objects.all(), query).order_by('first_name', 'last_name')[:20]
     
     results = []
-    for user in users:
+    async for user in users:
         results.append({
             'id': user.id,
             'full_name': user.get_full_name(),
@@ -817,10 +840,10 @@ def superadmin_department_delete(request, dept_id):
 
 # Bu kodlarni views_superadmin.py faylining oxiriga qo'shing
 
-@login_required
-@require_superadmin
-def api_unassigned_tickets(request):
-    """Biriktirilmagan murojaatlar (AJAX uchun)"""
+@alogin_required
+@arole_required(lambda user: user.is_superadmin(), SUPERADMIN_ONLY_MESSAGE)
+async def api_unassigned_tickets(request):
+    """Biriktirilmagan murojaatlar (AJAX uchun, async)"""
     from django.utils.timesince import timesince
     
     tickets = Ticket.objects.filter(
@@ -828,7 +851,7 @@ def api_unassigned_tickets(request):
     ).select_related('user', 'system', 'region').order_by('-created_at')[:20]
     
     data = []
-    for ticket in tickets:
+    async for ticket in tickets:
         data.append({
             'id': ticket.id,
             'system_name': ticket.system.name,
@@ -844,10 +867,10 @@ def api_unassigned_tickets(request):
     })
 
 
-@login_required
-@require_superadmin
-def api_reopened_tickets(request):
-    """Qayta ochilgan murojaatlar (AJAX uchun)"""
+@alogin_required
+@arole_required(lambda user: user.is_superadmin(), SUPERADMIN_ONLY_MESSAGE)
+async def api_reopened_tickets(request):
+    """Qayta ochilgan murojaatlar (AJAX uchun, async)"""
     from django.utils.timesince import timesince
     
     tickets = Ticket.objects.filter(
@@ -855,7 +878,7 @@ def api_reopened_tickets(request):
     ).select_related('user', 'system', 'region').order_by('-updated_at')[:20]
     
     data = []
-    for ticket in tickets:
+    async for ticket in tickets:
         data.append({
             'id': ticket.id,
             'system_name': ticket.system.name,